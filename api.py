@@ -0,0 +1,196 @@
+"""
+API JSON en lecture seule sur le catalogue (téléphones, autres outils).
+
+    python api.py [--host 0.0.0.0] [--port 8000]
+    uvicorn api:app --workers 2
+
+GET /books/search?q=&owner=&format=&limit=   recherche (mêmes filtres que l'onglet Recherche)
+GET /books?limit=&after=                     liste paginée, plus récents d'abord
+GET /isbn/{isbn}                             fiche Google Books / OpenLibrary + exemplaires possédés
+GET /stats                                   compteurs du catalogue
+GET /debug/profile                           mesures par requête (BLIBLIO_PROFILE=1)
+
+Les réponses du catalogue portent un ETag tiré de data_version : un client qui
+renvoie If-None-Match reçoit 304 sans qu'aucune requête ne soit exécutée.
+"""
+import argparse
+import base64
+import json
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+import profiler
+import query_cache
+import stats
+from bliblio.core import get_pool
+from db import data_version
+from isbn_lookup import lookup_isbn
+from isbns import canonical_isbn
+from search import count_books, count_matches, list_page, search_books
+
+# ==============================
+# CONFIG
+# ==============================
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 1000
+GZIP_MIN_SIZE = 500     # octets ; en dessous la compression ne rapporte rien
+
+BOOK_FIELDS = ["owner", "format", "author", "title", "language", "publisher"]
+LIST_FIELDS = BOOK_FIELDS + ["created_at"]
+
+class BadRequest(Exception):
+    pass
+
+# ==============================
+# OUTILS
+# ==============================
+def int_param(request, name, default, maximum):
+    value = request.query_params.get(name)
+    if value is None:
+        return default
+    if not value.isdigit() or not 1 <= int(value) <= maximum:
+        raise BadRequest(f"{name} : entier entre 1 et {maximum} attendu")
+    return int(value)
+
+def encode_cursor(cursor):
+    """Curseur keyset (created_at, id) -> jeton opaque, utilisable tel quel dans une URL"""
+    return base64.urlsafe_b64encode(json.dumps(cursor).encode()).decode().rstrip("=")
+
+def decode_cursor(value):
+    try:
+        created_at, book_id = json.loads(base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)))
+    except (ValueError, TypeError):
+        raise BadRequest("after : curseur invalide") from None
+    return created_at, book_id
+
+def etag_for(version):
+    # Faible : la version gzip et la version brute partagent l'ETag
+    return f'W/"{version}"'
+
+def versioned(handler):
+    """
+    Réponse du catalogue : 304 si le client a déjà cette version des données,
+    sinon `handler(request, pool)` -> dict, envoyé avec l'ETag courant.
+    """
+    def endpoint(request):
+        pool = get_pool()
+        with pool.reader() as conn:
+            etag = etag_for(data_version(conn))
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+        try:
+            return JSONResponse(handler(request, pool), headers=headers)
+        except BadRequest as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
+    return endpoint
+
+# ==============================
+# ENDPOINTS
+# ==============================
+@versioned
+def search(request, pool):
+    params = request.query_params
+    limit = int_param(request, "limit", DEFAULT_LIMIT, MAX_LIMIT)
+    text = params.get("q", "")
+    filters = {"owner": params.get("owner") or None, "fmt": params.get("format") or None}
+    # LIMIT dans le SQL (et dans la clé du cache) ; le total vient d'un COUNT à part
+    rows = query_cache.cached(pool, search_books, text, limit=limit, **filters)
+    return {
+        "count": query_cache.cached(pool, count_matches, text, **filters),
+        "books": [dict(zip(BOOK_FIELDS, row)) for row in rows],
+    }
+
+@versioned
+def books(request, pool):
+    limit = int_param(request, "limit", DEFAULT_LIMIT, MAX_LIMIT)
+    after = request.query_params.get("after")
+    rows, next_cursor = query_cache.cached(
+        pool, list_page, limit, after=decode_cursor(after) if after else None
+    )
+    return {
+        "total": query_cache.cached(pool, count_books),
+        "books": [dict(zip(LIST_FIELDS, row)) for row in rows],
+        "next": encode_cursor(next_cursor) if next_cursor else None,
+    }
+
+@versioned
+def book_stats(request, pool):
+    counters = query_cache.cached(pool, stats.read_stats)
+    return {
+        "total": stats.total(counters),
+        "owner": dict(stats.counts(counters, "owner")),
+        "format": dict(stats.counts(counters, "format")),
+        "language": dict(stats.counts(counters, "language")),
+        "reading": dict(stats.reading(counters)),
+        "month": {a: n for (a, _), n in sorted(counters.get("month", {}).items()) if a},
+    }
+
+def isbn(request):
+    """Pas d'ETag : la fiche vient du cache ISBN (ou du réseau), hors data_version"""
+    pool = get_pool()
+    isbn_clean = canonical_isbn(request.path_params["isbn"])
+    if isbn_clean is None:
+        return JSONResponse({"error": "isbn : ISBN-10 ou ISBN-13 valide attendu"}, status_code=400)
+    with pool.reader() as conn:
+        owned = conn.execute(
+            f"SELECT {', '.join(BOOK_FIELDS)} FROM books_named WHERE isbn = ? ORDER BY owner", (isbn_clean,)
+        ).fetchall()
+    body = {"isbn": isbn_clean, "book": None, "owned": [dict(zip(BOOK_FIELDS, row)) for row in owned]}
+
+    try:
+        body["book"] = lookup_isbn(pool, isbn_clean)
+    except Exception as e:
+        # Réseau indisponible : les exemplaires possédés restent utiles
+        body["error"] = f"Recherche impossible : {e}"
+        return JSONResponse(body, status_code=200 if owned else 502)
+    return JSONResponse(body, status_code=200 if body["book"] or owned else 404)
+
+def debug_profile(request):
+    if not profiler.ENABLED:
+        return JSONResponse({"error": "profilage désactivé (BLIBLIO_PROFILE=1)"}, status_code=404)
+    return JSONResponse(profiler.snapshot())
+
+# ==============================
+# APP
+# ==============================
+def traced(endpoint):
+    """Une trace de profilage par requête (même thread que l'endpoint)"""
+    if not profiler.ENABLED:
+        return endpoint
+    def wrapper(request):
+        trace = profiler.begin(f"{request.method} {request.url.path}")
+        try:
+            return endpoint(request)
+        finally:
+            profiler.end(trace)
+    return wrapper
+
+app = Starlette(
+    routes=[
+        Route("/books/search", traced(search)),
+        Route("/books", traced(books)),
+        Route("/isbn/{isbn}", traced(isbn)),
+        Route("/stats", traced(book_stats)),
+        Route("/debug/profile", debug_profile),
+    ],
+    middleware=[Middleware(GZipMiddleware, minimum_size=GZIP_MIN_SIZE)],
+)
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="API JSON en lecture seule sur le catalogue")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    get_pool()   # migrations avant la première requête
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
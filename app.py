@@ -1,157 +1,257 @@
 import streamlit as st
+import json
 import sqlite3
-import pandas as pd
-from pathlib import Path
-import requests
-import io
+import uuid
+from collections import Counter
+
+import db
+import dedupe
+import dimensions
+import jobs
+import profiler
+import query_cache
+import scan
+import stats
+from export import FORMATS as EXPORT_FORMATS, export_file
+from import_manifest import file_hash
+from isbn_lookup import cache_stats, lookup_isbn
+from isbns import canonical_isbn
+from search import count_books, list_page_frame, search_frame
 
 # ==============================
 # CONFIG
 # ==============================
-BASE_DIR = Path(__file__).parent
-DATA_DIR = BASE_DIR / "data"
-DB_PATH = DATA_DIR / "books.sqlite"
-
 st.set_page_config(
     page_title="📚 Ma Bibliothèque",
     layout="wide",
     initial_sidebar_state="expanded"
 )
 
+# Requêtes et appels HTTP de ce rerun (BLIBLIO_PROFILE=1), affichés en fin de page
+rerun_trace = profiler.begin("rerun")
+
 # ==============================
 # DB
 # ==============================
-def get_conn():
-    DATA_DIR.mkdir(exist_ok=True)
-    return sqlite3.connect(DB_PATH, check_same_thread=False)
-
-def init_db():
-    conn = get_conn()
-    conn.execute("""
-        CREATE TABLE IF NOT EXISTS books (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            owner TEXT NOT NULL,
-            format TEXT,
-            author TEXT NOT NULL,
-            title TEXT NOT NULL,
-            language TEXT,
-            isbn TEXT,
-            publisher TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    conn.commit()
-    conn.close()
+@st.cache_resource
+def get_pool():
+    """Pool de connexions partagé par toutes les sessions, schéma créé une fois"""
+    pool = db.get_pool()
+    db.init_db(pool)
+    return pool
+
+pool = get_pool()
 
-init_db()
+PAGE_SIZES = [25, 50, 100, 250]
+
+def choices(kind):
+    """Propriétaires / formats / langues connus (tables de dimension)"""
+    return query_cache.cached(pool, dimensions.choices, kind)
+
+# ==============================
+# JOBS (imports, enrichissement)
+# ==============================
+@st.cache_resource
+def get_runner():
+    """Thread de fond partagé par toutes les sessions"""
+    return jobs.Runner(pool).start()
+
+get_runner()
+
+JOB_LABELS = {
+    "queued": "⏳ En attente",
+    "running": "⚙️ En cours",
+    "done": "✅ Terminé",
+    "failed": "❌ Échec",
+    "cancelled": "⛔ Annulé",
+}
+
+def show_job(job_id, show_result):
+    """Suivi d'un job : rafraîchi chaque seconde tant qu'il tourne, sans bloquer la session"""
+    active_key = f"job_active_{job_id}"
+
+    def panel():
+        job = jobs.get(pool, job_id)
+        if job is None:
+            return
+        if job["status"] in jobs.ACTIVE:
+            done, total = job["done"], job["total"]
+            text = f"{JOB_LABELS[job['status']]} {job['message'] or ''} {done}/{total or '?'}"
+            st.progress(min(done / total, 1.0) if total else 0.0, text=text)
+            if st.button("⛔ Annuler", key=f"cancel_job_{job_id}"):
+                jobs.cancel(pool, job_id)
+            return
+        
+        if st.session_state.get(active_key):
+            # Vient de se terminer : rafraîchir toute la page (stats, listes)
+            st.session_state[active_key] = False
+            st.rerun()
+        
+        if job["status"] == "done":
+            show_result(job["result"])
+        else:
+            st.warning(JOB_LABELS[job["status"]])
+            if job["error"]:
+                st.error(job["error"].splitlines()[0])
+            if st.button("▶️ Reprendre", key=f"resume_job_{job_id}"):
+                jobs.resume(pool, job_id)
+                st.rerun()
+
+    job = jobs.get(pool, job_id)
+    if job is None:
+        # Base réinitialisée entre-temps
+        return
+    active = job["status"] in jobs.ACTIVE
+    st.session_state[active_key] = active
+    st.fragment(panel, run_every=1.0 if active else None)()
+
+def show_csv_result(result):
+    report, errors = result["report"], result["errors"]
+    if report["file_unchanged"]:
+        st.info("♻️ Fichier identique au dernier import : rien à faire")
+    else:
+        st.success(f"✅ {report['added']} livres importés")
+        if report["changed"] or report["removed"]:
+            st.info(f"✏️ {report['changed']} modifiés | 🗑️ {report['removed']} retirés du fichier, supprimés")
+        if report["unchanged"]:
+            st.info(f"♻️ {report['unchanged']} lignes inchangées depuis le dernier import")
+    skipped = result["error_count"] + report["duplicates"]
+    if skipped > 0:
+        st.warning(f"⚠️ {skipped} lignes ignorées")
+    if report.get("unreadable_isbn"):
+        st.info(f"🔢 {report['unreadable_isbn']} ISBN illisibles ignorés (livres importés sans ISBN)")
+    
+    if errors:
+        with st.expander(f"📋 Détails des erreurs ({result['error_count']})"):
+            for err in errors:
+                st.text(err)
+
+def show_enrich_result(stats):
+    st.success(f"✅ {stats['updated']} livres complétés sur {stats['rows']}")
+    if stats["not_found"] or stats["errors"]:
+        st.warning(f"⚠️ {stats['not_found']} sans résultat | {stats['errors']} erreurs réseau")
 
 # ==============================
 # API - Recherche par ISBN/EAN
 # ==============================
 def search_book_by_isbn(isbn):
-    """Recherche un livre par ISBN via Google Books API"""
+    """Recherche un livre par ISBN (cache local, puis Google Books / OpenLibrary)"""
     try:
-        isbn_clean = isbn.replace("-", "").replace(" ", "").strip()
-        
-        # Google Books API
-        url = f"https://www.googleapis.com/books/v1/volumes?q=isbn:{isbn_clean}"
-        response = requests.get(url, timeout=5)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data.get("totalItems", 0) > 0:
-                book = data["items"][0]["volumeInfo"]
-                return {
-                    "title": book.get("title", ""),
-                    "authors": ", ".join(book.get("authors", [])),
-                    "publisher": book.get("publisher", ""),
-                    "language": book.get("language", "").upper()[:2],
-                    "isbn": isbn_clean
-                }
-        
-        # OpenLibrary fallback
-        url2 = f"https://openlibrary.org/api/books?bibkeys=ISBN:{isbn_clean}&format=json&jscmd=data"
-        response2 = requests.get(url2, timeout=5)
-        
-        if response2.status_code == 200:
-            data2 = response2.json()
-            key = f"ISBN:{isbn_clean}"
-            if key in data2:
-                book2 = data2[key]
-                return {
-                    "title": book2.get("title", ""),
-                    "authors": ", ".join([a.get("name", "") for a in book2.get("authors", [])]),
-                    "publisher": ", ".join([p.get("name", "") for p in book2.get("publishers", [])]),
-                    "language": "",
-                    "isbn": isbn_clean
-                }
-        
-        return None
-        
+        with profiler.span("isbn", "search_book_by_isbn"):
+            return lookup_isbn(pool, isbn)
     except Exception as e:
         st.error(f"Erreur lors de la recherche : {e}")
         return None
 
+# ==============================
+# EXPORT
+# ==============================
+def export_button(key, text="", owner=None, fmt=None):
+    """Format au choix ; le fichier n'est généré qu'au clic (puis mis en cache disque)"""
+    col_kind, col_dl = st.columns([1, 3])
+    with col_kind:
+        kind = st.selectbox(
+            "Format d'export", list(EXPORT_FORMATS), key=f"export_kind_{key}", label_visibility="collapsed"
+        )
+    ext, mime = EXPORT_FORMATS[kind]
+    with col_dl:
+        st.download_button(
+            label=f"📥 Télécharger en {kind.upper()}",
+            data=lambda: export_file(pool, kind, text, owner, fmt).read_bytes(),
+            file_name=f"ma_bibliotheque.{ext}",
+            mime=mime,
+            key=f"export_{key}",
+        )
+
 # ==============================
 # SIDEBAR - STATS
 # ==============================
 with st.sidebar:
     st.markdown("### 📊 Statistiques")
     
-    try:
-        conn = get_conn()
-        total = conn.execute("SELECT COUNT(*) FROM books").fetchone()[0]
-        by_owner = conn.execute("""
-            SELECT owner, COUNT(*) as count 
-            FROM books 
-            GROUP BY owner 
-            ORDER BY count DESC
-        """).fetchall()
-        conn.close()
-        
-        st.metric("📚 Total", total)
-        
-        if by_owner:
-            st.markdown("**Par propriétaire:**")
-            for owner, count in by_owner:
-                st.text(f"{owner}: {count}")
-    except:
-        st.metric("📚 Total", 0)
+    # Compteurs matérialisés (table book_stats) : pas d'agrégat à chaque rerun
+    book_stats = query_cache.cached(pool, stats.read_stats)
+
+    st.metric("📚 Total", stats.total(book_stats))
+
+    by_owner = stats.counts(book_stats, "owner")
+    if by_owner:
+        st.markdown("**Par propriétaire:**")
+        for owner, count in by_owner:
+            st.text(f"{owner}: {count}")
+
+        # Graphiques (pandas) calculés seulement une fois le panneau ouvert
+        details = st.expander("📈 Détails", key="stats_details", on_change="rerun")
+        with details:
+            if details.open:
+                st.markdown("**Format × propriétaire**")
+                st.dataframe(stats.format_owner_matrix(book_stats), use_container_width=True)
+
+                st.markdown("**Par langue:**")
+                for language, count in stats.counts(book_stats, "language"):
+                    st.text(f"{language}: {count}")
+
+                st.markdown("**Lecture:**")
+                for label, count in stats.reading(book_stats):
+                    st.text(f"{label}: {count}")
+
+                st.markdown("**Ajouts par mois**")
+                st.bar_chart(stats.monthly_additions(book_stats))
     
     st.divider()
     
     st.markdown("### ⚙️ Actions")
     if st.button("🔄 Réinitialiser la base"):
         if st.session_state.get('confirm_reset'):
-            if DB_PATH.exists():
-                DB_PATH.unlink()
-            init_db()
+            db.reset_db(pool)
             st.session_state.confirm_reset = False
             st.success("✅ Base réinitialisée")
             st.rerun()
         else:
             st.session_state.confirm_reset = True
             st.warning("⚠️ Cliquez encore pour confirmer")
+    
+    with st.expander("⏳ Tâches"):
+        for job in jobs.recent(pool, limit=5):
+            progress = f" {job['done']}/{job['total']}" if job["total"] else ""
+            st.text(f"#{job['id']} {job['kind']} : {JOB_LABELS[job['status']]}{progress}")
+    
+    with st.expander("🔌 Connexions SQLite"):
+        metrics = pool.metrics()
+        st.text(f"Ouvertes : {metrics['opened']}")
+        st.text(f"Lectures : {metrics['reads']} | Écritures : {metrics['writes']}")
+        st.text(f"Attente totale : {metrics['wait_total'] * 1000:.1f} ms")
+        st.text(f"Attente max : {metrics['wait_max'] * 1000:.1f} ms")
+    
+    with st.expander("📖 Cache ISBN"):
+        isbn_stats = cache_stats()
+        st.text(f"Mémoire : {isbn_stats['lru_hits']} | Base : {isbn_stats['db_hits']}")
+        st.text(f"Dont introuvables : {isbn_stats['negative_hits']}")
+        st.text(f"Requêtes réseau : {isbn_stats['fetches']}")
+
+    with st.expander("🗃️ Cache requêtes"):
+        query_stats = query_cache.cache_stats()
+        st.text(f"Succès : {query_stats['hits']} | Échecs : {query_stats['misses']}")
+        st.text(f"Entrées : {query_stats['entries']} / {query_cache.MAX_ENTRIES}")
+        st.text(f"Mémoire : {query_stats['bytes'] / 1024:.0f} Ko / {query_cache.MAX_BYTES // 1024 // 1024} Mo")
+        st.text(f"Évictions : {query_stats['evictions']}")
 
 # ==============================
 # MAIN
 # ==============================
 st.title("📚 Ma Bibliothèque")
 
-# Tabs
-tab1, tab2, tab3, tab4, tab5 = st.tabs(["📥 Import CSV", "➕ Ajout manuel", "📱 Scanner EAN", "🔍 Recherche", "📊 Liste"])
-
 # ==============================
 # TAB 1 - IMPORT CSV
 # ==============================
-with tab1:
+def tab_import_csv():
     st.markdown("## 📥 Importer depuis un fichier CSV")
     
     st.info("""
     **Format du CSV attendu :**
     - Colonnes : `Proprio`, `Format`, `Auteur`, `Titre`, `Langue`, `Editeur`
-    - Séparateur : virgule (`,`)
-    - Encodage : UTF-8
+    - Séparateur : virgule, point-virgule, tabulation ou `|` (détecté)
+    - Encodage : UTF-8, Windows-1252 ou Latin-1 (détecté)
     """)
     
     # Télécharger le template
@@ -194,18 +294,20 @@ Nils,Peyo,Les Schtroumpfs,Fr"""
     uploaded_csv = st.file_uploader("Choisissez votre fichier CSV", type=["csv"])
     
     if uploaded_csv:
+        from csv_import import FORMAT_FROM_CSV, REQUIRED_COLUMNS, count_rows, read_preview
+
         try:
-            # Lire le CSV
-            df = pd.read_csv(uploaded_csv)
+            # Aperçu seulement : l'import lit le fichier par blocs, en tâche de fond
+            df, encoding, delimiter = read_preview(uploaded_csv)
+            csv_digest = file_hash(uploaded_csv.getbuffer())
             
             # Afficher aperçu
             st.markdown("### 📊 Aperçu des données")
-            st.dataframe(df.head(20), use_container_width=True)
-            st.info(f"📐 {len(df)} lignes détectées")
+            st.dataframe(df, use_container_width=True)
+            st.info(f"📐 ~{count_rows(uploaded_csv)} lignes détectées | encodage {encoding} | séparateur {delimiter!r}")
             
             # Vérifier les colonnes
-            required_cols = ["Proprio", "Auteur", "Titre"]
-            missing_cols = [col for col in required_cols if col not in df.columns]
+            missing_cols = [col for col in REQUIRED_COLUMNS if col not in df.columns]
             
             if missing_cols:
                 st.error(f"❌ Colonnes manquantes : {', '.join(missing_cols)}")
@@ -214,126 +316,51 @@ Nils,Peyo,Les Schtroumpfs,Fr"""
                 st.success("✅ Toutes les colonnes obligatoires sont présentes")
                 
                 # Options d'import
-                col1, col2, col3 = st.columns(3)
+                # Doublons (même propriétaire / auteur / titre) : toujours ignorés
+                col1, col2 = st.columns(2)
                 with col1:
                     wipe_before = st.checkbox("🗑️ Vider la base avant l'import")
                 with col2:
-                    skip_duplicates = st.checkbox("⏭️ Ignorer les doublons", value=True)
-                with col3:
-                    force_format = st.selectbox("📚 Forcer le format", ["Utiliser le CSV", "Livre", "BD", "Manga", "Comics"])
+                    force_format = st.selectbox("📚 Forcer le format", [FORMAT_FROM_CSV, *choices("format")])
                 
-                # Bouton d'import
+                # Bouton d'import : exécuté en tâche de fond, suivi ci-dessous
                 if st.button("🚀 Importer les données", type="primary", use_container_width=True):
-                    with st.spinner("Import en cours..."):
-                        conn = get_conn()
-                        cur = conn.cursor()
-                        
-                        if wipe_before:
-                            cur.execute("DELETE FROM books")
-                            conn.commit()
-                            st.info("🗑️ Base vidée")
-                        
-                        inserted = 0
-                        skipped = 0
-                        errors = []
-                        
-                        for idx, row in df.iterrows():
-                            try:
-                                # Extraire les valeurs
-                                owner = str(row.get("Proprio", "")).strip()
-                                
-                                # Utiliser le format forcé ou celui du CSV
-                                if force_format == "Utiliser le CSV":
-                                    format_type = str(row.get("Format", "Livre")).strip()
-                                else:
-                                    format_type = force_format
-                                
-                                author = str(row.get("Auteur", "")).strip()
-                                title = str(row.get("Titre", "")).strip()
-                                language = str(row.get("Langue", "")).strip()
-                                publisher = str(row.get("Editeur", "")).strip()
-                                isbn = str(row.get("ISBN", "")).strip() if "ISBN" in df.columns else ""
-                                
-                                # Validation
-                                if not owner or owner == "nan":
-                                    skipped += 1
-                                    errors.append(f"Ligne {idx+2}: Propriétaire vide")
-                                    continue
-                                if not author or author == "nan":
-                                    skipped += 1
-                                    errors.append(f"Ligne {idx+2}: Auteur vide")
-                                    continue
-                                if not title or title == "nan":
-                                    skipped += 1
-                                    errors.append(f"Ligne {idx+2}: Titre vide")
-                                    continue
-                                
-                                # Vérifier les doublons si demandé
-                                if skip_duplicates:
-                                    exists = cur.execute("""
-                                        SELECT COUNT(*) FROM books 
-                                        WHERE owner = ? AND author = ? AND title = ?
-                                    """, (owner, author, title)).fetchone()[0]
-                                    
-                                    if exists > 0:
-                                        skipped += 1
-                                        continue
-                                
-                                # Insertion
-                                cur.execute("""
-                                    INSERT INTO books (owner, format, author, title, language, isbn, publisher)
-                                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                                """, (
-                                    owner,
-                                    format_type if format_type != "nan" else "Livre",
-                                    author,
-                                    title,
-                                    language if language != "nan" else "",
-                                    isbn if isbn != "nan" else None,
-                                    publisher if publisher != "nan" else None
-                                ))
-                                inserted += 1
-                                
-                            except Exception as e:
-                                errors.append(f"Ligne {idx+2}: {str(e)}")
-                                skipped += 1
-                        
-                        conn.commit()
-                        conn.close()
-                        
-                        # Résultats
-                        st.success(f"✅ {inserted} livres importés")
-                        if skipped > 0:
-                            st.warning(f"⚠️ {skipped} lignes ignorées")
-                        
-                        if errors:
-                            with st.expander(f"📋 Détails des erreurs ({len(errors)})"):
-                                for err in errors[:50]:
-                                    st.text(err)
-                        
-                        st.rerun()
+                    path = jobs.files_dir(pool) / f"{uuid.uuid4().hex}.csv"
+                    path.write_bytes(uploaded_csv.getbuffer())
+                    st.session_state.csv_job = jobs.submit(pool, "csv_import", {
+                        "path": str(path),
+                        "source": uploaded_csv.name,
+                        "digest": csv_digest,
+                        "force_format": force_format,
+                        "wipe_before": wipe_before,
+                        "uploaded": True,
+                    })
         
         except Exception as e:
             st.error(f"❌ Erreur lors de la lecture du fichier : {e}")
-            st.info("💡 Assurez-vous que le fichier est au format CSV UTF-8")
+            st.info("💡 Assurez-vous que le fichier est bien un CSV avec une ligne d'en-tête")
+    
+    if "csv_job" in st.session_state:
+        st.markdown("### 🚀 Import")
+        show_job(st.session_state.csv_job, show_csv_result)
 
 # ==============================
 # TAB 2 - AJOUT MANUEL
 # ==============================
-with tab2:
+def tab_manual():
     st.markdown("## ✍️ Ajouter un livre manuellement")
     
     with st.form("add_book_form", clear_on_submit=True):
         col1, col2 = st.columns(2)
         
         with col1:
-            owner = st.selectbox("Propriétaire *", ["Axel", "Carole", "Nils"], key="manual_owner")
+            owner = st.selectbox("Propriétaire *", choices("owner"), key="manual_owner")
             title = st.text_input("Titre *", key="manual_title")
             author = st.text_input("Auteur *", key="manual_author")
         
         with col2:
-            format_type = st.selectbox("Format", ["Livre", "BD", "Manga", "Comics"], key="manual_format")
-            language = st.selectbox("Langue", ["Fr", "Eng", "Esp", "Deu", "Autre"], key="manual_lang")
+            format_type = st.selectbox("Format", choices("format"), key="manual_format")
+            language = st.selectbox("Langue", choices("language"), key="manual_lang")
             publisher = st.text_input("Éditeur (optionnel)", key="manual_publisher")
         
         isbn = st.text_input("ISBN/EAN (optionnel)", key="manual_isbn")
@@ -341,27 +368,29 @@ with tab2:
         submitted = st.form_submit_button("➕ Ajouter le livre", type="primary", use_container_width=True)
         
         if submitted:
+            isbn_clean = canonical_isbn(isbn) if isbn else None
             if not title or not author:
                 st.error("❌ Le titre et l'auteur sont obligatoires !")
+            elif isbn and isbn_clean is None:
+                st.error("❌ ISBN invalide : 10 ou 13 chiffres, clé de contrôle comprise")
             else:
                 try:
-                    conn = get_conn()
-                    conn.execute("""
-                        INSERT INTO books (owner, format, author, title, language, isbn, publisher)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """, (owner, format_type, author, title, language, isbn or None, publisher or None))
-                    conn.commit()
-                    conn.close()
+                    with pool.writer() as conn:
+                        dimensions.insert_book(
+                            conn, owner, format_type, author, title, language, isbn_clean, publisher or None
+                        )
                     
                     st.success(f"✅ Livre ajouté : {title} par {author}")
                     st.rerun()
+                except sqlite3.IntegrityError:
+                    st.warning("⚠️ Ce livre est déjà dans la base")
                 except Exception as e:
                     st.error(f"❌ Erreur : {e}")
 
 # ==============================
 # TAB 3 - SCANNER EAN
 # ==============================
-with tab3:
+def tab_scanner():
     st.markdown("## 📱 Scanner un code-barres EAN/ISBN")
     
     with st.expander("ℹ️ Comment scanner avec ton téléphone ?", expanded=True):
@@ -385,6 +414,9 @@ with tab3:
         - **Barcode Scanner** (Android)
         
         **C'est ultra-rapide** : scan → copie → colle → recherche → ajout ! ⚡
+        
+        Toute une étagère d'un coup ? Utilise la **session de scan** plus bas :
+        un code par ligne, vérifiés ensemble, ajoutés en une fois.
         """)
     
     # Interface de saisie
@@ -402,7 +434,17 @@ with tab3:
         search_button = st.button("🔍 Rechercher", type="primary", use_container_width=True)
     
     # Si un code a été saisi
-    if ean_input and search_button:
+    if ean_input and search_button and canonical_isbn(ean_input) is None:
+        st.error("❌ Code illisible : un ISBN-10 ou un EAN/ISBN-13 (978 / 979) valide est attendu")
+    elif ean_input and search_button:
+        # Index local (isbn, owner_id) d'abord : réponse immédiate, sans réseau
+        with pool.reader() as conn:
+            owned = conn.execute(
+                "SELECT owner, title FROM books_named WHERE isbn = ? ORDER BY owner_id", (canonical_isbn(ean_input),)
+            ).fetchall()
+        if owned:
+            st.info("📚 Déjà dans la bibliothèque : " + ", ".join(f"{title} ({owner})" for owner, title in owned))
+
         with st.spinner("🔍 Recherche en cours..."):
             book_info = search_book_by_isbn(ean_input)
             
@@ -426,9 +468,9 @@ with tab3:
                     col1, col2, col3 = st.columns(3)
                     
                     with col1:
-                        owner_scan = st.selectbox("Propriétaire", ["Axel", "Carole", "Nils"], key="scan_owner")
+                        owner_scan = st.selectbox("Propriétaire", choices("owner"), key="scan_owner")
                     with col2:
-                        format_scan = st.selectbox("Format", ["Livre", "BD", "Manga", "Comics"], key="scan_format")
+                        format_scan = st.selectbox("Format", choices("format"), key="scan_format")
                     with col3:
                         lang_scan = st.text_input("Langue", value=book_info["language"], key="scan_lang")
                     
@@ -436,71 +478,136 @@ with tab3:
                     
                     if add_scan:
                         try:
-                            conn = get_conn()
-                            conn.execute("""
-                                INSERT INTO books (owner, format, author, title, language, isbn, publisher)
-                                VALUES (?, ?, ?, ?, ?, ?, ?)
-                            """, (
-                                owner_scan,
-                                format_scan,
-                                book_info["authors"],
-                                book_info["title"],
-                                lang_scan,
-                                book_info["isbn"],
-                                book_info["publisher"]
-                            ))
-                            conn.commit()
-                            conn.close()
+                            with pool.writer() as conn:
+                                dimensions.insert_book(
+                                    conn,
+                                    owner_scan,
+                                    format_scan,
+                                    book_info["authors"],
+                                    book_info["title"],
+                                    lang_scan,
+                                    book_info["isbn"],
+                                    book_info["publisher"]
+                                )
                             
                             st.success(f"✅ Livre ajouté : {book_info['title']}")
                             st.rerun()
+                        except sqlite3.IntegrityError:
+                            st.warning("⚠️ Ce livre est déjà dans la base")
                         except Exception as e:
                             st.error(f"❌ Erreur : {e}")
             else:
                 st.warning("⚠️ Livre non trouvé dans les bases de données")
                 st.info("💡 Vous pouvez l'ajouter manuellement dans l'onglet 'Ajout manuel'")
+    
+    st.divider()
+    scan_session()
+    st.divider()
+    
+    # Enrichissement en masse
+    st.markdown("### 🪄 Compléter les fiches incomplètes")
+    st.caption("Cherche l'éditeur, la langue et l'ISBN manquants de tous les livres (Google Books / OpenLibrary)")
+    
+    if st.button("🪄 Lancer l'enrichissement", use_container_width=True):
+        st.session_state.enrich_job = jobs.submit(pool, "enrich", {})
+    
+    if "enrich_job" in st.session_state:
+        show_job(st.session_state.enrich_job, show_enrich_result)
+
+def scan_session():
+    st.markdown("### 🧾 Session de scan")
+    st.caption(
+        "Plusieurs codes d'affilée, un par ligne : ceux déjà en bibliothèque sont reconnus "
+        "sans réseau, les autres recherchés en parallèle, puis tout est ajouté en une fois"
+    )
+    
+    with st.form("scan_session_form"):
+        codes_text = st.text_area(
+            "Codes EAN / ISBN", key="scan_session_codes", height=150, placeholder="9782070612758\n9782203001169"
+        )
+        col1, col2 = st.columns(2)
+        with col1:
+            session_owner = st.selectbox("Propriétaire", choices("owner"), key="scan_session_owner")
+        with col2:
+            session_format = st.selectbox("Format", choices("format"), key="scan_session_format")
+        checked = st.form_submit_button("🔎 Vérifier les codes", type="primary", use_container_width=True)
+    
+    if checked:
+        with pool.reader() as conn:
+            rows = scan.check_codes(conn, scan.parse_codes(codes_text), session_owner)
+        pending = sum(row["status"] == scan.PENDING for row in rows)
+        if pending:
+            with st.spinner(f"🔍 Recherche de {pending} codes inconnus..."):
+                scan.lookup_pending(pool, rows)
+        st.session_state.scan_session = {"rows": rows, "owner": session_owner, "format": session_format}
+    
+    session = st.session_state.get("scan_session")
+    if not session or not session["rows"]:
+        return
+    
+    import pandas as pd
+    from frames import LABELS
+    
+    rows = session["rows"]
+    st.info(" | ".join(f"{status} : {n}" for status, n in Counter(row["status"] for row in rows).items()))
+    
+    labels = {**LABELS, "add": "Ajouter", "code": "Code", "isbn": "ISBN", "status": "Statut", "authors": "Auteur"}
+    table = pd.DataFrame(rows)
+    table.insert(0, "add", table["status"].isin(scan.ADDABLE))
+    edited = st.data_editor(
+        table.rename(columns=labels),
+        disabled=[labels.get(c, c) for c in table.columns if c != "add"],
+        hide_index=True,
+        use_container_width=True,
+        key="scan_session_editor",
+    )
+    selected = [row for row, add in zip(rows, edited[labels["add"]]) if add and row["status"] in scan.ADDABLE]
+    
+    label = f"➕ Ajouter {len(selected)} livres ({session['owner']}, {session['format']})"
+    if st.button(label, type="primary", disabled=not selected, use_container_width=True):
+        try:
+            added, skipped = scan.add_books(pool, selected, session["owner"], session["format"])
+        except Exception as e:
+            st.error(f"❌ Erreur : {e}")
+        else:
+            del st.session_state.scan_session
+            st.success(f"✅ {added} livres ajoutés" + (f" | ⚠️ {skipped} déjà présents" if skipped else ""))
 
 # ==============================
 # TAB 4 - RECHERCHE
 # ==============================
-with tab4:
+def tab_search():
     st.markdown("## 🔍 Rechercher dans la bibliothèque")
     
     c1, c2, c3 = st.columns(3)
     
     with c1:
-        search_text = st.text_input("🔎 Recherche", placeholder="Titre ou auteur...")
+        search_text = st.text_input("🔎 Recherche", placeholder="Titre, auteur ou éditeur...")
     with c2:
-        filter_owner = st.selectbox("Propriétaire", ["TOUS", "Axel", "Carole", "Nils"])
+        filter_owner = st.selectbox("Propriétaire", ["TOUS", *choices("owner")])
     with c3:
-        filter_format = st.selectbox("Format", ["TOUS", "Livre", "BD", "Manga", "Comics"])
+        filter_format = st.selectbox("Format", ["TOUS", *choices("format")])
     
     try:
-        conn = get_conn()
-        
-        query = "SELECT owner, format, author, title, language, publisher FROM books WHERE 1=1"
-        params = []
-        
-        if search_text:
-            query += " AND (title LIKE ? OR author LIKE ?)"
-            params += [f"%{search_text}%", f"%{search_text}%"]
-        
-        if filter_owner != "TOUS":
-            query += " AND owner = ?"
-            params.append(filter_owner)
-        
-        if filter_format != "TOUS":
-            query += " AND format = ?"
-            params.append(filter_format)
-        
-        query += " ORDER BY owner, author, title"
-        
-        rows = conn.execute(query, params).fetchall()
-        conn.close()
+        df = query_cache.cached(
+            pool,
+            search_frame,
+            search_text,
+            owner=filter_owner if filter_owner != "TOUS" else None,
+            fmt=filter_format if filter_format != "TOUS" else None,
+        )
         
-        if rows:
-            df = pd.DataFrame(rows, columns=["Proprio", "Format", "Auteur", "Titre", "Langue", "Éditeur"])
+        if len(df):
+            from frames import LABELS
+
+            df = df.rename(columns=LABELS)
             st.success(f"📚 {len(df)} résultat(s)")
+            export_button(
+                key="search",
+                text=search_text,
+                owner=filter_owner if filter_owner != "TOUS" else None,
+                fmt=filter_format if filter_format != "TOUS" else None,
+            )
             st.dataframe(df, use_container_width=True, height=500, hide_index=True)
         else:
             st.info("📭 Aucun résultat")
@@ -511,37 +618,142 @@ with tab4:
 # ==============================
 # TAB 5 - LISTE COMPLÈTE
 # ==============================
-with tab5:
+def tab_list():
     st.markdown("## 📊 Liste complète")
     
+    # Curseurs keyset des pages déjà vues (pour revenir en arrière)
+    if "list_cursors" not in st.session_state:
+        st.session_state.list_cursors = [None]
+    
+    def reset_list_pages():
+        st.session_state.list_cursors = [None]
+    
     try:
-        conn = get_conn()
-        rows = conn.execute("""
-            SELECT owner, format, author, title, language, publisher, created_at
-            FROM books
-            ORDER BY created_at DESC
-        """).fetchall()
-        conn.close()
+        page_size = st.selectbox(
+            "Livres par page", PAGE_SIZES, index=1, key="list_page_size", on_change=reset_list_pages
+        )
+        cursors = st.session_state.list_cursors
         
-        if rows:
-            df = pd.DataFrame(rows, columns=[
-                "Proprio", "Format", "Auteur", "Titre", "Langue", "Éditeur", "Ajouté le"
-            ])
+        total = query_cache.cached(pool, count_books)
+        df, next_cursor = query_cache.cached(pool, list_page_frame, page_size, after=cursors[-1])
+        
+        if len(df):
+            from frames import LABELS
+
+            df = df.rename(columns=LABELS)
             
-            st.success(f"📚 {len(df)} livre(s) dans la bibliothèque")
+            st.success(f"📚 {total} livre(s) dans la bibliothèque")
             
-            # Export CSV
-            csv = df.to_csv(index=False).encode('utf-8')
-            st.download_button(
-                label="📥 Télécharger en CSV",
-                data=csv,
-                file_name="ma_bibliotheque.csv",
-                mime="text/csv"
-            )
+            export_button(key="list")
             
             st.dataframe(df, use_container_width=True, height=600, hide_index=True)
+            
+            # Navigation
+            page = len(cursors)
+            pages = max(1, -(-total // page_size))
+            col_prev, col_page, col_next = st.columns([1, 2, 1])
+            with col_prev:
+                if st.button("◀ Précédent", disabled=page == 1, use_container_width=True):
+                    cursors.pop()
+                    st.rerun()
+            with col_page:
+                st.markdown(f"<center>Page {page} / {pages}</center>", unsafe_allow_html=True)
+            with col_next:
+                if st.button("Suivant ▶", disabled=next_cursor is None, use_container_width=True):
+                    cursors.append(next_cursor)
+                    st.rerun()
+        elif len(cursors) > 1:
+            # Page vidée entre-temps (suppression, réinitialisation) : retour au début
+            reset_list_pages()
+            st.rerun()
         else:
             st.info("📭 La bibliothèque est vide")
             
     except Exception as e:
-        st.error(f"❌ Erreur : {e}")
\ No newline at end of file
+        st.error(f"❌ Erreur : {e}")
+    
+    # Doublons approximatifs (accents, casse, ponctuation, articles)
+    with st.expander("🔁 Doublons approximatifs"):
+        threshold = st.slider("Similarité minimale", 0.80, 1.0, dedupe.THRESHOLD, 0.01)
+        if st.button("🔍 Chercher les doublons"):
+            st.session_state.show_duplicates = True
+        
+        if st.session_state.get("show_duplicates"):
+            duplicates = query_cache.cached(pool, dedupe.duplicate_books, threshold)
+            if duplicates.empty:
+                st.info("✅ Aucun doublon détecté")
+            else:
+                groups = duplicates.groupby("group")["id"].apply(list).tolist()
+                st.warning(f"⚠️ {len(groups)} groupes, {len(duplicates) - len(groups)} doublons")
+                st.dataframe(
+                    duplicates.rename(columns={
+                        "group": "Groupe", "owner": "Proprio", "author": "Auteur", "title": "Titre"
+                    }),
+                    use_container_width=True,
+                    hide_index=True,
+                )
+                if st.button("🔀 Fusionner (le plus ancien de chaque groupe est gardé)", type="primary"):
+                    with pool.writer() as conn:
+                        removed = dedupe.merge_groups(conn, groups)
+                    st.session_state.show_duplicates = False
+                    st.success(f"✅ {removed} livres fusionnés")
+                    st.rerun()
+
+# ==============================
+# ONGLETS
+# ==============================
+TABS = {
+    "📥 Import CSV": tab_import_csv,
+    "➕ Ajout manuel": tab_manual,
+    "📱 Scanner EAN": tab_scanner,
+    "🔍 Recherche": tab_search,
+    "📊 Liste": tab_list,
+}
+
+# Seul l'onglet affiché est exécuté (requêtes, pandas) : changer d'onglet relance le script
+for tab, render in zip(st.tabs(list(TABS), key="main_tab", on_change="rerun"), TABS.values()):
+    if tab.open:
+        with tab:
+            render()
+
+# ==============================
+# PROFILAGE (BLIBLIO_PROFILE=1)
+# ==============================
+def show_profile(trace):
+    """Instructions SQL et appels HTTP du rerun, plans des requêtes lentes"""
+    data = trace.as_dict()
+    st.divider()
+    with st.expander(f"🐞 Profilage : {data['duration'] * 1000:.0f} ms"):
+        sql = [s for s in data["stats"] if s["kind"] == "sql"]
+        st.text(f"SQL : {sum(s['count'] for s in sql)} exécutions, {sum(s['total'] for s in sql) * 1000:.1f} ms")
+        st.dataframe(
+            [
+                {
+                    "Type": s["kind"],
+                    "Instruction": s["label"],
+                    "Appels": s["count"],
+                    "Total (ms)": round(s["total"] * 1000, 2),
+                    "Max (ms)": round(s["max"] * 1000, 2),
+                    "Lignes": s["rows"],
+                    "Scan": "⚠️" if s.get("scan") else "",
+                }
+                for s in data["stats"]
+            ],
+            use_container_width=True,
+            hide_index=True,
+        )
+        for s in data["stats"]:
+            if s.get("plan"):
+                st.caption(f"{'⚠️ Parcours complet : ' if s['scan'] else ''}{s['label'][:120]}")
+                st.code("\n".join(s["plan"]), language=None)
+        st.download_button(
+            "📥 Mesures (JSON)",
+            data=json.dumps(profiler.snapshot(), indent=2, ensure_ascii=False),
+            file_name="profilage.json",
+            mime="application/json",
+        )
+
+if rerun_trace is not None:
+    profiler.end(rerun_trace)
+    with st.sidebar:
+        show_profile(rerun_trace)
@@ -0,0 +1,124 @@
+"""
+Test de charge de l'API (api.py) sur une base de 100 000 livres :
+latence p50 / p99 et requêtes par seconde, par endpoint.
+
+    python benchmarks/bench_api.py [livres] [clients] [secondes]
+"""
+import http.client
+import os
+import random
+import socket
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from common import ROOT
+
+from bench_search import QUERIES, fill
+
+BOOKS = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+CLIENTS = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+DURATION = float(sys.argv[3]) if len(sys.argv) > 3 else 10.0
+
+# (nom, chemin) ; "304" = même requête renvoyée avec If-None-Match
+SCENARIOS = [
+    ("search", lambda rnd: f"/books/search?q={rnd.choice(QUERIES).replace(' ', '+')}"),
+    ("search filtrée", lambda rnd: f"/books/search?q={rnd.choice(QUERIES).replace(' ', '+')}&owner=Nils&format=BD"),
+    ("liste", lambda rnd: f"/books?limit={rnd.choice([25, 50, 100])}"),
+    ("stats", lambda rnd: "/stats"),
+    ("304", lambda rnd: "/stats"),
+]
+
+# ==============================
+# SERVEUR
+# ==============================
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def start_server(db_path, port):
+    env = {**os.environ, "BLIBLIO_DB": db_path}
+    server = subprocess.Popen([sys.executable, "api.py", "--port", str(port)], cwd=ROOT, env=env)
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            return server
+        except OSError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("le serveur API n'a pas démarré")
+
+# ==============================
+# CLIENTS
+# ==============================
+def client(port, seed, deadline, results, lock):
+    rnd = random.Random(seed)
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    etag = None
+    local = []
+    while time.perf_counter() < deadline:
+        name, path = rnd.choice(SCENARIOS)
+        headers = {"Accept-Encoding": "gzip"}
+        if name == "304" and etag:
+            headers["If-None-Match"] = etag
+        t0 = time.perf_counter()
+        conn.request("GET", path(rnd), headers=headers)
+        response = conn.getresponse()
+        response.read()
+        local.append((name, time.perf_counter() - t0, response.status))
+        if name == "stats":
+            etag = response.getheader("ETag")
+    conn.close()
+    with lock:
+        results.extend(local)
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "books.sqlite")
+        conn = sqlite3.connect(db_path)
+        from db import migrate
+        migrate(conn)
+        fill(conn, BOOKS)
+        conn.close()
+
+        port = free_port()
+        server = start_server(db_path, port)
+        try:
+            results, lock = [], threading.Lock()
+            deadline = time.perf_counter() + DURATION
+            threads = [
+                threading.Thread(target=client, args=(port, seed, deadline, results, lock))
+                for seed in range(CLIENTS)
+            ]
+            started = time.perf_counter()
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            elapsed = time.perf_counter() - started
+        finally:
+            server.terminate()
+            server.wait()
+
+    print(f"{BOOKS} livres, {CLIENTS} clients, {elapsed:.1f} s")
+    for name, _ in SCENARIOS:
+        times = [t for n, t, _ in results if n == name]
+        statuses = sorted({s for n, _, s in results if n == name})
+        print(
+            f"{name:<16} {len(times):>7} req   p50 {statistics.median(times) * 1000:>7.2f} ms"
+            f"   p99 {percentile(times, 0.99) * 1000:>7.2f} ms   HTTP {statuses}"
+        )
+    errors = sum(1 for _, _, s in results if s >= 400)
+    print(f"total {len(results) / elapsed:>8.0f} req/s   erreurs {errors}")
+
+if __name__ == "__main__":
+    main()
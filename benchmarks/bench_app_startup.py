@@ -0,0 +1,117 @@
+"""
+Démarrage de app.py phase par phase : imports, initialisation, premier
+affichage et reruns (process neuf à chaque répétition, via AppTest).
+
+    python benchmarks/bench_app_startup.py [répétitions] [livres]
+"""
+import json
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import ROOT
+
+from bench_search import fill
+
+RUNS = int(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1] != "--child" else 5
+BOOKS = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+APP = ROOT / "app.py"
+HEAVY_MODULES = ["pandas", "requests", "pyarrow"]
+LIST_TAB = "📊 Liste"
+
+# ==============================
+# MESURE (process enfant)
+# ==============================
+def child():
+    import ast
+
+    phases = {}
+
+    t0 = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    phases["framework (streamlit)"] = time.perf_counter() - t0
+
+    # Imports de niveau module de app.py, exécutés seuls
+    tree = ast.parse(APP.read_text(encoding="utf-8"))
+    imports = ast.Module([n for n in tree.body if isinstance(n, (ast.Import, ast.ImportFrom))], [])
+    t0 = time.perf_counter()
+    exec(compile(imports, str(APP), "exec"), {})
+    phases["imports de app.py"] = time.perf_counter() - t0
+
+    import db
+    import jobs
+
+    init = [0.0]
+    def timed_init(fn):
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                init[0] += time.perf_counter() - t0
+        return wrapper
+    db.init_db = timed_init(db.init_db)
+    jobs.Runner.start = timed_init(jobs.Runner.start)
+
+    at = AppTest.from_file(str(APP), default_timeout=60)
+    t0 = time.perf_counter()
+    at.run()
+    first = time.perf_counter() - t0
+    phases["init (schéma, runner)"] = init[0]
+    phases["1er affichage (hors init)"] = first - init[0]
+    heavy = [m for m in HEAVY_MODULES if m in sys.modules]
+
+    pool = db.get_pool()
+    reads = pool.metrics()["reads"]
+    t0 = time.perf_counter()
+    at.run()
+    phases["rerun (1er onglet)"] = time.perf_counter() - t0
+    rerun_reads = pool.metrics()["reads"] - reads
+
+    at.session_state["main_tab"] = LIST_TAB
+    t0 = time.perf_counter()
+    at.run()
+    phases["1er passage onglet Liste"] = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    at.run()
+    phases["rerun (onglet Liste)"] = time.perf_counter() - t0
+
+    print(json.dumps({"phases": phases, "heavy": heavy, "rerun_reads": rerun_reads}))
+
+# ==============================
+# MAIN
+# ==============================
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "books.sqlite")
+        conn = sqlite3.connect(path)
+        from db import migrate
+        migrate(conn)
+        fill(conn, BOOKS)
+        conn.close()
+
+        env = {**os.environ, "BLIBLIO_DB": path}
+        samples = []
+        for _ in range(RUNS):
+            out = subprocess.run(
+                [sys.executable, __file__, "--child"], cwd=ROOT, env=env, check=True,
+                capture_output=True, text=True,
+            ).stdout
+            samples.append(json.loads(out.strip().splitlines()[-1]))
+
+    print(f"{BOOKS} livres, {RUNS} process")
+    for phase in samples[0]["phases"]:
+        times = [s["phases"][phase] for s in samples]
+        print(f"{phase:<28} médiane {statistics.median(times) * 1000:>8.1f} ms   min {min(times) * 1000:>8.1f} ms")
+    print(f"lectures SQLite par rerun     {samples[0]['rerun_reads']}")
+    print(f"modules chargés au 1er affichage : {', '.join(samples[0]['heavy']) or 'aucun'}")
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        child()
+    else:
+        main()
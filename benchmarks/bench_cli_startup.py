@@ -0,0 +1,45 @@
+"""
+Démarrage à froid de la CLI : `python -m bliblio stats` doit rester sous 150 ms.
+
+    python benchmarks/bench_cli_startup.py [répétitions]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import ROOT
+
+RUNS = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+BUDGET = 0.150
+
+COMMANDS = {
+    "python (à vide)": [sys.executable, "-c", "pass"],
+    "bliblio stats": [sys.executable, "-m", "bliblio", "stats"],
+    "imports de app.py": [sys.executable, "-c", "import streamlit, pandas, requests"],
+}
+
+def wall_time(cmd, env):
+    t0 = time.perf_counter()
+    subprocess.run(cmd, cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - t0
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, "BLIBLIO_DB": os.path.join(tmp, "books.sqlite")}
+        # Première exécution : création du schéma, hors mesure
+        subprocess.run(COMMANDS["bliblio stats"], cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL)
+
+        results = {}
+        for label, cmd in COMMANDS.items():
+            times = [wall_time(cmd, env) for _ in range(RUNS)]
+            results[label] = statistics.median(times)
+            print(f"{label:<22} médiane {results[label] * 1000:>7.1f} ms   min {min(times) * 1000:>7.1f} ms")
+
+    verdict = "OK" if results["bliblio stats"] < BUDGET else "DÉPASSÉ"
+    print(f"budget {BUDGET * 1000:.0f} ms : {verdict}")
+
+if __name__ == "__main__":
+    main()
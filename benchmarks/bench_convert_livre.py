@@ -0,0 +1,80 @@
+"""
+convert_livre_excel.py : extraction ligne à ligne (ancienne) vs vectorisée,
+puis coût d'écriture xlsx / csv / parquet.
+
+    python benchmarks/bench_convert_livre.py [facteur]
+
+La feuille livre.xlsx est répétée `facteur` fois pour simuler un gros inventaire.
+"""
+import math
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+from common import ROOT, timed
+
+import convert_livre_excel as conv
+
+FACTOR = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+def legacy_extract(df):
+    """Ancienne boucle : iterrows + clean()/to_bool() cellule par cellule"""
+    def to_bool(val):
+        if val is True:
+            return True
+        if val is False:
+            return False
+        if val is None or (isinstance(val, float) and math.isnan(val)):
+            return False
+        return str(val).strip().lower() in ("true", "1", "yes", "x")
+
+    def clean(val):
+        if val is None or (isinstance(val, float) and math.isnan(val)):
+            return ""
+        return str(val).strip()
+
+    rows = []
+    for owner, cfg in conv.BLOCKS.items():
+        start, cols = cfg["start"], cfg["columns"]
+        end = start + len(cols)
+        if df.shape[1] < end:
+            continue
+        sub = df.iloc[:, start:end].copy()
+        sub.columns = cols
+        for _, r in sub.iterrows():
+            titre = clean(r.get("Titre"))
+            if not titre:
+                continue
+            rows.append({
+                "owner": owner,
+                "type": "Livre",
+                "auteur": clean(r.get("Auteur")),
+                "titre": titre,
+                "langue": clean(r.get("Langue")),
+                "lu": to_bool(r.get("Lu")),
+                "garde": to_bool(r.get("Garde")),
+                "edition": clean(r.get("Edition")),
+            })
+    return pd.DataFrame(rows)
+
+def main():
+    base = pd.read_excel(ROOT / "livre.xlsx", header=0)
+    df = pd.concat([base] * FACTOR, ignore_index=True)
+    print(f"{len(df)} lignes source ({FACTOR} x livre.xlsx)")
+
+    t_old, old = timed(legacy_extract, df)
+    t_new, new = timed(conv.extract_blocks, df)
+    pd.testing.assert_frame_equal(old, new, check_dtype=False)
+    print(f"extraction ligne à ligne : {t_old:7.3f} s")
+    print(f"extraction vectorisée    : {t_new:7.3f} s  (x{t_old / t_new:.0f}, {len(new)} livres, résultat identique)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt, ext in conv.OUTPUT_FORMATS.items():
+            path = os.path.join(tmp, f"out{ext}")
+            t, _ = timed(conv.write_output, new, path, fmt)
+            print(f"écriture {fmt:<8}         : {t:7.3f} s  ({os.path.getsize(path) / 1e6:.1f} Mo)")
+
+if __name__ == "__main__":
+    main()
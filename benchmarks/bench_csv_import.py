@@ -0,0 +1,140 @@
+"""
+Benchmark de l'import CSV : ancien import ligne à ligne vs csv_import.sync_csv
+(import livré : lecture par blocs, différences ensemblistes), même fichier CSV.
+
+    python benchmarks/bench_csv_import.py [1000 10000 100000]
+"""
+import os
+import random
+import sys
+import tempfile
+
+import pandas as pd
+
+from common import timed
+
+import db
+from csv_import import sync_csv
+
+SIZES = [1_000, 10_000, 100_000]
+
+# ==============================
+# DONNÉES
+# ==============================
+def make_df(n, seed=42):
+    rnd = random.Random(seed)
+    owners = ["Axel", "Carole", "Nils", None]
+    formats = ["Livre", "BD", "Manga", "Comics", None]
+    rows = []
+    for i in range(n):
+        # ~5% de doublons, ~1% de lignes invalides
+        k = rnd.randrange(n) if rnd.random() < 0.05 else i
+        rows.append({
+            "Proprio": owners[k % 3] if rnd.random() > 0.01 else None,
+            "Format": rnd.choice(formats),
+            "Auteur": f"Auteur {k % 5000}",
+            "Titre": f"Titre n°{k}",
+            "Langue": rnd.choice(["Fr", "Eng", None]),
+            "Editeur": rnd.choice(["Gallimard", "Casterman", None]),
+        })
+    return pd.DataFrame(rows)
+
+# ==============================
+# ANCIEN IMPORT (référence)
+# ==============================
+def legacy_import(conn, df):
+    cur = conn.cursor()
+    inserted, skipped, errors = 0, 0, []
+    for idx, row in df.iterrows():
+        owner = str(row.get("Proprio", "")).strip()
+        format_type = str(row.get("Format", "Livre")).strip()
+        author = str(row.get("Auteur", "")).strip()
+        title = str(row.get("Titre", "")).strip()
+        language = str(row.get("Langue", "")).strip()
+        publisher = str(row.get("Editeur", "")).strip()
+        isbn = str(row.get("ISBN", "")).strip() if "ISBN" in df.columns else ""
+        if not owner or owner == "nan":
+            skipped += 1
+            errors.append(f"Ligne {idx+2}: Propriétaire vide")
+            continue
+        if not author or author == "nan":
+            skipped += 1
+            errors.append(f"Ligne {idx+2}: Auteur vide")
+            continue
+        if not title or title == "nan":
+            skipped += 1
+            errors.append(f"Ligne {idx+2}: Titre vide")
+            continue
+        exists = cur.execute(
+            "SELECT COUNT(*) FROM books_named WHERE owner = ? AND author = ? AND title = ?",
+            (owner, author, title),
+        ).fetchone()[0]
+        if exists > 0:
+            skipped += 1
+            continue
+        cur.execute(
+            "INSERT INTO books (owner_id, format_id, author, title, language_id, isbn, publisher) VALUES ("
+            "(SELECT id FROM owners WHERE name = ?), (SELECT id FROM formats WHERE name = ?), ?, ?, "
+            "(SELECT id FROM languages WHERE name = ?), ?, ?)",
+            (
+                owner,
+                format_type if format_type != "nan" else "Livre",
+                author,
+                title,
+                language if language != "nan" else "",
+                isbn if isbn not in ("", "nan") else None,
+                publisher if publisher != "nan" else None,
+            ),
+        )
+        inserted += 1
+    conn.commit()
+    return inserted, skipped, errors
+
+# ==============================
+# MESURES (base neuve sur disque pour chaque import)
+# ==============================
+def new_pool(tmp, name):
+    pool = db.ConnectionPool(os.path.join(tmp, name))
+    db.init_db(pool)
+    return pool
+
+def read_books(pool):
+    with pool.reader() as conn:
+        return conn.execute(
+            "SELECT owner, format, author, title, language, isbn, publisher FROM books_named ORDER BY id"
+        ).fetchall()
+
+def run_legacy(tmp, path):
+    """(secondes, (ajoutés, ignorés, erreurs), livres)"""
+    pool = new_pool(tmp, "legacy.sqlite")
+    with pool.writer() as conn:
+        elapsed, (inserted, skipped, errors) = timed(lambda: legacy_import(conn, pd.read_csv(path)))
+    books = read_books(pool)
+    pool.close()
+    return elapsed, (inserted, skipped, len(errors)), books
+
+def run_sync(tmp, path):
+    pool = new_pool(tmp, "sync.sqlite")
+    elapsed, (report, _, error_count) = timed(sync_csv, pool, path, "bench.csv")
+    books = read_books(pool)
+    pool.close()
+    return elapsed, (report["added"], error_count + report["duplicates"], error_count), books
+
+# ==============================
+# MAIN
+# ==============================
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or SIZES
+    print(f"{'lignes':>8} | {'ligne à ligne':>14} | {'sync_csv':>12} | gain")
+    print("-" * 50)
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "livres.csv")
+            make_df(n).to_csv(path, index=False)
+            t_old, r_old, b_old = run_legacy(tmp, path)
+            t_new, r_new, b_new = run_sync(tmp, path)
+        assert r_old == r_new and b_old == b_new, f"résultats différents : {r_old} / {r_new}"
+        print(f"{n:>8} | {t_old:>12.3f} s | {t_new:>10.3f} s | x{t_old / t_new:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Pic de mémoire de l'import CSV (csv_import.sync_csv) selon la taille du fichier :
+tout le fichier en un seul bloc (CHUNK_ROWS >= nombre de lignes, comme l'ancien
+import qui lisait le CSV d'un coup) vs blocs de CHUNK_ROWS lignes.
+
+    python benchmarks/bench_csv_memory.py [100000 300000 1000000]
+
+Chaque mesure tourne dans un sous-process pour isoler le pic de mémoire (RSS).
+"""
+import csv
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import ROOT
+
+import catalogue
+
+SIZES = [int(a) for a in sys.argv[1:] if a.isdigit()] or [100_000, 300_000, 1_000_000]
+BASE = 50_000   # livres générés, répétés (titres suffixés) jusqu'à la taille voulue
+
+# ==============================
+# FICHIER DE TEST
+# ==============================
+def write_big_csv(path, n):
+    books = catalogue.make_books(min(n, BASE))
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Proprio", "Format", "Auteur", "Titre", "Langue", "Editeur", "ISBN"])
+        for i in range(n):
+            b = books[i % len(books)]
+            title = b["title"] if i < len(books) else f"{b['title']} ({i // len(books)})"
+            writer.writerow([b["owner"], b["format"], b["author"], title, b["language"], b["publisher"], b["isbn"]])
+
+# ==============================
+# MESURES (sous-process)
+# ==============================
+def child(mode, path, db_path):
+    sys.path.insert(0, str(ROOT))
+    import pandas  # noqa: F401  (import hors mesure de temps, compté dans le RSS des deux modes)
+
+    import csv_import
+    import db
+
+    if mode == "whole":
+        csv_import.CHUNK_ROWS = csv_import.count_rows(path) + 1
+    pool = db.ConnectionPool(db_path)
+    db.init_db(pool)
+    t0 = time.perf_counter()
+    report, _, _ = csv_import.sync_csv(pool, path, "bench.csv")
+    elapsed = time.perf_counter() - t0
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"seconds": elapsed, "rss_mb": rss_kb / 1024, "added": report["added"]}))
+
+def measure(mode, path, db_path):
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", mode, path, db_path],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+def main():
+    print(f"{'lignes':>9} | {'fichier':>8} | {'méthode':<16} | {'temps':>8} | {'pic RSS':>9} | ajoutés")
+    print("-" * 72)
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in SIZES:
+            path = os.path.join(tmp, f"{n}.csv")
+            write_big_csv(path, n)
+            size_mb = os.path.getsize(path) / 1e6
+            for mode, label in (("whole", "un seul bloc"), ("chunks", "par blocs")):
+                db_path = os.path.join(tmp, f"{mode}-{n}.sqlite")
+                r = measure(mode, path, db_path)
+                print(
+                    f"{n:>9} | {size_mb:>5.0f} Mo | {label:<16} | {r['seconds']:>6.2f} s"
+                    f" | {r['rss_mb']:>6.0f} Mo | {r['added']}"
+                )
+            os.remove(path)
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(*sys.argv[2:5])
+    else:
+        main()
@@ -0,0 +1,99 @@
+"""
+Détection des doublons approximatifs : blocs (dedupe.find_duplicates) vs toutes
+les paires, sur un catalogue synthétique avec ~5% de variantes injectées.
+
+    python benchmarks/bench_dedupe.py [100000]
+"""
+import random
+import sys
+import unicodedata
+from itertools import combinations
+
+import pandas as pd
+
+from common import timed
+
+from bench_search import word
+
+import dedupe
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+BRUTE_FORCE_ROWS = 2_000     # au-delà, O(n²) devient interminable
+
+# ==============================
+# DONNÉES
+# ==============================
+def strip_accents(text):
+    return "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+
+VARIANTS = [
+    strip_accents,
+    str.lower,
+    str.upper,
+    lambda t: t + " ",
+    lambda t: t + " !",
+    lambda t: "Le " + t,
+    lambda t: t.replace(" ", ", ", 1),
+]
+
+def make_books(n, seed=42):
+    """DataFrame (id, owner, author, title) + groupes attendus"""
+    rnd = random.Random(seed)
+    authors = [f"{word(rnd)} {word(rnd)}" for _ in range(max(1, n // 20))]
+    rows, truth = [], {}
+    for i in range(n):
+        if rows and rnd.random() < 0.05:
+            # Variante d'un livre existant : même propriétaire
+            original = rnd.randrange(len(rows))
+            _, owner, author, title = rows[original]
+            title = rnd.choice(VARIANTS)(title)
+            author = rnd.choice(VARIANTS[:3])(author)
+            truth[i + 1] = truth.get(original + 1, original + 1)
+        else:
+            owner = rnd.choice(["Axel", "Carole", "Nils"])
+            author = rnd.choice(authors)
+            title = " ".join(word(rnd) for _ in range(rnd.randint(1, 5)))
+        rows.append((i + 1, owner, author, title))
+
+    expected = {}
+    for dup, original in truth.items():
+        expected.setdefault(original, [original]).append(dup)
+    return pd.DataFrame(rows, columns=["id", "owner", "author", "title"]), [sorted(g) for g in expected.values()]
+
+def pairs(groups):
+    return {p for g in groups for p in combinations(sorted(g), 2)}
+
+def brute_force(books, threshold=dedupe.THRESHOLD):
+    """Référence : chaque paire de même propriétaire est comparée"""
+    saved = dedupe.MAX_BLOCK, dedupe.AUTHOR_PREFIX
+    dedupe.MAX_BLOCK, dedupe.AUTHOR_PREFIX = len(books) + 1, 0   # un seul bloc par propriétaire
+    try:
+        return dedupe.find_duplicates(books, threshold)
+    finally:
+        dedupe.MAX_BLOCK, dedupe.AUTHOR_PREFIX = saved
+
+def report(label, elapsed, found, expected):
+    found_pairs, expected_pairs = pairs(found), pairs(expected)
+    true_positives = len(found_pairs & expected_pairs)
+    precision = true_positives / len(found_pairs) if found_pairs else 1.0
+    recall = true_positives / len(expected_pairs) if expected_pairs else 1.0
+    print(f"{label:<28} {elapsed:>8.2f} s   groupes {len(found):>6}   précision {precision:.3f}   rappel {recall:.3f}")
+
+# ==============================
+# MAIN
+# ==============================
+def main():
+    small, expected = make_books(BRUTE_FORCE_ROWS)
+    print(f"{BRUTE_FORCE_ROWS} livres ({len(expected)} groupes attendus)")
+    elapsed, found = timed(brute_force, small)
+    report("toutes les paires", elapsed, found, expected)
+    elapsed, found = timed(dedupe.find_duplicates, small)
+    report("blocs", elapsed, found, expected)
+
+    books, expected = make_books(ROWS)
+    print(f"{ROWS} livres ({len(expected)} groupes attendus)")
+    elapsed, found = timed(dedupe.find_duplicates, books)
+    report("blocs", elapsed, found, expected)
+
+if __name__ == "__main__":
+    main()
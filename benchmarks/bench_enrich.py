@@ -0,0 +1,86 @@
+"""
+Enrichissement en masse vs recherche ISBN une par une, contre les faux fournisseurs.
+
+    python benchmarks/bench_enrich.py [livres] [latence_ms]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import catalogue
+import stub_providers
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+LATENCY = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 50 / 1000
+
+# Une requête sur 25 répond 503 : les retries doivent absorber les erreurs
+server, base = stub_providers.start(latency=LATENCY, synthetic=True, fail_every=25)
+os.environ["BLIBLIO_GOOGLE_BOOKS_URL"] = f"{base}/books/v1/volumes"
+os.environ["BLIBLIO_OPENLIBRARY_URL"] = f"{base}/api/books"
+
+from common import ROOT  # noqa: E402,F401  (chemin du dépôt)
+
+import db  # noqa: E402
+import enrich  # noqa: E402
+import isbn_lookup  # noqa: E402
+
+def make_pool(tmp, name):
+    pool = db.ConnectionPool(os.path.join(tmp, name))
+    db.init_db(pool)
+    rows = []
+    for i in range(N):
+        isbn = catalogue.isbn13(i) if i % 10 < 7 else None
+        language = "Fr" if i % 3 == 0 else None
+        rows.append(("Nils", "Livre", f"Auteur {i % 50}", f"Titre {i}", language, isbn))
+    with pool.writer() as conn:
+        conn.executemany(
+            "INSERT INTO books (owner_id, format_id, author, title, language_id, isbn) VALUES ("
+            "(SELECT id FROM owners WHERE name = ?), (SELECT id FROM formats WHERE name = ?), ?, ?, "
+            "(SELECT id FROM languages WHERE name = ?), ?)",
+            rows,
+        )
+    return pool
+
+def served():
+    return server.RequestHandlerClass.requests_served
+
+def one_by_one(pool):
+    """Référence : ce que ferait l'onglet Scanner, un ISBN après l'autre"""
+    with pool.reader() as conn:
+        rows = conn.execute("SELECT id, isbn FROM books WHERE isbn IS NOT NULL").fetchall()
+    for _, isbn in rows:
+        try:
+            isbn_lookup.lookup_isbn(pool, isbn)
+        except Exception:
+            pass
+
+def incomplete(pool):
+    with pool.reader() as conn:
+        return conn.execute(
+            "SELECT COUNT(*) FROM books WHERE isbn IS NULL OR publisher IS NULL OR language_id IS NULL"
+        ).fetchone()[0]
+
+def main():
+    print(f"{N} livres, latence {LATENCY * 1000:.0f} ms, 1 requête sur 25 en 503")
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = make_pool(tmp, "seq.sqlite")
+        before, t0 = served(), time.perf_counter()
+        one_by_one(pool)
+        print(f"un par un (ISBN seulement) : {time.perf_counter() - t0:6.2f} s, {served() - before} requêtes")
+        pool.close()
+
+        isbn_lookup.clear_memory_cache()
+        pool = make_pool(tmp, "bulk.sqlite")
+        before, t0 = served(), time.perf_counter()
+        stats = enrich.enrich(pool, rate_limits={"google": 50.0, "openlibrary": 10.0})
+        print(f"enrichissement en masse    : {time.perf_counter() - t0:6.2f} s, {served() - before} requêtes")
+        print(f"  {stats} ; encore incomplets : {incomplete(pool)}")
+
+        before, t0 = served(), time.perf_counter()
+        stats = enrich.enrich(pool)
+        print(f"2e passage (cache)         : {time.perf_counter() - t0:6.2f} s, {served() - before} requêtes")
+        pool.close()
+
+if __name__ == "__main__":
+    main()
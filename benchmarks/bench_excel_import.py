@@ -0,0 +1,118 @@
+"""
+Lecture du classeur de import_excel.py : ancienne méthode (pd.read_excel deux fois
+par onglet) vs lecture unique en flux (excel_reader.read_workbook).
+
+    python benchmarks/bench_excel_import.py [lignes_par_onglet]
+
+Chaque mesure tourne dans un sous-process pour isoler le pic de mémoire (RSS).
+"""
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from openpyxl import Workbook
+
+from common import ROOT
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1].isdigit() else 50_000
+SHEETS = {"Livres": ["titre"], "BD": ["bd", "titre"]}
+
+# ==============================
+# CLASSEUR DE TEST
+# ==============================
+def make_workbook(path, n, seed=42):
+    """Même disposition que « Solde compte.xlsx » + un onglet comptable volumineux"""
+    rnd = random.Random(seed)
+    wb = Workbook(write_only=True)
+
+    ws = wb.create_sheet("Comptes")
+    for i in range(n):
+        ws.append([f"2024-{1 + i % 12:02d}-01", f"Opération {i}", rnd.random() * 100, rnd.random() * 1000])
+
+    ws = wb.create_sheet("Livres")
+    ws.append(["Inventaire des livres"])
+    ws.append([])
+    ws.append(["CAROLE", None, None, None, None, None, None, "NILS"])
+    ws.append(["Auteur", "Titre", "Eng / Fr", "Lu", "Gardé", "Edition", None, "Auteur", "Titre"])
+    for i in range(n):
+        ws.append([
+            f"Autrice {i % 700}", f"Roman {i}", rnd.choice(["Fr", "Eng"]), rnd.choice(["x", None]),
+            rnd.choice(["oui", None]), rnd.choice(["Gallimard", "Folio", None]), None,
+            f"Auteur {i % 300}" if i % 2 else None, f"Livre {i}" if i % 2 else None,
+        ])
+
+    ws = wb.create_sheet("BD")
+    ws.append(["Bandes dessinées de Nils"])
+    ws.append(["BD Auteur", "BD Titre"])
+    for i in range(n // 2):
+        ws.append([f"Dessinateur {i % 200}", f"Album {i}"])
+
+    wb.save(path)
+
+# ==============================
+# MESURES (sous-process)
+# ==============================
+def old_read(path):
+    """Reproduit l'ancien import_excel : read_excel header=None puis avec l'en-tête"""
+    import pandas as pd
+
+    def norm(x):
+        return str(x).strip().lower()
+
+    def find_header_row(raw_df, needle, max_scan=60):
+        for i in range(min(max_scan, len(raw_df))):
+            row_vals = [norm(v) for v in raw_df.iloc[i].values]
+            if any(needle in cell for cell in row_vals if cell):
+                return i
+        return None
+
+    result = {}
+    for sheet, needles in SHEETS.items():
+        raw = pd.read_excel(path, sheet_name=sheet, header=None)
+        header_row = next((h for h in (find_header_row(raw, n) for n in needles) if h is not None), None)
+        df = pd.read_excel(path, sheet_name=sheet, header=header_row)
+        df.columns = [norm(c) for c in df.columns]
+        result[sheet] = df
+    return result
+
+def new_read(path):
+    from excel_reader import read_workbook
+    return read_workbook(path, SHEETS)
+
+def child(mode, path):
+    sys.path.insert(0, str(ROOT))
+    t0 = time.perf_counter()
+    sheets = (old_read if mode == "old" else new_read)(path)
+    elapsed = time.perf_counter() - t0
+    titles = int(sheets["Livres"]["titre"].notna().sum())
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"seconds": elapsed, "rss_mb": rss_kb / 1024, "titles": titles}))
+
+def measure(mode, path):
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", mode, path],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "Solde compte.xlsx")
+        make_workbook(path, ROWS)
+        print(f"Classeur : {ROWS} lignes/onglet, {os.path.getsize(path) / 1e6:.1f} Mo")
+        print(f"{'méthode':<28} | {'temps':>8} | {'pic RSS':>9} | titres")
+        print("-" * 60)
+        for mode, label in (("old", "read_excel x2 par onglet"), ("new", "lecture unique (read_only)")):
+            r = measure(mode, path)
+            print(f"{label:<28} | {r['seconds']:>6.2f} s | {r['rss_mb']:>6.0f} Mo | {r['titles']}")
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(sys.argv[2], sys.argv[3])
+    else:
+        main()
@@ -0,0 +1,96 @@
+"""
+DataFrame d'un gros résultat (toute la base, sans filtre de recherche) :
+pd.DataFrame(fetchall()) vs frames.read_frame (colonnes catégorielles / Arrow).
+
+    python benchmarks/bench_frames.py [livres]
+
+Chaque méthode tourne dans son sous-process. Pic mémoire d'une construction,
+mesuré à part du chronométrage : allocations Python / numpy (tracemalloc) +
+tampons Arrow (pool mémoire pyarrow, vide au départ du sous-process).
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from common import ROOT
+
+import catalogue
+
+BOOKS = int(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1].isdigit() else 100_000
+REPEAT = 3
+
+# ==============================
+# MESURES (sous-process)
+# ==============================
+def child(mode, db_path):
+    sys.path.insert(0, str(ROOT))
+    import sqlite3
+
+    import pandas as pd
+
+    from frames import read_frame
+    from search import build_search_query
+
+    import pyarrow as pa
+
+    conn = sqlite3.connect(db_path)
+    query, params = build_search_query()
+
+    def build():
+        if mode == "tuples":
+            cur = conn.execute(query, params)
+            return pd.DataFrame(cur.fetchall(), columns=[d[0] for d in cur.description])
+        return read_frame(conn.execute(query, params))
+
+    arrow_before = pa.total_allocated_bytes()
+    tracemalloc.start()
+    df = build()
+    python_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    peak = python_peak + pa.default_memory_pool().max_memory() - arrow_before
+    size = int(df.memory_usage(deep=True).sum())
+    del df
+
+    best = float("inf")
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        df = build()
+        best = min(best, time.perf_counter() - t0)
+        del df
+    print(json.dumps({"seconds": best, "peak_mb": peak / 1e6, "frame_mb": size / 1e6}))
+
+def measure(mode, db_path):
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", mode, db_path],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+def main():
+    sys.path.insert(0, str(ROOT))
+    import db
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "books.sqlite")
+        pool = db.ConnectionPool(db_path)
+        db.init_db(pool)
+        with pool.writer() as conn:
+            catalogue.fill(conn, catalogue.make_books(BOOKS))
+        pool.close()
+
+        print(f"{BOOKS} livres")
+        print(f"{'méthode':<26} | {'temps':>8} | {'pic mémoire':>11} | DataFrame")
+        print("-" * 64)
+        for mode, label in (("tuples", "pd.DataFrame(fetchall())"), ("frames", "frames.read_frame")):
+            r = measure(mode, db_path)
+            print(f"{label:<26} | {r['seconds'] * 1000:>5.0f} ms | {r['peak_mb']:>8.0f} Mo | {r['frame_mb']:>5.1f} Mo")
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(sys.argv[2], sys.argv[3])
+    else:
+        main()
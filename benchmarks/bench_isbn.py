@@ -0,0 +1,75 @@
+"""
+ISBN : normalisation d'une colonne abîmée par un tableur (isbns.canonical_isbns)
+et test « ai-je déjà ce livre ? » dans l'index unique (isbn, owner_id).
+
+    python benchmarks/bench_isbn.py [100000]
+"""
+import random
+import sys
+
+from common import memory_db, timed
+
+import catalogue
+from isbns import canonical_isbn, canonical_isbns
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+PROBES = 10_000
+
+# ==============================
+# DONNÉES
+# ==============================
+def damage(isbn, rnd):
+    """Ce que deviennent les ISBN d'un tableur relu par pandas ou saisis à la main"""
+    r = rnd.random()
+    if r < 0.25 and isbn.isdigit():
+        return f"{int(isbn)}.0"                               # colonne lue en float
+    if r < 0.35 and isbn.isdigit():
+        return f"{int(isbn):.5E}"                             # notation scientifique tronquée
+    if r < 0.5:
+        return f"{isbn[:3]}-{isbn[3]}-{isbn[4:8]}-{isbn[8:]}"   # tirets
+    return isbn
+
+def old_normalize(isbn):
+    """Ancienne normalisation (isbn_lookup) : séparateurs retirés, rien de vérifié"""
+    return str(isbn).replace("-", "").replace(" ", "").strip()
+
+# ==============================
+# MAIN
+# ==============================
+def main():
+    rnd = random.Random(42)
+    books = catalogue.make_books(ROWS)
+    raw = [damage(b["isbn"], rnd) if b["isbn"] else None for b in books]
+    expected = canonical_isbns([b["isbn"] for b in books])
+
+    t_old, _ = timed(lambda: [old_normalize(v) if v else None for v in raw], repeat=3)
+    t_new, found = timed(canonical_isbns, raw, repeat=3)
+    t_clean, _ = timed(canonical_isbn, "9782070360024", repeat=20)
+    t_damaged, _ = timed(canonical_isbn, "978-2-07-036002-4", repeat=20)
+    present = sum(v is not None for v in raw)
+    recovered = int(((found == expected) & expected.notna()).sum())
+    lost = int((found.isna() & expected.notna()).sum())
+
+    print(f"{ROWS} livres, {present} ISBN saisis")
+    print(f"ancienne normalisation (ligne à ligne) : {t_old * 1000:7.1f} ms (aucun contrôle)")
+    print(f"canonical_isbns (colonne)              : {t_new * 1000:7.1f} ms")
+    print(f"canonical_isbn (un code propre / abîmé) : {t_clean * 1e6:.0f} µs / {t_damaged * 1e6:.0f} µs")
+    print(f"  ISBN-13 canoniques retrouvés : {recovered} ; illisibles (notation tronquée) : {lost}")
+
+    conn = memory_db()
+    catalogue.fill(conn, books)
+    owned = conn.execute("SELECT isbn, owner_id FROM books WHERE isbn IS NOT NULL").fetchall()
+    probes = [rnd.choice(owned) if rnd.random() < 0.5 else (catalogue.isbn13(ROWS + i), 1) for i in range(PROBES)]
+
+    def probe_all():
+        return sum(
+            conn.execute("SELECT 1 FROM books WHERE isbn = ? AND owner_id = ?", probe).fetchone() is not None
+            for probe in probes
+        )
+
+    t_probe, hits = timed(probe_all, repeat=3)
+    plan = conn.execute("EXPLAIN QUERY PLAN SELECT 1 FROM books WHERE isbn = ? AND owner_id = ?", probes[0]).fetchall()
+    print(f"déjà possédé ? {PROBES} tests : {t_probe * 1e6 / PROBES:.1f} µs / code ({hits} trouvés) — {plan[0][-1]}")
+
+if __name__ == "__main__":
+    main()
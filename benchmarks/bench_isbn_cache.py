@@ -0,0 +1,47 @@
+"""
+Recherche ISBN avec et sans cache, contre les faux fournisseurs locaux.
+
+    python benchmarks/bench_isbn_cache.py [latence_ms]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import stub_providers
+
+LATENCY = float(sys.argv[1]) / 1000 if len(sys.argv) > 1 else 0.2
+server, base = stub_providers.start(latency=LATENCY)
+os.environ["BLIBLIO_GOOGLE_BOOKS_URL"] = f"{base}/books/v1/volumes"
+os.environ["BLIBLIO_OPENLIBRARY_URL"] = f"{base}/api/books"
+
+from common import ROOT  # noqa: E402,F401  (chemin du dépôt)
+
+import db  # noqa: E402
+import isbn_lookup  # noqa: E402
+
+ISBNS = ["978-2-07-061275-8", "9782203001169", "9780141439518", "9780000000002"]
+
+def run(pool, label):
+    t0 = time.perf_counter()
+    found = [isbn_lookup.lookup_isbn(pool, isbn) for isbn in ISBNS]
+    elapsed = time.perf_counter() - t0
+    titles = [b["title"] if b else "—" for b in found]
+    print(f"{label:<22} {elapsed * 1000:>8.1f} ms   {titles}")
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = db.ConnectionPool(os.path.join(tmp, "books.sqlite"))
+        db.init_db(pool)
+
+        run(pool, "à froid (réseau)")
+        run(pool, "LRU mémoire")
+        isbn_lookup.clear_memory_cache()
+        run(pool, "table isbn_cache")
+
+        print(isbn_lookup.cache_stats())
+        print(f"requêtes reçues par le faux serveur : {server.RequestHandlerClass.requests_served}")
+        pool.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Réimport d'un même CSV : import complet, fichier inchangé, fichier légèrement modifié.
+
+    python benchmarks/bench_reimport.py [lignes]
+"""
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+from common import timed
+
+from bench_csv_import import make_df
+
+import db
+from csv_import import sync_csv
+from import_manifest import file_hash
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+
+def to_csv(df):
+    return df.to_csv(index=False).encode()
+
+def sync(pool, path):
+    report, _, _ = sync_csv(pool, path, "bench.csv", file_hash(path))
+    return report
+
+def main():
+    df = make_df(ROWS)
+    original = to_csv(df)
+
+    # ~1% de lignes modifiées, 1% retirées, 1% ajoutées
+    edited = df.copy()
+    step = 100
+    edited.loc[edited.index[::step], "Editeur"] = "Éditeur corrigé"
+    edited = edited.drop(edited.index[50::step])
+    extra = make_df(ROWS // step, seed=7)
+    extra["Titre"] = "Nouveau " + extra["Titre"].astype(str)
+    edited = pd.concat([edited, extra], ignore_index=True)
+    modified = to_csv(edited)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = db.ConnectionPool(os.path.join(tmp, "books.sqlite"))
+        db.init_db(pool)
+
+        print(f"{ROWS} lignes")
+        for label, data in [
+            ("import initial", original),
+            ("même fichier", original),
+            ("fichier modifié", modified),
+            ("fichier modifié bis", modified),
+        ]:
+            path = os.path.join(tmp, "bench.csv")
+            with open(path, "wb") as f:
+                f.write(data)
+            elapsed, report = timed(sync, pool, path)
+            print(f"{label:<22} {elapsed * 1000:>9.1f} ms   {report}")
+        pool.close()
+
+if __name__ == "__main__":
+    main()
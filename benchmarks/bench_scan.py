@@ -0,0 +1,111 @@
+"""
+Étagère scannée : code par code (recherche réseau puis ajout, une transaction
+chacun, comme l'onglet Scanner) vs session de scan (scan.py : index local,
+recherches parallèles des seuls inconnus, un ajout groupé), contre les faux fournisseurs.
+
+    python benchmarks/bench_scan.py [codes] [latence_ms]
+"""
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+import stub_providers
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+LATENCY = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 50 / 1000
+KNOWN_RATE = 0.8              # part de l'étagère déjà cataloguée
+
+server, base = stub_providers.start(latency=LATENCY, synthetic=True)
+os.environ["BLIBLIO_GOOGLE_BOOKS_URL"] = f"{base}/books/v1/volumes"
+os.environ["BLIBLIO_OPENLIBRARY_URL"] = f"{base}/api/books"
+
+from common import ROOT  # noqa: E402,F401  (chemin du dépôt)
+
+import catalogue  # noqa: E402
+import db  # noqa: E402
+import dimensions  # noqa: E402
+import isbn_lookup  # noqa: E402
+import scan  # noqa: E402
+
+# ==============================
+# DONNÉES
+# ==============================
+def make_pool(tmp, name, owned):
+    pool = db.ConnectionPool(os.path.join(tmp, name))
+    db.init_db(pool)
+    with pool.writer() as conn:
+        catalogue.fill(conn, owned)
+    return pool
+
+def served():
+    return server.RequestHandlerClass.requests_served
+
+# ==============================
+# SCÉNARIOS
+# ==============================
+def one_by_one(pool, codes):
+    """Référence : recherche réseau de chaque code, puis un ajout (et un rerun) par livre"""
+    added = 0
+    for code in codes:
+        book = isbn_lookup.lookup_isbn(pool, code)
+        if not book:
+            continue
+        try:
+            with pool.writer() as conn:
+                dimensions.insert_book(
+                    conn, "Nils", "Livre", book["authors"], book["title"], book["language"], book["isbn"], book["publisher"]
+                )
+            added += 1
+        except sqlite3.IntegrityError:
+            pass
+    return added
+
+def session(pool, codes):
+    with pool.reader() as conn:
+        rows = scan.check_codes(conn, codes, "Nils")
+    scan.lookup_pending(pool, rows)
+    added, _ = scan.add_books(pool, [row for row in rows if row["status"] in scan.ADDABLE], "Nils", "Livre")
+    return added
+
+# ==============================
+# MAIN
+# ==============================
+def main():
+    rnd = random.Random(42)
+    books = catalogue.make_books(N * 5)
+    owned = [{**b, "owner": "Nils"} for b in books if b["isbn"]][:int(N * KNOWN_RATE)]
+    codes = [b["isbn"] for b in owned] + [catalogue.isbn13(10 * N + i) for i in range(N - len(owned))]
+    rnd.shuffle(codes)
+
+    print(f"{N} codes, {len(owned)} déjà catalogués, latence {LATENCY * 1000:.0f} ms")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, fn in (("code par code", one_by_one), ("session de scan", session)):
+            pool = make_pool(tmp, f"{fn.__name__}.sqlite", owned)
+            isbn_lookup.clear_memory_cache()
+            before = served()
+            t0 = time.perf_counter()
+            added = fn(pool, codes)
+            elapsed = time.perf_counter() - t0
+            print(
+                f"{label:<16}: {elapsed:6.2f} s, {N / elapsed:7.1f} codes/s,"
+                f" {served() - before} requêtes, {added} ajoutés"
+            )
+            pool.close()
+
+    # Codes déjà connus seuls : ce que voit une étagère déjà cataloguée
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = make_pool(tmp, "known.sqlite", owned)
+        known = [b["isbn"] for b in owned]
+        t0 = time.perf_counter()
+        with pool.reader() as conn:
+            rows = scan.check_codes(conn, known, "Nils")
+        elapsed = time.perf_counter() - t0
+        owned_rows = sum(row["status"] == scan.OWNED for row in rows)
+        print(f"vérification locale seule : {len(known) / elapsed:,.0f} codes/s ({owned_rows} reconnus)")
+        pool.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark de l'onglet Recherche : LIKE '%x%' (ancien) vs index FTS5.
+
+    python benchmarks/bench_search.py [10000 100000 300000]
+"""
+import random
+import sys
+
+from common import memory_db, timed
+
+from search import search_books
+
+SIZES = [10_000, 100_000, 300_000]
+QUERIES = ["miserables", "tintin tibet", "herge", "austen pride"]
+
+SYLLABLES = ["ba", "cho", "dé", "fi", "gar", "lu", "mé", "nor", "pa", "ri", "sé", "tou", "vè", "zo"]
+FAMOUS = [
+    ("Victor Hugo", "Les Misérables"),
+    ("Hergé", "Tintin au Tibet"),
+    ("Goscinny", "Astérix en Corse"),
+    ("Jane Austen", "Pride and Prejudice"),
+]
+PUBLISHERS = ["Gallimard", "Casterman", "Penguin", "Dargaud", None]
+
+def word(rnd):
+    return "".join(rnd.choice(SYLLABLES) for _ in range(rnd.randint(2, 4))).capitalize()
+
+def fill(conn, n, seed=42):
+    """Catalogue à vocabulaire varié : les requêtes sont sélectives, comme en vrai"""
+    rnd = random.Random(seed)
+
+    def book(i):
+        if i % 500 == 0:
+            author, title = FAMOUS[(i // 500) % len(FAMOUS)]
+        else:
+            author = f"{word(rnd)} {word(rnd)}"
+            title = " ".join(word(rnd) for _ in range(rnd.randint(1, 5)))
+        return (
+            rnd.choice(["Axel", "Carole", "Nils"]),
+            rnd.choice(["Livre", "BD", "Manga"]),
+            author,
+            title,
+            rnd.choice(PUBLISHERS),
+        )
+
+    conn.executemany(
+        "INSERT OR IGNORE INTO books (owner_id, format_id, author, title, publisher) "
+        "VALUES ((SELECT id FROM owners WHERE name = ?), (SELECT id FROM formats WHERE name = ?), ?, ?, ?)",
+        (book(i) for i in range(n)),
+    )
+    conn.commit()
+
+def like_search(conn, text):
+    return conn.execute(
+        "SELECT owner, format, author, title, language, publisher FROM books_named "
+        "WHERE (title LIKE ? OR author LIKE ?) ORDER BY owner_id, author, title",
+        (f"%{text}%", f"%{text}%"),
+    ).fetchall()
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or SIZES
+    print(f"{'livres':>8} | {'requête':<14} | {'LIKE':>9} | {'FTS5':>9} | résultats")
+    print("-" * 62)
+    for n in sizes:
+        conn = memory_db()
+        fill(conn, n)
+        for q in QUERIES:
+            t_like, _ = timed(like_search, conn, q, repeat=3)
+            t_fts, rows = timed(search_books, conn, q, owner="Nils", repeat=3)
+            print(f"{n:>8} | {q:<14} | {t_like * 1000:>6.1f} ms | {t_fts * 1000:>6.1f} ms | {len(rows)}")
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Catalogues synthétiques reproductibles (graine fixe) pour les benchmarks :
+livres réalistes, CSV de l'onglet Import, classeur « Solde compte.xlsx »
+(import_excel.py) et livre.xlsx à blocs (convert_livre_excel.py).
+
+    python benchmarks/catalogue.py [small|medium|large|N] [dossier]
+"""
+import csv
+import random
+import sys
+from itertools import zip_longest
+from pathlib import Path
+
+import common  # noqa: F401  (racine du dépôt sur sys.path)
+from isbns import canonical_isbns
+
+SEED = 42
+SIZES = {"small": 1_000, "medium": 20_000, "large": 100_000}
+
+OWNERS = {"Nils": 0.4, "Carole": 0.35, "Axel": 0.25}
+FORMATS = {"Livre": 0.6, "BD": 0.25, "Manga": 0.1, "Comics": 0.05}
+LANGUAGES = {"Fr": 0.7, "Eng": 0.2, "Esp": 0.05, "Deu": 0.05}
+PUBLISHERS = ["Gallimard", "Casterman", "Dargaud", "Penguin", "Glénat", "Actes Sud", "Le Livre de Poche", None]
+
+FIRST_NAMES = [
+    "Émile", "Hélène", "François", "Zoé", "Jérôme", "Agnès", "Chloé", "Noël",
+    "Léa", "Björn", "José", "Ana", "Théo", "Céline", "André", "Margaret",
+]
+LAST_NAMES = [
+    "Zola", "Hugo", "Lefèvre", "Dürrenmatt", "Gómez", "Brontë", "Müller", "Ducharme",
+    "Perec", "Saint-Exupéry", "Le Guin", "Camus", "Goscinny", "Hergé", "Sfar", "Atwood",
+]
+SYLLABLES = ["ba", "cho", "dé", "fi", "gar", "lu", "mé", "nor", "pa", "ri", "sé", "tou", "vè", "zo", "ça", "œu"]
+ARTICLES = ["Le", "La", "Les", "L'", "Un", "The"]
+
+DUPLICATE_RATE = 0.03   # copie exacte d'un livre déjà vu (dédoublonnée à l'import)
+VARIANT_RATE = 0.02     # même livre, saisie différente (casse, accents, article)
+ISBN13_RATE = 0.6
+ISBN10_RATE = 0.1       # le reste : sans ISBN
+
+# ==============================
+# LIVRES
+# ==============================
+def pick(rnd, weights):
+    return rnd.choices(list(weights), weights=list(weights.values()))[0]
+
+def word(rnd):
+    return "".join(rnd.choice(SYLLABLES) for _ in range(rnd.randint(2, 4))).capitalize()
+
+def isbn13(n):
+    digits = f"9782{n % 100000000:08d}"
+    check = (10 - sum(int(d) * (1 if i % 2 == 0 else 3) for i, d in enumerate(digits)) % 10) % 10
+    return f"{digits}{check}"
+
+def isbn10(n):
+    digits = f"2{n % 100000000:08d}"
+    check = (11 - sum(int(d) * (10 - i) for i, d in enumerate(digits)) % 11) % 11
+    return digits + ("X" if check == 10 else str(check))
+
+def variant(rnd, text):
+    """Même titre, autre saisie"""
+    return rnd.choice([
+        str.lower,
+        str.upper,
+        lambda t: t.replace("é", "e").replace("è", "e").replace("ç", "c"),
+        lambda t: f"{rnd.choice(ARTICLES)} {t}",
+        lambda t: f"{t} ",
+    ])(text)
+
+def make_books(n, seed=SEED):
+    """
+    n livres (dicts au format de la table books) : propriétaires et formats
+    pondérés, auteurs accentués (parfois « Nom, Prénom »), ISBN-13 / ISBN-10
+    valides, ~3% de doublons exacts et ~2% de variantes de saisie.
+    """
+    rnd = random.Random(seed)
+    authors = [
+        f"{rnd.choice(FIRST_NAMES)} {rnd.choice(LAST_NAMES)}{'' if i < len(LAST_NAMES) else ' ' + word(rnd)}"
+        for i in range(max(len(LAST_NAMES), n // 8))
+    ]
+    books = []
+    for i in range(n):
+        r = rnd.random()
+        if books and r < DUPLICATE_RATE:
+            books.append(dict(rnd.choice(books)))
+            continue
+        if books and r < DUPLICATE_RATE + VARIANT_RATE:
+            book = dict(rnd.choice(books))
+            book["title"] = variant(rnd, book["title"])
+            book["isbn"] = None   # ressaisi à la main
+            books.append(book)
+            continue
+
+        author = rnd.choice(authors)
+        if rnd.random() < 0.1:
+            first, _, last = author.partition(" ")
+            author = f"{last}, {first}"
+        r = rnd.random()
+        isbn = isbn13(i) if r < ISBN13_RATE else isbn10(i) if r < ISBN13_RATE + ISBN10_RATE else None
+        read = rnd.random() < 0.5
+        books.append({
+            "owner": pick(rnd, OWNERS),
+            "format": pick(rnd, FORMATS),
+            "author": author,
+            "title": " ".join(word(rnd) for _ in range(rnd.randint(1, 5))),
+            "language": pick(rnd, LANGUAGES),
+            "publisher": rnd.choice(PUBLISHERS),
+            "isbn": isbn,
+            "read": int(read),
+            "kept": int(not read or rnd.random() < 0.8),
+        })
+    return books
+
+def size_of(name):
+    return SIZES[name] if name in SIZES else int(name)
+
+# ==============================
+# FICHIERS D'ENTRÉE
+# ==============================
+def write_csv(books, path):
+    """CSV attendu par l'onglet Import (colonnes Proprio, Format, Auteur, Titre...)"""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Proprio", "Format", "Auteur", "Titre", "Langue", "Editeur", "ISBN"])
+        for b in books:
+            writer.writerow([b["owner"], b["format"], b["author"], b["title"], b["language"], b["publisher"], b["isbn"]])
+
+def write_solde_workbook(books, path):
+    """
+    « Solde compte.xlsx » d'import_excel.py : onglet Livres avec les blocs
+    CAROLE (gauche) et NILS (droite), onglet BD pour les BD de Nils.
+    Les livres d'Axel n'ont pas de place dans ce classeur.
+    """
+    from openpyxl import Workbook
+
+    carole = [b for b in books if b["owner"] == "Carole" and b["format"] == "Livre"]
+    nils = [b for b in books if b["owner"] == "Nils" and b["format"] == "Livre"]
+    nils_bd = [b for b in books if b["owner"] == "Nils" and b["format"] == "BD"]
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Livres")
+    ws.append(["Inventaire des livres"])
+    ws.append([])
+    ws.append(["CAROLE", None, None, None, None, None, None, "NILS"])
+    ws.append(["Auteur", "Titre", "Eng / Fr", "Lu", "Gardé", "Edition", None, "Auteur", "Titre"])
+    for c, n in zip_longest(carole, nils):
+        left = [
+            c["author"], c["title"], c["language"], "x" if c["read"] else None,
+            "oui" if c["kept"] else None, c["publisher"],
+        ] if c else [None] * 6
+        ws.append(left + [None] + ([n["author"], n["title"]] if n else [None, None]))
+
+    ws = wb.create_sheet("BD")
+    ws.append(["Bandes dessinées de Nils"])
+    ws.append(["BD Auteur", "BD Titre"])
+    for b in nils_bd:
+        ws.append([b["author"], b["title"]])
+    wb.save(path)
+
+def write_livre_workbook(books, path):
+    """livre.xlsx de convert_livre_excel.py : blocs CAROLE / NILS / AXEL côte à côte"""
+    from openpyxl import Workbook
+
+    blocks = [[b for b in books if b["owner"] == owner and b["format"] == "Livre"] for owner in ("Carole", "Nils", "Axel")]
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Feuil1")
+    ws.append(
+        ["Auteur", "Titre", "Langue", "Lu", "Garde", "Edition", None]
+        + ["Auteur", "Titre", "Langue", None, None, None, None]
+        + ["Auteur", "Titre", "Langue"]
+    )
+    for c, n, a in zip_longest(*blocks):
+        row = [c["author"], c["title"], c["language"], bool(c["read"]), bool(c["kept"]), c["publisher"]] if c else [None] * 6
+        row += [None]
+        row += [n["author"], n["title"], n["language"]] if n else [None] * 3
+        row += [None] * 4
+        row += [a["author"], a["title"], a["language"]] if a else [None] * 3
+        ws.append(row)
+    wb.save(path)
+
+def fill(conn, books):
+    """Insère directement dans books (doublons exacts ignorés, ISBN canoniques, comme à l'import)"""
+    isbns = canonical_isbns([b["isbn"] for b in books])
+    books = [{**b, "isbn": isbn} for b, isbn in zip(books, isbns)]
+    conn.executemany(
+        """
+        INSERT OR IGNORE INTO books (
+            owner_id, format_id, author, title, language_id, publisher, isbn, read, kept_after_reading
+        )
+        VALUES (
+            (SELECT id FROM owners WHERE name = :owner), (SELECT id FROM formats WHERE name = :format),
+            :author, :title, (SELECT id FROM languages WHERE name = :language),
+            :publisher, :isbn, :read, :kept
+        )
+        """,
+        books,
+    )
+    conn.commit()
+
+def write_inputs(books, directory):
+    """Les trois fichiers d'entrée dans `directory` ; retourne {nom: chemin}"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = {
+        "csv": directory / "catalogue.csv",
+        "solde": directory / "Solde compte.xlsx",
+        "livre": directory / "livre.xlsx",
+    }
+    write_csv(books, paths["csv"])
+    write_solde_workbook(books, paths["solde"])
+    write_livre_workbook(books, paths["livre"])
+    return paths
+
+def main():
+    n = size_of(sys.argv[1] if len(sys.argv) > 1 else "small")
+    directory = sys.argv[2] if len(sys.argv) > 2 else "catalogue"
+    for name, path in write_inputs(make_books(n), directory).items():
+        print(f"{name:<6} {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""Outils partagés par les benchmarks (base de test migrée, chronométrage)."""
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from db import migrate  # noqa: E402
+
+def memory_db():
+    conn = sqlite3.connect(":memory:")
+    migrate(conn)
+    return conn
+
+def timed(fn, *args, repeat=1, **kwargs):
+    """Retourne (meilleur temps en secondes, résultat du dernier appel)"""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - t0)
+    return best, result
@@ -0,0 +1,135 @@
+"""
+Faux Google Books / OpenLibrary locaux, réponses préenregistrées.
+
+    python benchmarks/stub_providers.py [port] [--synthetic]
+
+puis lancer l'app ou un benchmark avec :
+    BLIBLIO_GOOGLE_BOOKS_URL=http://127.0.0.1:8765/books/v1/volumes
+    BLIBLIO_OPENLIBRARY_URL=http://127.0.0.1:8765/api/books
+"""
+import json
+import re
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Google Books connaît les deux premiers, OpenLibrary le troisième
+GOOGLE_BOOKS = {
+    "9782070612758": {
+        "title": "Le Petit Prince",
+        "authors": ["Antoine de Saint-Exupéry"],
+        "publisher": "Gallimard",
+        "language": "fr",
+    },
+    "9782203001169": {
+        "title": "Tintin au Tibet",
+        "authors": ["Hergé"],
+        "publisher": "Casterman",
+        "language": "fr",
+    },
+}
+OPENLIBRARY_BOOKS = {
+    "9780141439518": {
+        "title": "Pride and Prejudice",
+        "authors": [{"name": "Jane Austen"}],
+        "publishers": [{"name": "Penguin"}],
+    },
+}
+
+def synthetic_found(isbn):
+    """Mode synthétique : 3 ISBN sur 4 existent"""
+    return isbn.isdigit() and int(isbn) % 4 != 0
+
+def synthetic_isbn(title):
+    """ISBN-13 valide (clé de contrôle) dérivé du titre"""
+    digits = f"979{zlib.crc32(title.encode('utf-8')) % 10**9:09d}"
+    check = (10 - sum(int(d) * (1 if i % 2 == 0 else 3) for i, d in enumerate(digits)) % 10) % 10
+    return f"{digits}{check}"
+
+class StubHandler(BaseHTTPRequestHandler):
+    latency = 0.0          # secondes ajoutées à chaque réponse
+    synthetic = False      # invente une réponse pour n'importe quel ISBN / titre
+    fail_every = 0         # une requête sur N répond 503 (test des retries)
+    requests_served = 0
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, payload, status=200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def google_book(self, q):
+        if q.startswith("isbn:"):
+            isbn = q.removeprefix("isbn:")
+            if isbn in GOOGLE_BOOKS:
+                return GOOGLE_BOOKS[isbn]
+            if self.synthetic and synthetic_found(isbn):
+                return {"title": f"Livre {isbn}", "authors": ["Auteur Stub"],
+                        "publisher": "Éditions Stub", "language": "fr"}
+        elif self.synthetic:
+            title = re.search(r'intitle:"([^"]*)"', q)
+            if title:
+                return {"title": title.group(1), "publisher": "Éditions Stub", "language": "fr",
+                        "industryIdentifiers": [{"type": "ISBN_13", "identifier": synthetic_isbn(title.group(1))}]}
+        return None
+
+    def openlibrary_book(self, isbn):
+        if isbn in OPENLIBRARY_BOOKS:
+            return OPENLIBRARY_BOOKS[isbn]
+        if self.synthetic and synthetic_found(isbn):
+            return {"title": f"Livre {isbn}", "publishers": [{"name": "Éditions Stub"}]}
+        return None
+
+    def do_GET(self):
+        cls = type(self)
+        cls.requests_served += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.fail_every and cls.requests_served % self.fail_every == 0:
+            self.send_json({"error": "unavailable"}, status=503)
+            return
+
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+
+        if url.path == "/books/v1/volumes":
+            book = self.google_book(query.get("q", [""])[0])
+            if book:
+                self.send_json({"totalItems": 1, "items": [{"volumeInfo": book}]})
+            else:
+                self.send_json({"totalItems": 0})
+        elif url.path == "/api/books":
+            keys = query.get("bibkeys", [""])[0].split(",")
+            books = {key: self.openlibrary_book(key.removeprefix("ISBN:")) for key in keys}
+            self.send_json({key: book for key, book in books.items() if book})
+        else:
+            self.send_json({"error": "not found"}, status=404)
+
+def start(port=0, latency=0.0, synthetic=False, fail_every=0):
+    """Démarre le serveur dans un thread ; retourne (server, base_url)"""
+    handler = type("Handler", (StubHandler,), {
+        "latency": latency,
+        "synthetic": synthetic,
+        "fail_every": fail_every,
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    server, base = start(port, synthetic="--synthetic" in sys.argv)
+    print(f"Google Books : {base}/books/v1/volumes")
+    print(f"OpenLibrary  : {base}/api/books")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
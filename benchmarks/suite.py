@@ -0,0 +1,258 @@
+"""
+Suite de benchmarks des chemins critiques (imports CSV / Excel, recherche,
+liste paginée, export, statistiques, doublons) sur un catalogue généré par
+benchmarks/catalogue.py. Résultats en JSON pour comparer deux exécutions.
+
+    python benchmarks/suite.py [--size medium] [--repeat 3] [--only search,export]
+                               [--output résultats.json] [--compare avant.json]
+"""
+import argparse
+import json
+import platform
+import sqlite3
+import statistics
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from common import ROOT
+
+import catalogue
+
+import db
+
+SEARCHES = [
+    ("hugo", None, None),
+    ("zola", "Nils", None),
+    ("lefevre", None, "BD"),
+    ("bronte", "Carole", "Livre"),
+    ("", "Axel", "Manga"),
+    ("saint exupery", None, None),
+]
+LIST_PAGES = 20
+PAGE_SIZE = 50
+REGRESSION = 1.10   # --compare : plus de 10% plus lent = régression
+
+# ==============================
+# CONTEXTE
+# ==============================
+class Context:
+    """Catalogue, fichiers d'entrée et base pré-remplie partagés par les scénarios"""
+
+    def __init__(self, size, directory):
+        # Imports lourds hors mesures (sinon payés par le premier scénario)
+        import pandas  # noqa: F401
+        import pyarrow  # noqa: F401
+
+        self.directory = Path(directory)
+        self.books = catalogue.make_books(size)
+        self.paths = catalogue.write_inputs(self.books, self.directory)
+        self.pool = self.new_pool("catalogue")
+        with self.pool.writer() as conn:
+            catalogue.fill(conn, self.books)
+        self._pools = 0
+
+    def new_pool(self, name):
+        pool = db.ConnectionPool(self.directory / f"{name}.sqlite")
+        db.init_db(pool)
+        return pool
+
+    def empty_pool(self):
+        """Base neuve pour un scénario d'écriture"""
+        self._pools += 1
+        return self.new_pool(f"vide-{self._pools}")
+
+    def close(self):
+        self.pool.close()
+
+# ==============================
+# SCÉNARIOS
+# ==============================
+# Chaque scénario prépare ce qu'il lui faut puis retourne
+# (secondes mesurées, infos) ; seule la partie critique est chronométrée.
+
+def csv_import(ctx):
+    from csv_import import sync_csv
+
+    pool = ctx.empty_pool()
+    t0 = time.perf_counter()
+    report, _, error_count = sync_csv(pool, ctx.paths["csv"], "catalogue.csv")
+    elapsed = time.perf_counter() - t0
+    pool.close()
+    return elapsed, {"added": report["added"], "errors": error_count}
+
+def csv_reimport(ctx):
+    """Même fichier sans empreinte : diff complet, rien à écrire"""
+    from csv_import import sync_csv
+
+    pool = ctx.empty_pool()
+    sync_csv(pool, ctx.paths["csv"], "catalogue.csv")
+    t0 = time.perf_counter()
+    report, _, _ = sync_csv(pool, ctx.paths["csv"], "catalogue.csv")
+    elapsed = time.perf_counter() - t0
+    pool.close()
+    return elapsed, {"unchanged": report["unchanged"]}
+
+def excel_import(ctx):
+    from import_excel import import_workbook
+
+    pool = ctx.empty_pool()
+    t0 = time.perf_counter()
+    result = import_workbook(pool, ctx.paths["solde"])
+    elapsed = time.perf_counter() - t0
+    pool.close()
+    return elapsed, {"added": sum(r["added"] for r in result["blocks"].values())}
+
+def convert_livre(ctx):
+    import pandas as pd
+
+    import convert_livre_excel as conv
+
+    t0 = time.perf_counter()
+    books = conv.extract_blocks(pd.read_excel(ctx.paths["livre"], header=0))
+    return time.perf_counter() - t0, {"books": len(books)}
+
+def search(ctx):
+    from search import search_books
+
+    found = 0
+    t0 = time.perf_counter()
+    with ctx.pool.reader() as conn:
+        for text, owner, fmt in SEARCHES:
+            found += len(search_books(conn, text, owner=owner, fmt=fmt))
+    return time.perf_counter() - t0, {"queries": len(SEARCHES), "found": found}
+
+def list_paging(ctx):
+    from search import count_books, list_page
+
+    after, rows = None, 0
+    t0 = time.perf_counter()
+    with ctx.pool.reader() as conn:
+        total = count_books(conn)
+        for _ in range(LIST_PAGES):
+            page, after = list_page(conn, PAGE_SIZE, after=after)
+            rows += len(page)
+            if after is None:
+                break
+    return time.perf_counter() - t0, {"total": total, "rows": rows}
+
+def export(ctx, kind):
+    from export import write_export
+
+    path = ctx.directory / f"export.{kind}"
+    t0 = time.perf_counter()
+    with ctx.pool.reader() as conn:
+        write_export(conn, path, kind)
+    return time.perf_counter() - t0, {"bytes": path.stat().st_size}
+
+def book_stats(ctx):
+    import stats
+
+    t0 = time.perf_counter()
+    with ctx.pool.reader() as conn:
+        counters = stats.read_stats(conn)
+    stats.counts(counters, "owner")
+    stats.format_owner_matrix(counters)
+    stats.monthly_additions(counters)
+    return time.perf_counter() - t0, {"total": stats.total(counters)}
+
+def duplicates(ctx):
+    import dedupe
+
+    t0 = time.perf_counter()
+    with ctx.pool.reader() as conn:
+        found = dedupe.duplicate_books(conn)
+    return time.perf_counter() - t0, {"duplicates": len(found)}
+
+SCENARIOS = {
+    "csv_import": csv_import,
+    "csv_reimport": csv_reimport,
+    "excel_import": excel_import,
+    "convert_livre": convert_livre,
+    "search": search,
+    "list_paging": list_paging,
+    "export_csv": lambda ctx: export(ctx, "csv"),
+    "export_parquet": lambda ctx: export(ctx, "parquet"),
+    "stats": book_stats,
+    "duplicates": duplicates,
+}
+
+# ==============================
+# EXÉCUTION
+# ==============================
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(size, repeat, only=None):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        ctx = Context(size, tmp)
+        print(f"{size} livres générés en {time.perf_counter() - t0:.1f} s")
+        try:
+            for name, scenario in SCENARIOS.items():
+                if only and name not in only:
+                    continue
+                runs, info = [], {}
+                for _ in range(repeat):
+                    elapsed, info = scenario(ctx)
+                    runs.append(elapsed)
+                results[name] = {"best": min(runs), "median": statistics.median(runs), "runs": runs, **info}
+                print(f"{name:<16} médiane {results[name]['median'] * 1000:>9.1f} ms   min {min(runs) * 1000:>9.1f} ms")
+        finally:
+            ctx.close()
+    return {
+        "meta": {
+            "size": size,
+            "seed": catalogue.SEED,
+            "repeat": repeat,
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "machine": platform.machine(),
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "scenarios": results,
+    }
+
+def compare(before, after):
+    """Médianes avant / après, scénario par scénario"""
+    if before["meta"]["size"] != after["meta"]["size"]:
+        print(f"⚠️ tailles différentes : {before['meta']['size']} / {after['meta']['size']}")
+    print(f"{'scénario':<16} {'avant':>10} {'après':>10}   rapport")
+    for name, result in after["scenarios"].items():
+        old = before["scenarios"].get(name)
+        if old is None:
+            continue
+        ratio = result["median"] / old["median"]
+        flag = "  ⚠️ régression" if ratio > REGRESSION else ""
+        print(f"{name:<16} {old['median'] * 1000:>8.1f}ms {result['median'] * 1000:>8.1f}ms   x{ratio:.2f}{flag}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks des chemins critiques")
+    parser.add_argument("--size", default="medium", help=f"{', '.join(catalogue.SIZES)} ou un nombre de livres")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", help="scénarios séparés par des virgules")
+    parser.add_argument("--output", type=Path, help="fichier JSON des résultats")
+    parser.add_argument("--compare", type=Path, help="résultats JSON d'une exécution précédente")
+    args = parser.parse_args()
+
+    only = set(args.only.split(",")) if args.only else None
+    if only and only - set(SCENARIOS):
+        parser.error(f"scénarios inconnus : {', '.join(sorted(only - set(SCENARIOS)))}")
+
+    results = run(catalogue.size_of(args.size), args.repeat, only)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"📄 {args.output}")
+    if args.compare:
+        compare(json.loads(args.compare.read_text(encoding="utf-8")), results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+"""
+Opérations du catalogue sans Streamlit : `bliblio.core` (bibliothèque)
+et `python -m bliblio` (ligne de commande).
+"""
+import sys
+from pathlib import Path
+
+# Les modules du dépôt (db, search, jobs...) sont à la racine, à côté du paquet
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
@@ -0,0 +1,9 @@
+import sys
+from pathlib import Path
+
+# `python chemin/vers/bliblio` : seul le dossier du paquet est sur sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bliblio.cli import main  # noqa: E402
+
+main()
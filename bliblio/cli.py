@@ -0,0 +1,174 @@
+"""
+python -m bliblio <commande> ...
+
+Les modules lourds (pandas, requests, openpyxl) ne sont importés que par
+les commandes qui s'en servent.
+"""
+import argparse
+import sys
+
+# Formats libres : normalisés à l'écriture (casse, synonymes), voir dimensions.py
+FORMAT_HELP = "format (Livre, BD, Manga, Comics... ; casse et synonymes tolérés)"
+
+def progress(done, total):
+    if total:
+        print(f"\r⏳ {done}/{total}", end="", flush=True, file=sys.stderr)
+
+def done_progress():
+    print(file=sys.stderr)
+
+# ==============================
+# COMMANDES
+# ==============================
+def cmd_import_csv(args):
+    from bliblio import core
+
+    result = core.import_csv(
+        args.path, source=args.source, force_format=args.format, wipe_before=args.wipe, on_progress=progress
+    )
+    done_progress()
+    report = result["report"]
+    if report["file_unchanged"]:
+        print("♻️ Fichier identique au dernier import : rien à faire")
+        return
+    print(f"✅ +{report['added']} ~{report['changed']} -{report['removed']} (inchangés {report['unchanged']})")
+    skipped = result["error_count"] + report["duplicates"]
+    if skipped:
+        print(f"⚠️ {skipped} lignes ignorées")
+    if report.get("unreadable_isbn"):
+        print(f"🔢 {report['unreadable_isbn']} ISBN illisibles ignorés (livres importés sans ISBN)")
+    for err in result["errors"]:
+        print(f"  {err}")
+
+def cmd_import_excel(args):
+    from bliblio import core
+
+    result = core.import_excel(args.path, on_progress=progress)
+    done_progress()
+    if result["file_unchanged"]:
+        print("♻️ Classeur identique au dernier import : rien à faire")
+        return
+    for block, r in result["blocks"].items():
+        print(
+            f"✅ {block}: +{r['added']} ~{r['changed']} -{r['removed']} "
+            f"(inchangés {r['unchanged']}, doublons {r['duplicates']})"
+        )
+
+def cmd_search(args):
+    from bliblio import core
+
+    rows = core.search(" ".join(args.text), owner=args.owner, fmt=args.format)
+    for row in rows[:args.limit] if args.limit else rows:
+        print("\t".join("" if v is None else str(v) for v in row))
+    print(f"📚 {len(rows)} résultat(s)", file=sys.stderr)
+
+def cmd_export(args):
+    import shutil
+
+    from bliblio import core
+
+    path = core.export(args.kind, " ".join(args.text), owner=args.owner, fmt=args.format)
+    if args.output:
+        shutil.copyfile(path, args.output)
+        path = args.output
+    print(path)
+
+def cmd_stats(args):
+    from bliblio import core
+
+    stats = core.stats()
+    print(f"📚 Total : {stats.get('total', {}).get(('', ''), 0)}")
+    for kind, label in [("owner", "Propriétaire"), ("format", "Format"), ("language", "Langue")]:
+        counts = sorted(stats.get(kind, {}).items(), key=lambda item: -item[1])
+        print(f"{label} : " + ", ".join(f"{a or '—'} {n}" for (a, _), n in counts))
+
+def cmd_enrich(args):
+    from bliblio import core
+
+    result = core.enrich(limit=args.limit, workers=args.workers, on_progress=progress)
+    done_progress()
+    print(f"✅ {result['updated']} livres complétés sur {result['rows']}")
+    print(f"⚠️ {result['not_found']} sans résultat | {result['errors']} erreurs réseau")
+
+def cmd_dedupe(args):
+    from bliblio import core
+
+    groups = core.duplicates(args.threshold)
+    for group in groups:
+        print("—")
+        for book_id, owner, author, title in group:
+            print(f"  #{book_id} {owner} | {author} | {title}")
+    print(f"🔁 {len(groups)} groupes, {sum(map(len, groups)) - len(groups)} doublons")
+    if args.apply and groups:
+        removed = core.merge_duplicates([[book_id for book_id, *_ in group] for group in groups])
+        print(f"✅ {removed} livres fusionnés")
+
+def cmd_clear(args):
+    from bliblio import core
+
+    if not args.yes:
+        print("⚠️ Tous les livres seront supprimés : relancer avec --yes pour confirmer", file=sys.stderr)
+        sys.exit(1)
+    print(f"✅ {core.clear()} livres supprimés")
+
+# ==============================
+# MAIN
+# ==============================
+def add_filters(parser):
+    parser.add_argument("text", nargs="*", help="titre, auteur ou éditeur")
+    parser.add_argument("--owner", help="propriétaire")
+    parser.add_argument("--format", help=FORMAT_HELP)
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="bliblio", description="Catalogue de livres en ligne de commande")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("import-csv", help="import incrémental d'un CSV (Proprio, Auteur, Titre...)")
+    p.add_argument("path")
+    p.add_argument("--source", help="identifiant de la source (défaut : nom du fichier)")
+    p.add_argument("--format", help=f"forcer le format de tous les livres : {FORMAT_HELP}")
+    p.add_argument("--wipe", action="store_true", help="vider la base avant l'import")
+    p.set_defaults(func=cmd_import_csv)
+
+    p = commands.add_parser("import-excel", help="import du classeur Livres / BD")
+    p.add_argument("path", nargs="?", help="défaut : « Solde compte.xlsx »")
+    p.set_defaults(func=cmd_import_excel)
+
+    p = commands.add_parser("search", help="recherche plein texte (une ligne par livre, séparateur tabulation)")
+    add_filters(p)
+    p.add_argument("--limit", type=int)
+    p.set_defaults(func=cmd_search)
+
+    p = commands.add_parser("export", help="exporte la recherche (ou tout le catalogue) et affiche le chemin")
+    add_filters(p)
+    p.add_argument("--kind", default="csv", choices=["csv", "csv.gz", "parquet"])
+    p.add_argument("-o", "--output", help="copier le fichier exporté ici")
+    p.set_defaults(func=cmd_export)
+
+    p = commands.add_parser("stats", help="compteurs du catalogue")
+    p.set_defaults(func=cmd_stats)
+
+    p = commands.add_parser("enrich", help="complète éditeur / langue / ISBN des livres incomplets")
+    p.add_argument("--limit", type=int, help="nombre maximum de livres à traiter")
+    p.add_argument("--workers", type=int)
+    p.set_defaults(func=cmd_enrich)
+
+    p = commands.add_parser("dedupe", help="liste les livres en double (accents, casse, ponctuation, articles)")
+    p.add_argument("--threshold", type=float, help="score minimal, 0-1 (défaut 0.9)")
+    p.add_argument("--apply", action="store_true", help="fusionner les doublons trouvés")
+    p.set_defaults(func=cmd_dedupe)
+
+    p = commands.add_parser("clear", help="supprime tous les livres")
+    p.add_argument("--yes", action="store_true", help="confirmer")
+    p.set_defaults(func=cmd_clear)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        args.func(args)
+    except Exception as e:
+        # JobFailed, fichier introuvable... : message lisible plutôt qu'une trace
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,117 @@
+"""
+Opérations du catalogue, utilisables sans Streamlit.
+
+Chaque fonction n'importe que les modules dont elle a besoin : `stats()`
+ne charge ni pandas ni requests.
+"""
+from pathlib import Path
+
+import db
+
+_ready = False
+
+def get_pool():
+    """Pool du process, schéma à jour (vérifié une seule fois)"""
+    global _ready
+    pool = db.get_pool()
+    if not _ready:
+        db.init_db(pool)
+        _ready = True
+    return pool
+
+class JobFailed(Exception):
+    def __init__(self, job):
+        super().__init__(f"{job['kind']} {job['status']} : {job['error'] or ''}".strip())
+        self.job = job
+
+def run_job(kind, params, on_progress=None):
+    """Crée un job (visible dans l'app) et l'exécute dans ce process ; retourne son résultat"""
+    import jobs
+
+    job = jobs.run(get_pool(), kind, params, on_progress=on_progress)
+    if job["status"] != "done":
+        raise JobFailed(job)
+    return job["result"]
+
+# ==============================
+# IMPORTS
+# ==============================
+def import_csv(path, source=None, force_format=None, wipe_before=False, on_progress=None):
+    """Import incrémental d'un CSV ; `source` = nom du fichier par défaut"""
+    from csv_import import FORMAT_FROM_CSV
+    from import_manifest import file_hash
+
+    path = Path(path)
+    return run_job("csv_import", {
+        "path": str(path.resolve()),
+        "source": source or path.name,
+        "digest": file_hash(path),
+        "force_format": force_format or FORMAT_FROM_CSV,
+        "wipe_before": wipe_before,
+    }, on_progress)
+
+def import_excel(path=None, on_progress=None):
+    """Import du classeur (par défaut import_excel.EXCEL_FILE)"""
+    if path is None:
+        from import_excel import EXCEL_FILE as path
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Fichier introuvable : {path}")
+    return run_job("excel_import", {"path": str(path.resolve())}, on_progress)
+
+def enrich(limit=None, workers=None, on_progress=None):
+    params = {"limit": limit}
+    if workers:
+        params["workers"] = workers
+    return run_job("enrich", params, on_progress)
+
+# ==============================
+# LECTURE
+# ==============================
+def search(text="", owner=None, fmt=None):
+    """[(owner, format, author, title, language, publisher)]"""
+    from search import search_books
+
+    with get_pool().reader() as conn:
+        return search_books(conn, text, owner=owner, fmt=fmt)
+
+def export(kind="csv", text="", owner=None, fmt=None):
+    """Chemin du fichier exporté (cache disque, voir export.py)"""
+    from export import export_file
+
+    return export_file(get_pool(), kind, text, owner, fmt)
+
+def stats():
+    """{kind: {(a, b): n}} depuis la table book_stats"""
+    from stats import read_stats
+
+    with get_pool().reader() as conn:
+        return read_stats(conn)
+
+def duplicates(threshold=None):
+    """Livres en double malgré accents, casse... : [[(id, owner, author, title)]], plus ancien d'abord"""
+    import dedupe
+
+    with get_pool().reader() as conn:
+        found = dedupe.duplicate_books(conn, threshold or dedupe.THRESHOLD)
+    columns = ["id", "owner", "author", "title"]
+    return [list(group[columns].itertuples(index=False, name=None)) for _, group in found.groupby("group")]
+
+# ==============================
+# ÉCRITURE
+# ==============================
+def clear():
+    """Vide la table books (et le manifeste d'import) ; retourne le nombre de livres supprimés"""
+    from import_manifest import forget_all
+
+    with get_pool().writer() as conn:
+        removed = conn.execute("DELETE FROM books").rowcount
+        forget_all(conn)
+    return removed
+
+def merge_duplicates(groups):
+    """Fusionne chaque groupe d'id sur son plus ancien livre ; retourne le nombre de livres supprimés"""
+    from dedupe import merge_groups
+
+    with get_pool().writer() as conn:
+        return merge_groups(conn, groups)
@@ -1,5 +1,5 @@
+import argparse
 import pandas as pd
-import math
 from pathlib import Path
 
 # =========================
@@ -25,38 +25,36 @@ BLOCKS = {
     }
 }
 
-# =========================
-# UTILS
-# =========================
+# Colonnes de sortie, dans l'ordre
+TEXT_COLUMNS = ["Auteur", "Titre", "Langue", "Edition"]
+BOOL_COLUMNS = ["Lu", "Garde"]
+ALL_COLUMNS = ["Auteur", "Titre", "Langue", "Lu", "Garde", "Edition"]
 
-def to_bool(val):
-    if val is True:
-        return True
-    if val is False:
-        return False
-    if val is None or (isinstance(val, float) and math.isnan(val)):
-        return False
-    return str(val).strip().lower() in ("true", "1", "yes", "x")
+TRUE_VALUES = ["true", "1", "yes", "x"]
 
-def clean(val):
-    if val is None or (isinstance(val, float) and math.isnan(val)):
-        return ""
-    return str(val).strip()
+# format -> extension par défaut
+OUTPUT_FORMATS = {"xlsx": ".xlsx", "csv": ".csv", "parquet": ".parquet"}
 
 # =========================
-# MAIN
+# UTILS (vectorisés)
 # =========================
 
-def main():
-    print("📘 Conversion du fichier Excel en format propre")
-    print(f"📂 Source : {INPUT_FILE}")
-    print(f"📄 Sortie : {OUTPUT_FILE}")
-    print("-" * 50)
-
-    df = pd.read_excel(INPUT_FILE, header=0)
-
-    rows = []
-
+def clean(col):
+    """NaN/None -> "", sinon str(val).strip() ; sur une colonne entière"""
+    col = col.astype(object)
+    missing = col.isna()
+    return col.where(missing, col.astype(str)).where(~missing, "").str.strip()
+
+def to_bool(col):
+    """True/"x"/"1"/"yes"/"true" -> True, tout le reste (NaN compris) -> False"""
+    return clean(col).str.lower().isin(TRUE_VALUES)
+
+def extract_blocks(df):
+    """
+    Empile les blocs CAROLE / NILS / AXEL (colonnes côte à côte dans la feuille)
+    en une seule table avec une colonne owner, sans boucle sur les lignes.
+    """
+    blocks = {}
     for owner, cfg in BLOCKS.items():
         start = cfg["start"]
         cols = cfg["columns"]
@@ -68,33 +66,62 @@ def main():
 
         sub = df.iloc[:, start:end].copy()
         sub.columns = cols
+        blocks[owner] = sub.reindex(columns=ALL_COLUMNS)
+
+    if not blocks:
+        return pd.DataFrame()
+
+    stacked = pd.concat(blocks, names=["owner", None]).reset_index(level="owner")
+
+    titre = clean(stacked["Titre"])
+    keep = (titre != "").to_numpy()
+    stacked = stacked[keep]
+
+    return pd.DataFrame({
+        "owner": stacked["owner"].to_numpy(),
+        "type": "Livre",
+        "auteur": clean(stacked["Auteur"]).to_numpy(),
+        "titre": titre[keep].to_numpy(),
+        "langue": clean(stacked["Langue"]).to_numpy(),
+        "lu": to_bool(stacked["Lu"]).to_numpy(),
+        "garde": to_bool(stacked["Garde"]).to_numpy(),
+        "edition": clean(stacked["Edition"]).to_numpy(),
+    })
+
+def write_output(clean_df, path, fmt):
+    if fmt == "csv":
+        clean_df.to_csv(path, index=False)
+    elif fmt == "parquet":
+        clean_df.to_parquet(path, index=False)
+    else:
+        clean_df.to_excel(path, index=False, sheet_name="bibliotheque")
+
+# =========================
+# MAIN
+# =========================
+
+def main():
+    parser = argparse.ArgumentParser(description="Convertit livre.xlsx (blocs par propriétaire) en table propre")
+    parser.add_argument("--format", choices=list(OUTPUT_FORMATS), default="xlsx",
+                        help="xlsx (défaut) ; csv ou parquet sont bien plus rapides à écrire")
+    parser.add_argument("--output", type=Path, help=f"défaut : {OUTPUT_FILE.stem} + extension du format")
+    args = parser.parse_args()
+
+    output = args.output or OUTPUT_FILE.with_suffix(OUTPUT_FORMATS[args.format])
+
+    print("📘 Conversion du fichier Excel en format propre")
+    print(f"📂 Source : {INPUT_FILE}")
+    print(f"📄 Sortie : {output}")
+    print("-" * 50)
+
+    df = pd.read_excel(INPUT_FILE, header=0)
+
+    clean_df = extract_blocks(df)
 
-        for _, r in sub.iterrows():
-            titre = clean(r.get("Titre"))
-            if not titre:
-                continue
-
-            rows.append({
-                "owner": owner,
-                "type": "Livre",
-                "auteur": clean(r.get("Auteur")),
-                "titre": titre,
-                "langue": clean(r.get("Langue")),
-                "lu": to_bool(r.get("Lu")),
-                "garde": to_bool(r.get("Garde")),
-                "edition": clean(r.get("Edition"))
-            })
-
-    clean_df = pd.DataFrame(rows)
-
-    clean_df.to_excel(
-        OUTPUT_FILE,
-        index=False,
-        sheet_name="bibliotheque"
-    )
+    write_output(clean_df, output, args.format)
 
     print(f"✅ Terminé : {len(clean_df)} livres exportés")
     print("🎉 Tu peux maintenant importer ce fichier sans AUCUNE bidouille")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,259 @@
+import codecs
+import csv
+import tempfile
+import uuid
+from pathlib import Path
+
+import pandas as pd
+
+from isbns import canonical_isbns
+from import_manifest import apply_staged, create_staging, empty_report, is_known_file, record_file, stage_chunk
+
+# ==============================
+# CONFIG
+# ==============================
+FORMAT_FROM_CSV = "Utiliser le CSV"
+REQUIRED_COLUMNS = ["Proprio", "Auteur", "Titre"]
+
+CHUNK_ROWS = 20_000      # lignes lues, validées et mises en attente à la fois
+SNIFF_BYTES = 64 * 1024  # échantillon pour deviner encodage et séparateur
+PREVIEW_ROWS = 20
+DELIMITERS = ",;\t|"
+ERRORS_KEPT = 50         # messages d'erreur conservés (le total est compté à part)
+STAGING_FILE = "staging.sqlite"   # base annexe des tables de travail, dans un dossier temporaire
+
+BOOK_COLUMNS = ["owner", "format", "author", "title", "language", "isbn", "publisher"]
+
+# Ordre des contrôles = ordre des messages d'erreur affichés dans l'onglet
+VALIDATIONS = [
+    ("owner", "Propriétaire vide"),
+    ("author", "Auteur vide"),
+    ("title", "Titre vide"),
+]
+
+# ==============================
+# LECTURE (échantillon, aperçu, blocs)
+# ==============================
+# `source` : chemin ou fichier binaire ouvert (ex. st.file_uploader),
+# jamais lu en entier en mémoire.
+
+def read_sample(source, size=SNIFF_BYTES):
+    if isinstance(source, (str, Path)):
+        with open(source, "rb") as f:
+            return f.read(size)
+    source.seek(0)
+    sample = source.read(size)
+    source.seek(0)
+    return sample
+
+def sniff_encoding(sample):
+    """BOM, sinon UTF-8 s'il décode (échantillon coupé n'importe où), sinon cp1252 / latin-1"""
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    try:
+        sample.decode("cp1252")
+        return "cp1252"
+    except UnicodeDecodeError:
+        return "latin-1"   # décode tout octet
+
+def sniff_delimiter(text):
+    """Séparateur parmi DELIMITERS d'après les premières lignes complètes ; virgule par défaut"""
+    lines = text.splitlines()
+    if len(lines) > 1 and not text.endswith(("\n", "\r")):
+        lines = lines[:-1]   # dernière ligne coupée par l'échantillon
+    try:
+        return csv.Sniffer().sniff("\n".join(lines), delimiters=DELIMITERS).delimiter
+    except csv.Error:
+        return ","
+
+def sniff_csv(source):
+    """(encodage, séparateur) devinés sur les SNIFF_BYTES premiers octets"""
+    sample = read_sample(source)
+    encoding = sniff_encoding(sample)
+    text = codecs.getincrementaldecoder(encoding)(errors="replace").decode(sample)
+    return encoding, sniff_delimiter(text)
+
+def read_preview(source, rows=PREVIEW_ROWS):
+    """(DataFrame des `rows` premières lignes, encodage, séparateur)"""
+    encoding, delimiter = sniff_csv(source)
+    df = pd.read_csv(source, sep=delimiter, encoding=encoding, dtype=str, nrows=rows)
+    if not isinstance(source, (str, Path)):
+        source.seek(0)
+    return df, encoding, delimiter
+
+def count_rows(source):
+    """Nombre de lignes de données, estimé sans décoder (retours à la ligne entre guillemets comptés)"""
+    def count(f):
+        newlines, last = 0, b"\n"
+        for block in iter(lambda: f.read(1 << 20), b""):
+            newlines += block.count(b"\n")
+            last = block[-1:]
+        return newlines + (last != b"\n") - 1   # dernière ligne sans \n, en-tête
+
+    if isinstance(source, (str, Path)):
+        with open(source, "rb") as f:
+            return max(count(f), 0)
+    source.seek(0)
+    rows = count(source)
+    source.seek(0)
+    return max(rows, 0)
+
+def read_chunks(source, encoding, delimiter, chunk_rows=CHUNK_ROWS):
+    """
+    Lecteur pandas par blocs de `chunk_rows` lignes (à utiliser avec `with`).
+    Tout en texte : empreintes et ISBN identiques d'un bloc à l'autre.
+    """
+    return pd.read_csv(source, sep=delimiter, encoding=encoding, dtype=str, chunksize=chunk_rows)
+
+# ==============================
+# NORMALISATION (colonne par colonne)
+# ==============================
+def text_column(df, name, default=""):
+    """Équivalent vectorisé de str(row.get(name, default)).strip()"""
+    if name not in df.columns:
+        return pd.Series(default, index=df.index, dtype=object)
+    return df[name].fillna("nan").astype(str).str.strip()
+
+def normalize(df, force_format=FORMAT_FROM_CSV):
+    """
+    Construit le DataFrame `books` + les messages d'erreur, sans itérer sur les lignes.
+    ISBN ramenés à leur forme canonique (isbns.py) ; un ISBN illisible est vidé,
+    la ligne importée quand même. Retourne (books, errors, ISBN illisibles).
+    """
+    out = pd.DataFrame(index=df.index)
+    out["owner"] = text_column(df, "Proprio")
+    out["author"] = text_column(df, "Auteur")
+    out["title"] = text_column(df, "Titre")
+
+    if force_format == FORMAT_FROM_CSV:
+        out["format"] = text_column(df, "Format", "Livre").replace("nan", "Livre")
+    else:
+        out["format"] = force_format
+
+    out["language"] = text_column(df, "Langue").replace("nan", "")
+    out["publisher"] = text_column(df, "Editeur").astype(object).where(lambda c: c != "nan", None)
+    isbn = text_column(df, "ISBN")
+    out["isbn"] = canonical_isbns(isbn)
+    unreadable = out["isbn"].isna() & (isbn != "") & (isbn != "nan")
+
+    # Premier contrôle en échec pour chaque ligne (même priorité que l'ancien import)
+    reason = pd.Series(None, index=df.index, dtype=object)
+    for col, message in reversed(VALIDATIONS):
+        empty = (out[col] == "") | (out[col] == "nan")
+        reason = reason.mask(empty, message)
+
+    invalid = reason.notna()
+    errors = [
+        f"Ligne {idx + 2}: {message}"
+        for idx, message in zip(df.index[invalid.to_numpy()], reason[invalid])
+    ]
+    return out.loc[~invalid, BOOK_COLUMNS], errors, int((unreadable & ~invalid).sum())
+
+# ==============================
+# IMPORT
+# ==============================
+def sync_csv(pool, path, source, digest=None, force_format=FORMAT_FROM_CSV, wipe_before=False, on_progress=None, total=None):
+    """
+    Import incrémental d'un fichier CSV identifié par `source` (son nom).
+
+    Si `digest` (sha256 du fichier) est déjà connu pour cette source, rien n'est relu.
+    Sinon seules les lignes ajoutées, modifiées ou retirées depuis le dernier
+    import de cette source touchent `books` (voir import_manifest.sync_chunks).
+
+    Le fichier est lu et validé par blocs de CHUNK_ROWS lignes, mis en attente
+    dans une base annexe sur disque (STAGING_FILE, attachée au writer) : la
+    mémoire ne dépend pas de la taille du fichier, et le verrou d'écriture du
+    pool n'est pris que le temps de mettre un bloc en attente, puis pour
+    appliquer les changements. Ceux de `books` (et le vidage si wipe_before)
+    le sont en une transaction finale : un import interrompu ne laisse pas un
+    catalogue à moitié synchronisé.
+
+    Encodage et séparateur sont devinés sur un échantillon (sniff_csv).
+    `on_progress(lignes lues, total)`, appelé hors du verrou d'écriture.
+    Retourne (report, errors[:ERRORS_KEPT], error_count).
+    """
+    if digest:
+        # Même fichier mais autre format forcé : les lignes changent
+        digest = f"{digest}:{force_format}"
+    if not wipe_before and digest:
+        with pool.reader() as conn:
+            if is_known_file(conn, source, digest):
+                report = empty_report()
+                report["file_unchanged"] = True
+                return report, [], 0
+
+    encoding, delimiter = sniff_csv(path)
+    errors = []
+    counts = {"rows": 0, "errors": 0, "unreadable_isbn": 0}
+    schema = f"staging_{uuid.uuid4().hex[:12]}"
+
+    with tempfile.TemporaryDirectory(prefix="bliblio-import-") as work_dir:
+        with pool.writer(versioned=False) as conn:
+            conn.execute(f"ATTACH DATABASE ? AS {schema}", (str(Path(work_dir) / STAGING_FILE),))
+            # Base jetable : ni journal ni fsync ; tris et index temporaires sur disque aussi
+            conn.execute(f"PRAGMA {schema}.journal_mode = OFF")
+            conn.execute(f"PRAGMA {schema}.synchronous = OFF")
+            temp_store = conn.execute("PRAGMA temp_store").fetchone()[0]
+            conn.execute("PRAGMA temp_store = FILE")
+        try:
+            with pool.writer(versioned=False) as conn:
+                create_staging(conn, BOOK_COLUMNS, schema)
+            with read_chunks(path, encoding, delimiter, CHUNK_ROWS) as reader:
+                for chunk in reader:
+                    valid, chunk_errors, unreadable = normalize(chunk, force_format)
+                    errors.extend(chunk_errors[:ERRORS_KEPT - len(errors)])
+                    counts["rows"] += len(chunk)
+                    counts["errors"] += len(chunk_errors)
+                    counts["unreadable_isbn"] += unreadable
+                    with pool.writer(versioned=False) as conn:
+                        stage_chunk(conn, valid, schema)
+                    if on_progress:
+                        on_progress(counts["rows"], total)
+
+            with pool.writer() as conn:
+                report = apply_staged(conn, source, BOOK_COLUMNS, schema, wipe=wipe_before)
+                report["unreadable_isbn"] = counts["unreadable_isbn"]
+                if digest:
+                    record_file(conn, source, digest, counts["rows"])
+        finally:
+            with pool.writer(versioned=False) as conn:
+                conn.execute(f"DETACH DATABASE {schema}")
+                conn.execute(f"PRAGMA temp_store = {int(temp_store)}")
+
+    return report, errors, counts["errors"]
+
+# ==============================
+# JOB (voir jobs.py)
+# ==============================
+def run_job(job):
+    """
+    params : path, source, digest, force_format, wipe_before, uploaded.
+    Un fichier déposé depuis l'app (uploaded) est supprimé une fois l'import terminé.
+    """
+    params = job.params
+    job.progress(0, message="Lecture du fichier")
+    total = count_rows(params["path"])
+    job.progress(0, total, "Import")
+
+    report, errors, error_count = sync_csv(
+        job.pool,
+        params["path"],
+        source=params["source"],
+        digest=params.get("digest"),
+        force_format=params.get("force_format", FORMAT_FROM_CSV),
+        wipe_before=params.get("wipe_before", False),
+        on_progress=job.progress,
+        total=total,
+    )
+    job.progress(total, total, "Terminé")
+
+    if params.get("uploaded"):
+        Path(params["path"]).unlink(missing_ok=True)
+    return {"report": report, "errors": errors, "error_count": error_count}
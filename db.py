@@ -1,18 +1,236 @@
+import importlib.util
+import os
+import queue
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
 
-DB_PATH = Path("data") / "books.sqlite"
-SCHEMA_PATH = Path("schema.sql")
-
-def connect():
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(DB_PATH.as_posix(), check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
-
-def init_db():
-    conn = connect()
-    with open(SCHEMA_PATH, "r", encoding="utf-8") as f:
-        conn.executescript(f.read())
-    conn.commit()
-    conn.close()
+import profiler
+
+# ==============================
+# CONFIG
+# ==============================
+BASE_DIR = Path(__file__).parent
+DB_PATH = Path(os.environ.get("BLIBLIO_DB", BASE_DIR / "data" / "books.sqlite"))
+
+READERS = 4
+
+# Appliqués une fois, à l'ouverture de chaque connexion
+PRAGMAS = [
+    "PRAGMA journal_mode = WAL",          # lectures non bloquées pendant un import
+    "PRAGMA synchronous = NORMAL",        # sûr en WAL, bien moins de fsync
+    "PRAGMA mmap_size = 268435456",       # 256 Mo
+    "PRAGMA cache_size = -20000",         # ~20 Mo
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA foreign_keys = ON",
+]
+
+# Migrations : migrations/NNNN_nom.sql (une instruction par fin de ligne)
+# ou migrations/NNNN_nom.py (fonction migrate(conn)), appliquées dans l'ordre.
+# PRAGMA user_version = numéro de la dernière migration appliquée.
+MIGRATIONS_DIR = BASE_DIR / "migrations"
+
+# Clé de dédoublonnage, identique à la colonne générée books.book_key
+# (migrations/0007) ; utilisée par les tables de travail des imports.
+BOOK_KEY = "owner_id || char(31) || lower(trim(author)) || char(31) || lower(trim(title))"
+
+# ==============================
+# POOL
+# ==============================
+class ConnectionPool:
+    """
+    Connexions SQLite partagées par tout le process.
+
+    - `reader()` : une connexion parmi READERS, lectures concurrentes (WAL)
+    - `writer()` : une connexion unique protégée par un verrou, commit/rollback auto,
+      et incrément de `data_version` si la transaction a modifié des lignes
+      (`versioned=False` pour les tables annexes, ex. caches)
+
+    Les connexions sont ouvertes à la demande puis réutilisées.
+    """
+
+    def __init__(self, path=DB_PATH, readers=READERS):
+        self.path = Path(path)
+        self.size = readers
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._writer = None
+        self._write_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._stats = {
+            "opened": 0,
+            "reads": 0,
+            "writes": 0,
+            "wait_total": 0.0,
+            "wait_max": 0.0,
+        }
+
+    def _open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False, factory=profiler.connection_factory())
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        with self._lock:
+            self._stats["opened"] += 1
+        return conn
+
+    def _waited(self, kind, started):
+        waited = time.perf_counter() - started
+        with self._lock:
+            self._stats[kind] += 1
+            self._stats["wait_total"] += waited
+            self._stats["wait_max"] = max(self._stats["wait_max"], waited)
+
+    @contextmanager
+    def reader(self):
+        started = time.perf_counter()
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_open = self._created < self.size
+                if can_open:
+                    self._created += 1
+            conn = self._open() if can_open else self._idle.get()
+        self._waited("reads", started)
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put(conn)
+
+    @contextmanager
+    def writer(self, versioned=True):
+        started = time.perf_counter()
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = self._open()
+            self._waited("writes", started)
+            conn = self._writer
+            changes = conn.total_changes
+            try:
+                yield conn
+                if versioned and conn.total_changes != changes:
+                    conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'data_version'")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    def metrics(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["idle"] = self._idle.qsize()
+        return stats
+
+    def close(self):
+        """Ferme toutes les connexions ; elles seront rouvertes au prochain usage"""
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            with self._lock:
+                while True:
+                    try:
+                        self._idle.get_nowait().close()
+                    except queue.Empty:
+                        break
+                self._created = 0
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    """Pool unique du process (app Streamlit et scripts)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool()
+        return _pool
+
+def data_version(conn):
+    """Jeton de version des données : change dès qu'une écriture a été commitée"""
+    return conn.execute("SELECT value FROM meta WHERE key = 'data_version'").fetchone()[0]
+
+# ==============================
+# SCHÉMA (migrations)
+# ==============================
+def migrations():
+    """[(version, chemin)] triées, d'après le préfixe numérique des fichiers"""
+    found = []
+    for path in MIGRATIONS_DIR.iterdir():
+        prefix = path.name.split("_", 1)[0]
+        if prefix.isdigit() and path.suffix in (".sql", ".py"):
+            found.append((int(prefix), path))
+    return sorted(found)
+
+def latest_version():
+    return max((version for version, _ in migrations()), default=0)
+
+def schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def sql_statements(script):
+    """Découpe un fichier .sql en instructions (les triggers BEGIN ... END restent entiers)"""
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            yield statement
+            statement = ""
+    if statement.strip():
+        yield statement
+
+def apply_migration(conn, path):
+    if path.suffix == ".sql":
+        for statement in sql_statements(path.read_text(encoding="utf-8")):
+            conn.execute(statement)
+    else:
+        spec = importlib.util.spec_from_file_location(f"migration_{path.stem}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        module.migrate(conn)
+
+def migrate(conn, target=None):
+    """
+    Applique les migrations plus récentes que PRAGMA user_version (jusqu'à
+    `target` inclus si donné, pour les tests), chacune dans sa propre transaction
+    (BEGIN IMMEDIATE : deux process qui démarrent ensemble ne migrent pas deux fois).
+    Retourne la version finale.
+    """
+    for version, path in migrations():
+        if target is not None and version > target:
+            break
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if schema_version(conn) >= version:
+                conn.rollback()
+                continue
+            apply_migration(conn, path)
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return schema_version(conn)
+
+def init_db(pool=None):
+    """Met le schéma à jour ; simple lecture de user_version s'il est déjà courant"""
+    pool = pool or get_pool()
+    with pool.reader() as conn:
+        if schema_version(conn) >= latest_version():
+            return
+    with pool.writer() as conn:
+        migrate(conn)
+
+def reset_db(pool=None):
+    """Supprime le fichier de base (et ses fichiers WAL) puis recrée le schéma"""
+    pool = pool or get_pool()
+    pool.close()
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{pool.path}{suffix}").unlink(missing_ok=True)
+    init_db(pool)
@@ -0,0 +1,175 @@
+import re
+import unicodedata
+import zlib
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+
+# ==============================
+# CONFIG
+# ==============================
+THRESHOLD = 0.9             # score minimal pour considérer deux livres identiques
+TITLE_WEIGHT = 0.7          # score = 0.7 titre + 0.3 auteur
+AUTHOR_PREFIX = 4           # clé de bloc : 4 premières lettres de l'auteur normalisé
+MAX_BLOCK = 50              # au-delà : comparaison aux WINDOW voisins seulement
+WINDOW = 10
+
+ARTICLES = {
+    "le", "la", "les", "l", "un", "une", "des", "du", "d",
+    "the", "a", "an",
+    "el", "los", "las", "der", "die", "das",
+}
+
+# ==============================
+# NORMALISATION
+# ==============================
+def normalize(text):
+    """'L'Étranger !' -> 'etranger' : sans accents, casse, ponctuation ni articles"""
+    text = unicodedata.normalize("NFKD", str(text or "")).casefold()
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(w for w in re.findall(r"[^\W_]+", text) if w not in ARTICLES)
+
+def normalize_author(text):
+    """Mots triés : 'Camus, Albert' et 'Albert Camus' -> 'albert camus'"""
+    return " ".join(sorted(normalize(text).split()))
+
+def trigram_signature(text):
+    """Trigramme de hash minimal (minhash à une permutation) : titres proches -> souvent le même"""
+    text = text.replace(" ", "")
+    if len(text) < 3:
+        return text
+    return min((text[i:i + 3] for i in range(len(text) - 2)), key=lambda t: zlib.crc32(t.encode()))
+
+def similarity(a, b, cutoff=0.0):
+    """Ratio difflib ; 0 dès qu'une borne supérieure bon marché est sous `cutoff`"""
+    if a == b:
+        return 1.0
+    if not a or not b or 2 * min(len(a), len(b)) / (len(a) + len(b)) < cutoff:
+        return 0.0
+    matcher = SequenceMatcher(None, a, b, autojunk=False)
+    if matcher.quick_ratio() < cutoff:
+        return 0.0
+    return matcher.ratio()
+
+# ==============================
+# DÉTECTION
+# ==============================
+def block_pairs(members, titles):
+    """Paires à comparer dans un bloc ; gros bloc -> voisinage trié par titre"""
+    if len(members) <= MAX_BLOCK:
+        for i, a in enumerate(members):
+            for b in members[i + 1:]:
+                yield a, b
+    else:
+        ordered = sorted(members, key=lambda m: titles[m])
+        for i, a in enumerate(ordered):
+            for b in ordered[i + 1:i + 1 + WINDOW]:
+                yield a, b
+
+def find_duplicates(books, threshold=THRESHOLD):
+    """
+    `books` : DataFrame (id, owner, author, title).
+    Retourne les groupes de doublons, chacun = liste d'id triés (le premier est conservé).
+
+    Les livres ne sont comparés qu'au sein d'un même bloc (même propriétaire et
+    même début d'auteur, ou même signature de titre) : coût quasi linéaire.
+    """
+    ids = books["id"].tolist()
+    owners = books["owner"].map(normalize).tolist()
+    # Une normalisation par valeur distincte
+    authors = books["author"].map({a: normalize_author(a) for a in books["author"].unique()}).tolist()
+    titles = books["title"].map({t: normalize(t) for t in books["title"].unique()}).tolist()
+
+    blocks = defaultdict(list)
+    for i, (owner, author, title) in enumerate(zip(owners, authors, titles)):
+        blocks[("author", owner, author[:AUTHOR_PREFIX])].append(i)
+        blocks[("title", owner, trigram_signature(title))].append(i)
+
+    parent = list(range(len(ids)))
+
+    def root(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    # Score de titre minimal pour pouvoir atteindre le seuil avec un auteur identique
+    title_cutoff = (threshold - (1 - TITLE_WEIGHT)) / TITLE_WEIGHT
+    author_cutoff = (threshold - TITLE_WEIGHT) / (1 - TITLE_WEIGHT)
+
+    seen = set()
+    for members in blocks.values():
+        if len(members) < 2:
+            continue
+        for a, b in block_pairs(members, titles):
+            if (a, b) in seen or root(a) == root(b):
+                continue
+            seen.add((a, b))
+            title = similarity(titles[a], titles[b], title_cutoff)
+            if title < title_cutoff:
+                continue
+            score = TITLE_WEIGHT * title + (1 - TITLE_WEIGHT) * similarity(authors[a], authors[b], author_cutoff)
+            if score >= threshold:
+                parent[root(b)] = root(a)
+
+    groups = defaultdict(list)
+    for i in range(len(ids)):
+        groups[root(i)].append(ids[i])
+    return sorted((sorted(g) for g in groups.values() if len(g) > 1), key=lambda g: g[0])
+
+def load_books(conn):
+    import pandas as pd
+
+    return pd.read_sql_query("SELECT id, owner, author, title FROM books_named", conn)
+
+def duplicate_books(conn, threshold=THRESHOLD):
+    """Livres en double, une ligne par livre : (groupe, id, owner, author, title)"""
+    import pandas as pd
+
+    books = load_books(conn)
+    groups = find_duplicates(books, threshold)
+    members = pd.DataFrame(
+        [(n, book_id) for n, group in enumerate(groups, 1) for book_id in group],
+        columns=["group", "id"],
+    )
+    return members.merge(books, on="id", how="left")
+
+# ==============================
+# FUSION
+# ==============================
+def merge_groups(conn, groups):
+    """
+    Garde le plus ancien livre de chaque groupe, complété par les champs
+    (ISBN, éditeur, langue) des autres, puis supprime les autres.
+    Retourne le nombre de livres supprimés.
+    """
+    pairs = [(g[0], other) for g in groups for other in g[1:]]
+    if not pairs:
+        return 0
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS merge_pairs (keep INTEGER, drop_id INTEGER PRIMARY KEY)")
+    conn.execute("DELETE FROM merge_pairs")
+    conn.executemany("INSERT INTO merge_pairs (keep, drop_id) VALUES (?, ?)", pairs)
+
+    # Livres retirés mis de côté puis supprimés d'abord : leur ISBN peut alors
+    # passer au livre gardé sans heurter l'index unique (isbn, owner_id)
+    conn.execute("DROP TABLE IF EXISTS temp.merge_dropped")
+    conn.execute("CREATE TEMP TABLE merge_dropped AS SELECT * FROM books WHERE id IN (SELECT drop_id FROM merge_pairs)")
+    # Une ligne du manifeste qui pointait sur un doublon devient un doublon
+    conn.execute("UPDATE import_rows SET book_id = NULL WHERE book_id IN (SELECT drop_id FROM merge_pairs)")
+    removed = conn.execute("DELETE FROM books WHERE id IN (SELECT drop_id FROM merge_pairs)").rowcount
+
+    for col in ("isbn", "publisher", "language_id"):
+        conn.execute(f"""
+            UPDATE books
+            SET {col} = (
+                SELECT d.{col} FROM merge_pairs p JOIN merge_dropped d ON d.id = p.drop_id
+                WHERE p.keep = books.id AND COALESCE(d.{col}, '') != ''
+                ORDER BY d.id LIMIT 1
+            )
+            WHERE COALESCE({col}, '') = ''
+              AND id IN (SELECT keep FROM merge_pairs p JOIN merge_dropped d ON d.id = p.drop_id
+                         WHERE COALESCE(d.{col}, '') != '')
+        """)
+    conn.execute("DROP TABLE temp.merge_pairs")
+    conn.execute("DROP TABLE temp.merge_dropped")
+    return removed
@@ -0,0 +1,115 @@
+"""
+Propriétaires, formats et langues : tables owners / formats / languages
+(migrations/0007), référencées par books.owner_id / format_id / language_id.
+
+Les valeurs saisies sont normalisées à l'écriture : casse, espaces et
+synonymes (« CAROLE », « bande dessinée », « english ») sont ramenés à une
+entrée existante via dimension_aliases ; une valeur inconnue crée une entrée.
+Les lectures passent par la vue books_named (noms à la place des id).
+"""
+
+# ==============================
+# CONFIG
+# ==============================
+# dimension -> (table, colonne de books)
+DIMENSIONS = {
+    "owner": ("owners", "owner_id"),
+    "format": ("formats", "format_id"),
+    "language": ("languages", "language_id"),
+}
+
+# ==============================
+# NORMALISATION
+# ==============================
+def alias_key(value):
+    """Clé de rapprochement d'une saisie : casse et espaces ignorés"""
+    return " ".join(str(value).split()).casefold()
+
+def is_blank(value):
+    return value is None or value != value or not str(value).strip()   # None, NaN, ""
+
+def aliases(conn, kind):
+    """{clé d'alias: id}"""
+    return dict(conn.execute("SELECT alias, id FROM dimension_aliases WHERE dimension = ?", (kind,)))
+
+def resolve(conn, kind, values):
+    """
+    {valeur saisie: id} (None pour une valeur vide). Les valeurs inconnues
+    sont créées dans la transaction en cours : à appeler sur une connexion d'écriture.
+    """
+    table, _ = DIMENSIONS[kind]
+    known = aliases(conn, kind)
+    ids = {}
+    for value in values:
+        if is_blank(value):
+            ids[value] = None
+            continue
+        key = alias_key(value)
+        if key not in known:
+            name = " ".join(str(value).split())
+            known[key] = conn.execute(f"INSERT INTO {table} (name) VALUES (?)", (name,)).lastrowid
+            conn.execute(
+                "INSERT INTO dimension_aliases (dimension, alias, id) VALUES (?, ?, ?)", (kind, key, known[key])
+            )
+        ids[value] = known[key]
+    return ids
+
+def id_for(conn, kind, value):
+    """id d'une valeur saisie (créée si besoin), None si vide"""
+    return resolve(conn, kind, [value])[value]
+
+def find_id(conn, kind, value):
+    """id d'une valeur existante, sans rien créer ; 0 (aucune entrée) si inconnue"""
+    row = conn.execute(
+        "SELECT id FROM dimension_aliases WHERE dimension = ? AND alias = ?", (kind, alias_key(value))
+    ).fetchone()
+    return row[0] if row else 0
+
+def id_columns(columns):
+    """Colonnes de books côté saisie (owner, ...) -> colonnes stockées (owner_id, ...)"""
+    return [DIMENSIONS[c][1] if c in DIMENSIONS else c for c in columns]
+
+def to_ids(conn, books):
+    """DataFrame `books` : colonnes owner / format / language remplacées par leurs id (entiers ou None)"""
+    for kind, (_, column) in DIMENSIONS.items():
+        if kind not in books.columns:
+            continue
+        values = books[kind]
+        mapping = resolve(conn, kind, values.unique())
+        ids = values.map(mapping).astype("Int64").astype(object)
+        books = books.assign(**{kind: ids.where(ids.notna(), None)}).rename(columns={kind: column})
+    return books
+
+def insert_book(conn, owner, format, author, title, language=None, isbn=None, publisher=None):
+    """
+    Ajoute un livre saisi (noms normalisés, `isbn` canonique : isbns.canonical_isbn) ;
+    sqlite3.IntegrityError si déjà présent (même titre / auteur ou même ISBN chez ce propriétaire)
+    """
+    return conn.execute(
+        """
+        INSERT INTO books (owner_id, format_id, author, title, language_id, isbn, publisher)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            id_for(conn, "owner", owner),
+            id_for(conn, "format", format),
+            author,
+            title,
+            id_for(conn, "language", language),
+            isbn,
+            publisher,
+        ),
+    ).lastrowid
+
+# ==============================
+# LECTURE
+# ==============================
+def names(conn, kind):
+    """{id: nom}"""
+    table, _ = DIMENSIONS[kind]
+    return dict(conn.execute(f"SELECT id, name FROM {table}"))
+
+def choices(conn, kind):
+    """Noms pour les listes de choix (selectbox, CLI) : valeurs d'origine d'abord, puis par ordre de création"""
+    table, _ = DIMENSIONS[kind]
+    return [name for (name,) in conn.execute(f"SELECT name FROM {table} ORDER BY id")]
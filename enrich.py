@@ -0,0 +1,282 @@
+import re
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+import isbn_lookup
+import profiler
+from dimensions import resolve
+from isbn_lookup import ProviderError, fetch_google, fetch_openlibrary_batch, google_volumes, parse_google
+from isbns import canonical_isbns
+
+# ==============================
+# CONFIG
+# ==============================
+WORKERS = 8
+OPENLIBRARY_BATCH = 50        # ISBN par appel bibkeys
+WRITE_BATCH = 200             # lignes mises à jour par transaction
+
+# Requêtes par seconde, par fournisseur (tous threads confondus)
+RATE_LIMITS = {"google": 5.0, "openlibrary": 2.0}
+
+RETRIES = 4
+BACKOFF = 0.5                 # 0.5 s, 1 s, 2 s, 4 s
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+INCOMPLETE_QUERY = """
+    SELECT id, isbn, author, title, publisher, language
+    FROM books_named
+    WHERE isbn IS NULL OR isbn = ''
+       OR publisher IS NULL OR publisher = ''
+       OR language_id IS NULL
+    ORDER BY id
+"""
+
+# ==============================
+# CLIENT HTTP (débit limité, retries)
+# ==============================
+class RateLimiter:
+    """Espace les appels d'au moins 1/rate seconde, quel que soit le thread appelant"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+_local = threading.local()
+
+def session():
+    """Une session (donc un pool de connexions keep-alive) par thread"""
+    if not hasattr(_local, "session"):
+        _local.session = profiler.instrument_session(requests.Session())
+    return _local.session
+
+def call(limiter, fn, *args):
+    for attempt in range(RETRIES + 1):
+        limiter.wait()
+        try:
+            return fn(*args, session=session())
+        except ProviderError as e:
+            if e.status not in RETRY_STATUSES or attempt == RETRIES:
+                raise
+        except requests.RequestException:
+            if attempt == RETRIES:
+                raise
+        time.sleep(BACKOFF * 2 ** attempt)
+
+# ==============================
+# RÉSOLUTION
+# ==============================
+def simplify(text):
+    text = unicodedata.normalize("NFKD", str(text or "")).casefold()
+    return " ".join(re.findall(r"[^\W_]+", "".join(c for c in text if not unicodedata.combining(c))))
+
+def search_by_title(title, author, session=None):
+    """Livre sans ISBN : recherche Google Books titre + auteur, acceptée si les titres concordent"""
+    query = f'intitle:"{title}"'
+    if author:
+        query += f' inauthor:"{author}"'
+    volume = google_volumes(query, session)
+    if not volume:
+        return None
+
+    wanted, found = simplify(title), simplify(volume.get("title"))
+    if not wanted or not found or (wanted not in found and found not in wanted):
+        return None
+
+    ids = {i.get("type"): i.get("identifier") for i in volume.get("industryIdentifiers", [])}
+    return parse_google(volume, ids.get("ISBN_13") or ids.get("ISBN_10") or "")
+
+def merge(*books):
+    """Premier champ non vide de chaque fournisseur"""
+    books = [b for b in books if b]
+    if not books:
+        return None
+    return {key: next((b[key] for b in books if b.get(key)), "") for key in books[0]}
+
+def fill(row, book):
+    """(isbn, publisher, language, id) si le livre complète la ligne, sinon None"""
+    book_id, isbn, _, _, publisher, language = row
+    if not book:
+        return None
+    new = (
+        isbn or book.get("isbn") or None,
+        publisher or book.get("publisher") or None,
+        language or book.get("language") or None,
+    )
+    if new == (isbn or None, publisher or None, language or None):
+        return None
+    return (*new, book_id)
+
+def write_updates(pool, updates):
+    """
+    updates : (isbn, publisher, langue saisie, id) ; la langue est ramenée à son id,
+    l'ISBN à sa forme canonique. Un ISBN déjà porté par un autre livre du même
+    propriétaire (index unique) n'est pas recopié.
+    Retourne le nombre de livres réellement complétés (rowcount : un livre
+    supprimé ou déjà complété entre-temps n'est pas compté).
+    """
+    isbns = canonical_isbns([isbn for isbn, _, _, _ in updates]).tolist()
+    with pool.writer() as conn:
+        languages = resolve(conn, "language", {language for _, _, language, _ in updates})
+        cursor = conn.executemany(
+            """
+            UPDATE books
+            SET isbn = COALESCE(isbn, (
+                    SELECT :isbn WHERE NOT EXISTS (
+                        SELECT 1 FROM books o WHERE o.isbn = :isbn AND o.owner_id = books.owner_id
+                    )
+                )),
+                publisher = COALESCE(NULLIF(publisher, ''), :publisher),
+                language_id = COALESCE(language_id, :language_id)
+            WHERE id = :id AND (
+                isbn IS NULL AND :isbn IS NOT NULL AND NOT EXISTS (
+                    SELECT 1 FROM books o WHERE o.isbn = :isbn AND o.owner_id = books.owner_id
+                )
+                OR NULLIF(publisher, '') IS NULL AND :publisher IS NOT NULL
+                OR language_id IS NULL AND :language_id IS NOT NULL
+            )
+            """,
+            [
+                {"isbn": isbn, "publisher": publisher, "language_id": languages[language], "id": book_id}
+                for isbn, (_, publisher, language, book_id) in zip(isbns, updates)
+            ],
+        )
+        return cursor.rowcount
+
+def enrich(pool, limit=None, workers=WORKERS, rate_limits=None, on_progress=None):
+    """
+    Complète éditeur / langue / ISBN des livres incomplets.
+
+    1. cache ISBN local
+    2. OpenLibrary par lots `bibkeys` (éditeur)
+    3. Google Books par ISBN si la langue manque encore, par titre/auteur sans ISBN
+    Les mises à jour sont écrites par transactions de WRITE_BATCH lignes.
+    `on_progress(done, total)` est appelé depuis le thread appelant ; s'il lève
+    une exception, l'enrichissement s'arrête après avoir enregistré ce qui a été trouvé.
+    """
+    limits = {**RATE_LIMITS, **(rate_limits or {})}
+    google = RateLimiter(limits["google"])
+    openlibrary = RateLimiter(limits["openlibrary"])
+
+    query = INCOMPLETE_QUERY + (" LIMIT ?" if limit else "")
+    with pool.reader() as conn:
+        rows = conn.execute(query, (limit,) if limit else ()).fetchall()
+
+    stats = {"rows": len(rows), "updated": 0, "not_found": 0, "errors": 0}
+    done = 0
+    updates = []
+    to_cache = {}
+
+    def finish(rows_done, book):
+        nonlocal done, updates
+        for row in rows_done:
+            update = fill(row, book)
+            if update:
+                updates.append(update)
+            else:
+                stats["not_found"] += 1
+        done += len(rows_done)
+        if len(updates) >= WRITE_BATCH:
+            stats["updated"] += write_updates(pool, updates)
+            updates = []
+        if on_progress:
+            on_progress(done, len(rows))
+
+    by_isbn = defaultdict(list)
+    no_isbn = []
+    for row in rows:
+        # ISBN en base déjà canoniques (isbns.py)
+        (by_isbn[row[1]] if row[1] else no_isbn).append(row)
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        # 1. Cache local
+        for isbn in list(by_isbn):
+            hit, book = isbn_lookup.cached(pool, isbn)
+            if hit:
+                finish(by_isbn.pop(isbn), book)
+
+        # 2. OpenLibrary par lots
+        isbns = list(by_isbn)
+        batches = {
+            executor.submit(call, openlibrary, fetch_openlibrary_batch, isbns[i:i + OPENLIBRARY_BATCH]):
+            isbns[i:i + OPENLIBRARY_BATCH]
+            for i in range(0, len(isbns), OPENLIBRARY_BATCH)
+        }
+        from_ol, failed = {}, set()
+        for future in as_completed(batches):
+            try:
+                from_ol.update(future.result())
+            except Exception:
+                stats["errors"] += 1
+                failed.update(batches[future])
+
+        needs_google = []
+        for isbn in isbns:
+            book = from_ol.get(isbn)
+            if book and book["publisher"] and all(row[5] for row in by_isbn[isbn]):
+                # Seul l'éditeur manquait et OpenLibrary l'a fourni
+                to_cache[isbn] = book
+                finish(by_isbn.pop(isbn), book)
+            else:
+                needs_google.append(isbn)
+
+        # 3. Google Books : par ISBN, puis par titre pour les livres sans ISBN
+        tasks = {executor.submit(call, google, fetch_google, isbn): ("isbn", isbn) for isbn in needs_google}
+        tasks.update({
+            executor.submit(call, google, search_by_title, row[3], row[2]): ("title", row)
+            for row in no_isbn
+        })
+        for future in as_completed(tasks):
+            kind, key = tasks[future]
+            try:
+                found = future.result()
+            except Exception:
+                stats["errors"] += 1
+                found, error = None, True
+            else:
+                error = False
+
+            if kind == "isbn":
+                book = merge(found, from_ol.get(key))
+                if book or not (error or key in failed):
+                    to_cache[key] = book
+                finish(by_isbn.pop(key), book)
+            else:
+                finish([key], found)
+    finally:
+        # Annulation (exception levée par on_progress) : pas de nouveaux appels,
+        # et ce qui a déjà été trouvé est tout de même enregistré
+        executor.shutdown(cancel_futures=True)
+        try:
+            if updates:
+                stats["updated"] += write_updates(pool, updates)
+        finally:
+            if to_cache:
+                isbn_lookup.store_many(pool, to_cache)
+    return stats
+
+# ==============================
+# JOB (voir jobs.py)
+# ==============================
+def run_job(job):
+    """params : limit, workers (optionnels). Reprise : seuls les livres encore incomplets sont relus."""
+    return enrich(
+        job.pool,
+        limit=job.params.get("limit"),
+        workers=job.params.get("workers", WORKERS),
+        on_progress=job.progress,
+    )
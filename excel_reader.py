@@ -0,0 +1,73 @@
+from itertools import islice
+
+import pandas as pd
+from openpyxl import load_workbook
+
+# ==============================
+# LECTURE EN UNE PASSE
+# ==============================
+# openpyxl en read_only : les lignes sont lues en flux depuis le XML,
+# chaque onglet n'est parcouru qu'une seule fois.
+
+def norm(x):
+    return str(x).strip().lower()
+
+def find_header(rows, needles):
+    """Index de la première ligne contenant un des `needles` (testés dans l'ordre), ou None"""
+    normalized = [[norm(v) for v in row if v is not None] for row in rows]
+    for needle in needles:
+        for i, cells in enumerate(normalized):
+            if any(needle in cell for cell in cells if cell):
+                return i
+    return None
+
+def header_columns(header, width):
+    """Noms de colonnes normalisés ; vides -> 'unnamed: i', doublons -> 'nom.1', 'nom.2'..."""
+    columns, seen = [], {}
+    for i in range(width):
+        value = header[i] if i < len(header) else None
+        name = norm(value) if value is not None and norm(value) else f"unnamed: {i}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        columns.append(name)
+    return columns
+
+def read_sheet(ws, needles, max_scan=60):
+    """
+    DataFrame de l'onglet à partir de la ligne d'en-tête détectée, ou None.
+    Seules les `max_scan` premières lignes sont examinées pour trouver l'en-tête.
+    """
+    ws.reset_dimensions()   # ne pas se fier aux dimensions déclarées dans le fichier
+    rows = ws.iter_rows(values_only=True)
+    head = list(islice(rows, max_scan))
+
+    header_row = find_header(head, needles)
+    if header_row is None:
+        return None
+
+    data = head[header_row + 1:]
+    data.extend(rows)
+    width = max([len(head[header_row])] + [len(r) for r in data])
+    # dtype object : pas de conversion 1984 -> 1984.0 dans les colonnes à trous
+    return pd.DataFrame(data, columns=header_columns(head[header_row], width), dtype=object)
+
+def read_workbook(path, sheets, max_scan=60):
+    """
+    Ouvre le classeur une seule fois et lit plusieurs onglets.
+    `sheets` = {nom d'onglet: [needles d'en-tête]} ; retourne {nom: DataFrame ou None}.
+    """
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        result = {}
+        for name, needles in sheets.items():
+            if name not in wb.sheetnames:
+                print(f"⚠️ Onglet absent : {name}")
+                result[name] = None
+                continue
+            result[name] = read_sheet(wb[name], needles, max_scan)
+        return result
+    finally:
+        wb.close()
@@ -0,0 +1,108 @@
+import csv
+import gzip
+import hashlib
+import json
+import tempfile
+from pathlib import Path
+
+from db import data_version
+from frames import arrow_columns
+from search import build_search_query, filter_ids
+
+# ==============================
+# CONFIG
+# ==============================
+EXPORT_DIRNAME = "exports"   # à côté du fichier de base
+CHUNK_SIZE = 5000
+
+HEADER = ["Proprio", "Format", "Auteur", "Titre", "Langue", "Éditeur", "Ajouté le"]
+EXPORT_COLUMNS = "b.owner, b.format, b.author, b.title, b.language, b.publisher, b.created_at"
+
+# format -> (extension, mime)
+FORMATS = {
+    "csv": ("csv", "text/csv"),
+    "csv.gz": ("csv.gz", "application/gzip"),
+    "parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+# ==============================
+# LECTURE PAR BLOCS
+# ==============================
+def export_query(conn, text="", owner=None, fmt=None):
+    """Sans filtre : toute la base, plus récents d'abord (comme la liste)"""
+    if text or owner or fmt:
+        return build_search_query(text, *filter_ids(conn, owner, fmt), columns=EXPORT_COLUMNS)
+    return f"SELECT {EXPORT_COLUMNS} FROM books_named b ORDER BY b.created_at DESC, b.id DESC", []
+
+def iter_chunks(conn, text="", owner=None, fmt=None, chunk_size=CHUNK_SIZE):
+    """Générateur de listes de lignes : jamais plus de `chunk_size` lignes en mémoire"""
+    cur = conn.execute(*export_query(conn, text, owner, fmt))
+    while True:
+        rows = cur.fetchmany(chunk_size)
+        if not rows:
+            break
+        yield rows
+
+# ==============================
+# ÉCRITURE
+# ==============================
+def write_csv(chunks, path, compress=False):
+    opener = gzip.open if compress else open
+    with opener(path, "wt", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(HEADER)
+        for rows in chunks:
+            writer.writerows(rows)
+
+def write_parquet(chunks, path):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(name, pa.string()) for name in HEADER])
+    with pq.ParquetWriter(path, schema) as writer:
+        for rows in chunks:
+            writer.write_batch(pa.record_batch(arrow_columns(rows, schema.types), schema=schema))
+
+def write_export(conn, path, kind="csv", text="", owner=None, fmt=None):
+    chunks = iter_chunks(conn, text, owner, fmt)
+    if kind == "parquet":
+        write_parquet(chunks, path)
+    else:
+        write_csv(chunks, path, compress=(kind == "csv.gz"))
+
+# ==============================
+# CACHE DISQUE
+# ==============================
+def export_file(pool, kind="csv", text="", owner=None, fmt=None):
+    """
+    Génère (ou réutilise) le fichier d'export et retourne son chemin.
+
+    Le fichier est identifié par la version des données + les filtres :
+    tant que la base ne change pas, un nouveau téléchargement ne relit rien.
+    Les exports d'anciennes versions sont supprimés.
+    """
+    ext, _ = FORMATS[kind]
+    export_dir = pool.path.parent / EXPORT_DIRNAME
+    with pool.reader() as conn:
+        version = data_version(conn)
+        key = json.dumps([kind, text, owner, fmt])
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        path = export_dir / f"{version}-{digest}.{ext}"
+
+        if not path.exists():
+            export_dir.mkdir(parents=True, exist_ok=True)
+            for old in export_dir.iterdir():
+                # « .*.tmp » : export en cours d'écriture par un autre thread / process
+                if not old.name.startswith((f"{version}-", ".")):
+                    old.unlink(missing_ok=True)
+
+            with tempfile.NamedTemporaryFile(dir=export_dir, prefix=f".{path.name}.", suffix=".tmp", delete=False) as f:
+                tmp = Path(f.name)
+            try:
+                write_export(conn, tmp, kind, text, owner, fmt)
+                tmp.replace(path)
+            except BaseException:
+                tmp.unlink(missing_ok=True)
+                raise
+
+    return path
@@ -0,0 +1,61 @@
+"""
+DataFrames de résultats construits colonne par colonne depuis le curseur.
+
+pd.DataFrame(cursor.fetchall()) garde en mémoire toutes les lignes en tuples
+Python le temps de la construction. Ici le curseur est lu par blocs, chaque
+bloc converti en colonnes pyarrow : propriétaire, format et langue deviennent
+des catégories (quelques valeurs répétées), les autres textes des chaînes Arrow.
+"""
+
+# ==============================
+# CONFIG
+# ==============================
+CHUNK_SIZE = 5000
+CATEGORY_COLUMNS = {"owner", "format", "language"}
+
+# Colonnes SQL -> en-têtes affichés / exportés
+LABELS = {
+    "owner": "Proprio",
+    "format": "Format",
+    "author": "Auteur",
+    "title": "Titre",
+    "language": "Langue",
+    "publisher": "Éditeur",
+    "created_at": "Ajouté le",
+}
+
+# ==============================
+# CONVERSION
+# ==============================
+def arrow_columns(rows, types=None):
+    """Lignes (tuples) -> une colonne pyarrow par position ; `types` : None = déduit"""
+    import pyarrow as pa
+
+    columns = list(zip(*rows))
+    types = types or [None] * len(columns)
+    return [pa.array(col, type=t) for col, t in zip(columns, types)]
+
+def to_series(name, arrays):
+    """Blocs d'une colonne -> Series : catégorie, chaîne Arrow ou type natif (entiers...)"""
+    import pandas as pd
+    import pyarrow as pa
+
+    # Un bloc tout à NULL est de type null : aligné sur les autres blocs
+    typ = next((a.type for a in arrays if a.type != pa.null()), pa.string())
+    column = pa.chunked_array([a.cast(typ) for a in arrays], type=typ)
+    if not pa.types.is_string(typ):
+        return column.to_pandas()
+    if name in CATEGORY_COLUMNS:
+        return column.dictionary_encode().to_pandas()
+    return pd.Series(pd.arrays.ArrowStringArray(column))
+
+def read_frame(cursor, chunk_size=CHUNK_SIZE):
+    """DataFrame du résultat de `cursor` (colonnes = noms SQL), lu par blocs de `chunk_size` lignes"""
+    import pandas as pd
+
+    names = [d[0] for d in cursor.description]
+    chunks = [[] for _ in names]
+    while rows := cursor.fetchmany(chunk_size):
+        for arrays, column in zip(chunks, arrow_columns(rows)):
+            arrays.append(column)
+    return pd.DataFrame({name: to_series(name, arrays) for name, arrays in zip(names, chunks)})
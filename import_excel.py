@@ -1,37 +1,19 @@
 import pandas as pd
-import sqlite3
-from pathlib import Path
+
+from excel_reader import read_workbook
+from import_manifest import file_hash, is_known_file, record_file, sync_books
 
 # ==============================
 # CONFIG
 # ==============================
-DB_PATH = Path("data") / "books.sqlite"
-SCHEMA_FILE = "schema.sql"
 EXCEL_FILE = "Solde compte.xlsx"
 
 SHEET_LIVRES = "Livres"
 SHEET_BD = "BD"
 
-# ==============================
-# DB
-# ==============================
-def connect():
-    DB_PATH.parent.mkdir(exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("PRAGMA foreign_keys = ON;")
-    return conn
-
-def init_db(conn):
-    with open(SCHEMA_FILE, "r", encoding="utf-8") as f:
-        conn.executescript(f.read())
-    conn.commit()
-
 # ==============================
 # UTILS
 # ==============================
-def norm(x):
-    return str(x).strip().lower()
-
 def s(x):
     """safe string"""
     if x is None:
@@ -43,44 +25,27 @@ def s(x):
 def to_bool(v):
     return 1 if str(v).strip().lower() in ("1", "x", "oui", "true", "vrai") else 0
 
-def find_header_row(raw_df, needle="titre", max_scan=60):
-    for i in range(min(max_scan, len(raw_df))):
-        row_vals = [norm(v) for v in raw_df.iloc[i].values]
-        if any(needle in cell for cell in row_vals if cell):
-            return i
-    return None
+BOOK_COLUMNS = ["owner", "author", "title", "publisher", "language", "format", "read", "kept_after_reading"]
 
-def insert_book(cur, owner, author, title, publisher="", language="", fmt="Livre", read=0, kept=1):
+def book_row(owner, author, title, publisher="", language="", fmt="Livre", read=0, kept=1):
+    """Ligne prête pour `books`, ou None si le titre est vide"""
     title = s(title)
-    author = s(author)
-    publisher = s(publisher)
-    language = s(language)
-
     if not title:
-        return 0
-
-    cur.execute(
-        """
-        INSERT OR IGNORE INTO books
-        (owner, author, title, publisher, language, format, read, kept_after_reading)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (owner, author, title, publisher, language, fmt, int(read), int(kept)),
-    )
-    return 1 if cur.rowcount > 0 else 0
+        return None
+    return (owner, s(author), title, s(publisher), s(language), fmt, int(read), int(kept))
+
+def books_frame(rows):
+    return pd.DataFrame([r for r in rows if r], columns=BOOK_COLUMNS)
 
 # ==============================
 # IMPORT LIVRES (NILS + CAROLE)
 # ==============================
-def import_livres(cur):
-    raw = pd.read_excel(EXCEL_FILE, sheet_name=SHEET_LIVRES, header=None)
-    header_row = find_header_row(raw, needle="titre")
-    if header_row is None:
+def import_livres(df):
+    """(livres NILS, livres CAROLE) sous forme de DataFrames `books`"""
+    nils, carole = books_frame([]), books_frame([])
+    if df is None:
         print("⚠️ Onglet Livres: en-tête introuvable")
-        return (0, 0)
-
-    df = pd.read_excel(EXCEL_FILE, sheet_name=SHEET_LIVRES, header=header_row)
-    df.columns = [norm(c) for c in df.columns]
+        return (nils, carole)
 
     # ----- CAROLE (bloc gauche) -----
     c_author = next((c for c in df.columns if c == "auteur"), None)
@@ -90,11 +55,9 @@ def import_livres(cur):
     c_keep   = next((c for c in df.columns if "gard" in c), None)
     c_pub    = next((c for c in df.columns if "edition" in c or "éditeur" in c or "editeur" in c), None)
 
-    carole_added = 0
     if c_title and c_author:
-        for _, r in df.iterrows():
-            carole_added += insert_book(
-                cur,
+        carole = books_frame(
+            book_row(
                 "CAROLE",
                 r.get(c_author),
                 r.get(c_title),
@@ -104,6 +67,8 @@ def import_livres(cur):
                 read=to_bool(r.get(c_read)) if c_read else 0,
                 kept=to_bool(r.get(c_keep)) if c_keep else 1,
             )
+            for _, r in df.iterrows()
+        )
     else:
         print("⚠️ Bloc CAROLE non détecté")
 
@@ -111,77 +76,91 @@ def import_livres(cur):
     n_author = next((c for c in df.columns if c.startswith("auteur") and c != "auteur"), None)
     n_title  = next((c for c in df.columns if c.startswith("titre") and c != "titre"), None)
 
-    nils_added = 0
     if n_author and n_title:
-        for _, r in df.iterrows():
-            nils_added += insert_book(
-                cur,
+        nils = books_frame(
+            book_row(
                 "NILS",
                 r.get(n_author),
                 r.get(n_title),
                 fmt="Livre",
             )
+            for _, r in df.iterrows()
+        )
     else:
         print("⚠️ Bloc NILS non détecté")
 
-    return (nils_added, carole_added)
+    return (nils, carole)
 
 # ==============================
 # IMPORT BD (NILS)
 # ==============================
-def import_bd(cur):
-    raw = pd.read_excel(EXCEL_FILE, sheet_name=SHEET_BD, header=None)
-    header_row = find_header_row(raw, needle="bd")
-    if header_row is None:
-        header_row = find_header_row(raw, needle="titre")
-
-    if header_row is None:
+def import_bd(df):
+    if df is None:
         print("⚠️ Onglet BD: en-tête introuvable")
-        return 0
-
-    df = pd.read_excel(EXCEL_FILE, sheet_name=SHEET_BD, header=header_row)
-    df.columns = [norm(c) for c in df.columns]
+        return books_frame([])
 
     c_author = next((c for c in df.columns if "bd auteur" in c or c == "auteur"), None)
     c_title  = next((c for c in df.columns if "bd titre" in c or c == "titre"), None)
 
-    added = 0
-    for _, r in df.iterrows():
-        added += insert_book(
-            cur,
+    return books_frame(
+        book_row(
             "NILS",
             r.get(c_author),
             r.get(c_title),
             fmt="BD",
         )
-    return added
+        for _, r in df.iterrows()
+    )
 
 # ==============================
-# MAIN
+# IMPORT (job)
 # ==============================
-def main():
-    if not Path(EXCEL_FILE).exists():
-        raise FileNotFoundError(f"❌ Fichier introuvable : {EXCEL_FILE}")
-
-    conn = connect()
-    init_db(conn)
-    cur = conn.cursor()
-
-    print("📚 IMPORT EXCEL → SQLITE (MODE EXCEL RÉEL)")
-    print(f"📄 {EXCEL_FILE}")
-    print("----------------------------------------")
-
-    nils_livres, carole_livres = import_livres(cur)
-    print(f"✅ Livres importés: NILS={nils_livres} | CAROLE={carole_livres}")
-
-    bd_nils = import_bd(cur)
-    print(f"✅ BD importées (NILS): {bd_nils}")
-
-    conn.commit()
-    conn.close()
-
-    print("----------------------------------------")
-    print("🎉 Import terminé sans erreurs (doublons ignorés)")
-
-if __name__ == "__main__":
-    main()
+def import_workbook(pool, path, job=None):
+    """
+    Importe le classeur ; retourne {"file_unchanged": bool, "blocks": {bloc: rapport}}.
+    Chaque bloc est une source distincte du manifeste, synchronisée dans sa
+    propre transaction : seules les lignes ajoutées / modifiées / retirées
+    depuis le dernier import sont écrites.
+    """
+    source = str(path)
+    digest = file_hash(path)
+    with pool.reader() as conn:
+        if is_known_file(conn, source, digest):
+            return {"file_unchanged": True, "blocks": {}}
+
+    if job:
+        job.progress(0, message="Lecture du classeur")
+    # Une seule lecture du classeur pour les deux onglets
+    sheets = read_workbook(path, {
+        SHEET_LIVRES: ["titre"],
+        SHEET_BD: ["bd", "titre"],
+    })
+    nils_livres, carole_livres = import_livres(sheets[SHEET_LIVRES])
+    blocks = {
+        f"{SHEET_LIVRES}:NILS": nils_livres,
+        f"{SHEET_LIVRES}:CAROLE": carole_livres,
+        f"{SHEET_BD}:NILS": import_bd(sheets[SHEET_BD]),
+    }
+
+    total = sum(len(b) for b in blocks.values())
+    done, reports = 0, {}
+    for block, books in blocks.items():
+        if job:
+            job.progress(done, total, block)
+        with pool.writer() as conn:
+            reports[block] = sync_books(
+                conn,
+                f"{source}#{block}",
+                books,
+                on_progress=(lambda n, _, start=done: job.tick(start + n, total)) if job else None,
+            )
+        done += len(books)
+    with pool.writer() as conn:
+        record_file(conn, source, digest, total)
+    if job:
+        job.progress(total, total, "Terminé")
+    return {"file_unchanged": False, "blocks": reports}
+
+def run_job(job):
+    """params : path (classeur à importer)"""
+    return import_workbook(job.pool, job.params["path"], job)
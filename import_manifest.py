@@ -0,0 +1,253 @@
+import hashlib
+
+from db import BOOK_KEY
+from dimensions import id_columns, to_ids
+
+# ==============================
+# MANIFESTE D'IMPORT
+# ==============================
+# import_files : empreinte du fichier source complet (source -> sha256)
+# import_rows  : empreinte de chaque ligne importée (source, row_hash) -> books.id
+#
+# Un réimport du même fichier est ignoré d'emblée ; un fichier modifié
+# ne touche que les lignes ajoutées, modifiées ou supprimées.
+
+def file_hash(data):
+    """sha256 du contenu brut (bytes) ou d'un fichier (Path)"""
+    h = hashlib.sha256()
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        h.update(data)
+    else:
+        with open(data, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+    return h.hexdigest()
+
+def is_known_file(conn, source, digest):
+    row = conn.execute("SELECT file_hash FROM import_files WHERE source = ?", (source,)).fetchone()
+    return row is not None and row[0] == digest
+
+def record_file(conn, source, digest, rows):
+    conn.execute(
+        """
+        INSERT OR REPLACE INTO import_files (source, file_hash, rows, imported_at)
+        VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+        """,
+        (source, digest, rows),
+    )
+
+def forget_all(conn):
+    """À appeler quand `books` est vidé : les lignes suivies n'existent plus"""
+    conn.execute("DELETE FROM import_rows")
+    conn.execute("DELETE FROM import_files")
+
+def row_hashes(books):
+    """Empreinte 64 bits de chaque ligne, calculée colonne par colonne (vectorisé)"""
+    import pandas as pd
+
+    hashes = pd.util.hash_pandas_object(books.astype(object), index=False)
+    return hashes.astype("int64")   # SQLite : entiers signés 64 bits
+
+def empty_report():
+    return {
+        "added": 0, "changed": 0, "removed": 0, "unchanged": 0, "duplicates": 0,
+        "unreadable_isbn": 0, "file_unchanged": False,
+    }
+
+# ==============================
+# SYNCHRONISATION
+# ==============================
+STAGING_CHUNK = 5000   # lignes chargées entre deux appels à on_progress
+
+def sync_books(conn, source, books, on_progress=None):
+    """
+    Aligne les livres issus de `source` sur le DataFrame `books` (colonnes de
+    la table books, noms en clair pour owner / format / language), en quelques
+    requêtes ensemblistes.
+
+    - ligne inconnue du manifeste            -> ajoutée (sauf doublon de books.book_key)
+    - ligne du manifeste absente de `books`  -> livre supprimé
+    - paire supprimée/ajoutée de même clé    -> livre modifié sur place
+    - ligne déjà connue                      -> non touchée
+
+    Ne commite pas. `on_progress(done, total)` est appelé pendant le chargement
+    (il peut lever une exception pour interrompre). Retourne le rapport de différences.
+    """
+    chunks = (books.iloc[start:start + STAGING_CHUNK] for start in range(0, len(books), STAGING_CHUNK))
+    return sync_chunks(conn, source, chunks, list(books.columns), on_progress, total=len(books))
+
+def sync_chunks(conn, source, chunks, columns, on_progress=None, total=None, wipe=False):
+    """
+    Comme sync_books, pour des DataFrames successifs (mêmes `columns`), chacun
+    mis en attente avant de lire le suivant. Ne commite pas.
+    wipe : vide `books` et le manifeste juste avant d'appliquer les changements.
+    """
+    create_staging(conn, columns)
+    staged = 0
+    for chunk in chunks:
+        staged += stage_chunk(conn, chunk)
+        if on_progress:
+            on_progress(staged, total)
+    return apply_staged(conn, source, columns, wipe=wipe)
+
+# Lignes en attente : table import_staging de `schema` (temp, ou base annexe
+# attachée qui survit entre deux prises du verrou d'écriture : voir csv_import.sync_csv).
+# Tables de travail du calcul des différences : créées et supprimées par apply_staged.
+WORK_TABLES = ("import_added", "import_removed", "import_changed", "import_new")
+
+def create_staging(conn, columns, schema="temp"):
+    """Table de mise en attente vide (colonnes de books côté saisie : owner, format...)"""
+    conn.execute(f"DROP TABLE IF EXISTS {schema}.import_staging")
+    conn.execute(f"""
+        CREATE TABLE {schema}.import_staging (
+            seq INTEGER PRIMARY KEY, row_hash INTEGER, {", ".join(id_columns(columns))},
+            book_key TEXT GENERATED ALWAYS AS ({BOOK_KEY}) VIRTUAL
+        )
+    """)
+
+def stage_chunk(conn, chunk, schema="temp"):
+    """Met un bloc en attente (noms -> id, dimensions inconnues créées) ; retourne son nombre de lignes"""
+    # Empreintes calculées sur les valeurs saisies, stockage par id (dimensions.py)
+    hashes = row_hashes(chunk).tolist()
+    chunk = to_ids(conn, chunk)
+    columns = list(chunk.columns)
+    conn.executemany(
+        f"INSERT INTO {schema}.import_staging (row_hash, {', '.join(columns)}) VALUES (?{', ?' * len(columns)})",
+        zip(hashes, *(chunk[c].tolist() for c in columns)),
+    )
+    return len(chunk)
+
+def apply_staged(conn, source, columns, schema="temp", wipe=False):
+    """
+    Applique à `books` et au manifeste les différences avec les lignes en
+    attente, puis supprime les tables de travail. Ne commite pas.
+    """
+    report = empty_report()
+    columns = id_columns(columns)
+    col_list = ", ".join(columns)
+    staging = f"{schema}.import_staging"
+    added, removed, changed, new = (f"temp.{table}" for table in WORK_TABLES)
+
+    cur = conn.cursor()
+    for table in (added, removed, changed, new):
+        cur.execute(f"DROP TABLE IF EXISTS {table}")
+    cur.execute(f"CREATE INDEX {schema}.idx_import_staging_hash ON import_staging (row_hash)")
+    staged = cur.execute(f"SELECT COUNT(*) FROM {staging}").fetchone()[0]
+
+    if wipe:
+        cur.execute("DELETE FROM books")
+        forget_all(conn)
+
+    # Première occurrence de chaque empreinte inconnue du manifeste
+    cur.execute(f"""
+        CREATE TABLE {added} AS
+        SELECT s.* FROM {staging} s
+        WHERE s.seq IN (SELECT MIN(seq) FROM {staging} GROUP BY row_hash)
+          AND NOT EXISTS (
+              SELECT 1 FROM import_rows r WHERE r.source = ? AND r.row_hash = s.row_hash
+          )
+    """, (source,))
+    cur.execute(f"""
+        CREATE TABLE {removed} AS
+        SELECT r.row_hash, r.book_id FROM import_rows r
+        WHERE r.source = ?
+          AND NOT EXISTS (SELECT 1 FROM {staging} s WHERE s.row_hash = r.row_hash)
+    """, (source,))
+
+    # Modifiée = une ligne retirée et une ligne ajoutée pour le même livre
+    cur.execute(f"""
+        CREATE TABLE {changed} AS
+        SELECT seq, MIN(old_hash) AS old_hash, MIN(book_id) AS book_id FROM (
+            SELECT MIN(a.seq) AS seq, rm.row_hash AS old_hash, rm.book_id
+            FROM {removed} rm
+            JOIN books b ON b.id = rm.book_id
+            JOIN {added} a ON a.book_key = b.book_key
+            GROUP BY rm.book_id
+        )
+        GROUP BY seq
+    """)
+    values = {c: f"a.{c}" for c in columns}
+    if "isbn" in values:
+        # ISBN déjà porté par un autre livre du même propriétaire (index unique) : non recopié
+        values["isbn"] = """CASE WHEN EXISTS (
+            SELECT 1 FROM books o WHERE o.isbn = a.isbn AND o.owner_id = a.owner_id AND o.id != books.id
+        ) THEN NULL ELSE a.isbn END"""
+    set_clause = ", ".join(f"{c} = {v}" for c, v in values.items())
+    cur.execute(f"""
+        UPDATE books SET {set_clause}
+        FROM {changed} c JOIN {added} a ON a.seq = c.seq
+        WHERE books.id = c.book_id
+    """)
+    report["changed"] = cur.rowcount
+    cur.execute(f"""
+        UPDATE import_rows
+        SET row_hash = (SELECT a.row_hash FROM {changed} c JOIN {added} a ON a.seq = c.seq
+                        WHERE c.old_hash = import_rows.row_hash)
+        WHERE source = ? AND row_hash IN (SELECT old_hash FROM {changed})
+    """, (source,))
+
+    # Suppressions
+    cur.execute(f"""
+        DELETE FROM books WHERE id IN (
+            SELECT book_id FROM {removed}
+            WHERE row_hash NOT IN (SELECT old_hash FROM {changed})
+        )
+    """)
+    report["removed"] = cur.rowcount
+    cur.execute(f"""
+        DELETE FROM import_rows
+        WHERE source = ? AND row_hash IN (
+            SELECT row_hash FROM {removed}
+            WHERE row_hash NOT IN (SELECT old_hash FROM {changed})
+        )
+    """, (source,))
+
+    # Ajouts : doublon = clé (ou ISBN du même propriétaire) déjà en base (index uniques),
+    # ou déjà vue plus haut dans le fichier
+    same_isbn = f"""
+        OR a.isbn IS NOT NULL AND (
+            EXISTS (SELECT 1 FROM books b WHERE b.isbn = a.isbn AND b.owner_id = a.owner_id)
+            OR a.seq NOT IN (SELECT MIN(seq) FROM {added} WHERE isbn IS NOT NULL GROUP BY isbn, owner_id)
+        )
+    """ if "isbn" in columns else ""
+    cur.execute(f"""
+        CREATE TABLE {new} AS
+        SELECT a.seq, a.row_hash, (
+            EXISTS (SELECT 1 FROM books b WHERE b.book_key = a.book_key)
+            OR a.seq NOT IN (SELECT MIN(seq) FROM {added} GROUP BY book_key)
+            {same_isbn}
+        ) AS dup
+        FROM {added} a
+        WHERE a.seq NOT IN (SELECT seq FROM {changed})
+    """)
+    cur.execute(f"""
+        INSERT INTO books ({col_list})
+        SELECT {", ".join(f"a.{c}" for c in columns)}
+        FROM {added} a JOIN {new} n ON n.seq = a.seq
+        WHERE NOT n.dup
+        ORDER BY a.seq
+    """)
+    inserted = cur.rowcount
+    report["added"] = inserted
+
+    # AUTOINCREMENT : un INSERT ... SELECT attribue des id consécutifs,
+    # dans l'ordre de seq, se terminant par last_insert_rowid()
+    first_id = cur.execute("SELECT last_insert_rowid()").fetchone()[0] - inserted + 1
+    cur.execute(f"""
+        INSERT OR REPLACE INTO import_rows (source, row_hash, book_id)
+        SELECT ?, row_hash,
+               CASE WHEN dup THEN NULL
+                    ELSE ? - 1 + SUM(NOT dup) OVER (ORDER BY seq) END
+        FROM {new}
+    """, (source, first_id))
+    report["duplicates"] = cur.execute(f"SELECT COUNT(*) FROM {new} WHERE dup").fetchone()[0]
+
+    distinct = cur.execute(f"SELECT COUNT(DISTINCT row_hash) FROM {staging}").fetchone()[0]
+    added_rows = cur.execute(f"SELECT COUNT(*) FROM {added}").fetchone()[0]
+    report["unchanged"] = distinct - added_rows
+    # Lignes identiques répétées dans le fichier
+    report["duplicates"] += staged - distinct
+
+    for table in (staging, added, removed, changed, new):
+        cur.execute(f"DROP TABLE {table}")
+    return report
@@ -0,0 +1,218 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import profiler
+from isbns import canonical_isbn
+
+# ==============================
+# CONFIG
+# ==============================
+# Surchargeables pour pointer vers un serveur local (tests, benchmarks)
+GOOGLE_BOOKS_URL = os.environ.get("BLIBLIO_GOOGLE_BOOKS_URL", "https://www.googleapis.com/books/v1/volumes")
+OPENLIBRARY_URL = os.environ.get("BLIBLIO_OPENLIBRARY_URL", "https://openlibrary.org/api/books")
+TIMEOUT = 5
+
+POSITIVE_TTL = 30 * 24 * 3600    # livre trouvé : 30 jours
+NEGATIVE_TTL = 24 * 3600         # introuvable : 1 jour, les bases s'enrichissent
+LRU_SIZE = 1024
+
+_session = None           # requests importé à la première requête réseau
+_session_lock = threading.Lock()
+
+# ==============================
+# FOURNISSEURS
+# ==============================
+class ProviderError(Exception):
+    """Réponse inexploitable (HTTP != 200) : le résultat ne doit pas être mis en cache"""
+
+    def __init__(self, provider, status):
+        super().__init__(f"{provider} HTTP {status}")
+        self.status = status
+
+def default_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+
+            _session = profiler.instrument_session(requests.Session())
+        return _session
+
+def parse_google(book, isbn_clean):
+    return {
+        "title": book.get("title", ""),
+        "authors": ", ".join(book.get("authors", [])),
+        "publisher": book.get("publisher", ""),
+        "language": book.get("language", "").upper()[:2],
+        "isbn": isbn_clean
+    }
+
+def google_volumes(query, session=None):
+    """Premier résultat Google Books (volumeInfo) pour une requête `q`, ou None"""
+    response = (session or default_session()).get(GOOGLE_BOOKS_URL, params={"q": query}, timeout=TIMEOUT)
+    if response.status_code != 200:
+        raise ProviderError("Google Books", response.status_code)
+
+    data = response.json()
+    if data.get("totalItems", 0) > 0:
+        return data["items"][0]["volumeInfo"]
+    return None
+
+def fetch_google(isbn_clean, session=None):
+    book = google_volumes(f"isbn:{isbn_clean}", session)
+    return parse_google(book, isbn_clean) if book else None
+
+def parse_openlibrary(book, isbn_clean):
+    return {
+        "title": book.get("title", ""),
+        "authors": ", ".join([a.get("name", "") for a in book.get("authors", [])]),
+        "publisher": ", ".join([p.get("name", "") for p in book.get("publishers", [])]),
+        "language": "",
+        "isbn": isbn_clean
+    }
+
+def fetch_openlibrary_batch(isbns, session=None):
+    """Un seul appel `bibkeys=ISBN:a,ISBN:b,...` ; retourne {isbn: book} pour les ISBN trouvés"""
+    response = (session or default_session()).get(
+        OPENLIBRARY_URL,
+        params={
+            "bibkeys": ",".join(f"ISBN:{isbn}" for isbn in isbns),
+            "format": "json",
+            "jscmd": "data",
+        },
+        timeout=TIMEOUT,
+    )
+    if response.status_code != 200:
+        raise ProviderError("OpenLibrary", response.status_code)
+
+    data = response.json()
+    return {
+        isbn: parse_openlibrary(data[f"ISBN:{isbn}"], isbn)
+        for isbn in isbns
+        if f"ISBN:{isbn}" in data
+    }
+
+def fetch_openlibrary(isbn_clean, session=None):
+    return fetch_openlibrary_batch([isbn_clean], session).get(isbn_clean)
+
+def fetch_book(isbn_clean):
+    """
+    Google Books puis OpenLibrary. Retourne (book ou None, cacheable).
+    Un "introuvable" n'est cacheable que si aucun fournisseur n'a échoué.
+    """
+    cacheable = True
+    for fetch in (fetch_google, fetch_openlibrary):
+        try:
+            book = fetch(isbn_clean)
+        except ProviderError:
+            cacheable = False
+            continue
+        if book:
+            return book, True
+    return None, cacheable
+
+# ==============================
+# CACHE (LRU mémoire + table SQLite)
+# ==============================
+_lru = OrderedDict()   # isbn -> (expires_at, book ou None)
+_lru_lock = threading.Lock()
+_stats = {"lru_hits": 0, "db_hits": 0, "negative_hits": 0, "misses": 0, "fetches": 0}
+
+def _count(name):
+    with _lru_lock:
+        _stats[name] += 1
+
+def _lru_get(isbn_clean, now):
+    with _lru_lock:
+        entry = _lru.get(isbn_clean)
+        if entry is None:
+            return None
+        if entry[0] <= now:
+            del _lru[isbn_clean]
+            return None
+        _lru.move_to_end(isbn_clean)
+        return entry
+
+def _lru_put(isbn_clean, expires_at, book):
+    with _lru_lock:
+        _lru[isbn_clean] = (expires_at, book)
+        _lru.move_to_end(isbn_clean)
+        while len(_lru) > LRU_SIZE:
+            _lru.popitem(last=False)
+
+def cache_stats():
+    with _lru_lock:
+        stats = dict(_stats)
+        stats["lru_size"] = len(_lru)
+    return stats
+
+def clear_memory_cache():
+    with _lru_lock:
+        _lru.clear()
+
+def store_many(pool, books, now=None):
+    """Enregistre {isbn: book ou None (introuvable)} dans les deux niveaux de cache"""
+    now = now or time.time()
+    rows = [
+        (isbn_clean, json.dumps(book) if book else None, now, now + (POSITIVE_TTL if book else NEGATIVE_TTL))
+        for isbn_clean, book in books.items()
+    ]
+    with pool.writer(versioned=False) as conn:
+        conn.executemany(
+            """
+            INSERT OR REPLACE INTO isbn_cache (isbn, data, fetched_at, expires_at)
+            VALUES (?, ?, ?, ?)
+            """,
+            rows,
+        )
+    for isbn_clean, data, _, expires_at in rows:
+        _lru_put(isbn_clean, expires_at, books[isbn_clean])
+
+def store(pool, isbn_clean, book, now=None):
+    store_many(pool, {isbn_clean: book}, now)
+
+def cached(pool, isbn_clean, now=None):
+    """(trouvé dans le cache, book ou None)"""
+    now = now or time.time()
+
+    entry = _lru_get(isbn_clean, now)
+    if entry is not None:
+        _count("lru_hits")
+    else:
+        with pool.reader() as conn:
+            row = conn.execute(
+                "SELECT expires_at, data FROM isbn_cache WHERE isbn = ? AND expires_at > ?",
+                (isbn_clean, now),
+            ).fetchone()
+        if row is None:
+            return False, None
+        entry = (row[0], json.loads(row[1]) if row[1] else None)
+        _lru_put(isbn_clean, *entry)
+        _count("db_hits")
+
+    if entry[1] is None:
+        _count("negative_hits")
+    return True, entry[1]
+
+def lookup_isbn(pool, isbn):
+    """
+    Recherche un livre par ISBN : cache d'abord, puis Google Books / OpenLibrary.
+    Code illisible (isbns.canonical_isbn) : None, sans requête réseau.
+    """
+    isbn_clean = canonical_isbn(isbn)
+    if isbn_clean is None:
+        return None
+
+    hit, book = cached(pool, isbn_clean)
+    if hit:
+        return book
+
+    _count("misses")
+    _count("fetches")
+    book, cacheable = fetch_book(isbn_clean)
+    if cacheable:
+        store(pool, isbn_clean, book)
+    return book
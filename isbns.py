@@ -0,0 +1,116 @@
+"""
+ISBN / EAN : forme canonique = ISBN-13 sans séparateurs (préfixe 978 / 979,
+clé de contrôle vérifiée), ou None si le code est illisible.
+
+Rattrape les saisies abîmées par un tableur ou par pandas : tirets, espaces,
+préfixe « ISBN », ISBN-10 (converti en ISBN-13), nombre flottant
+(« 9782070360024.0 », « 9.782070360024E+12 »), zéro de tête perdu d'un ISBN-10.
+Une notation scientifique tronquée (« 9.78207e+12 ») a perdu des chiffres :
+elle est rejetée plutôt que devinée.
+"""
+import re
+
+# ==============================
+# CONFIG
+# ==============================
+# chiffres (partie entière, décimales, exposant) d'un nombre écrit par un tableur
+FLOAT_PATTERN = r"^(\d+)(?:\.(\d*))?(?:E\+?(\d+))?$"
+ISBN10_PATTERN = r"\d{9}[\dX]"
+ISBN13_PATTERN = r"97[89]\d{10}"
+LABEL_PATTERN = r"^ISBN(?:-1[03])?:?\s*"   # libellé « ISBN-13: » retiré avant les chiffres
+
+# ==============================
+# CLÉS DE CONTRÔLE (numpy, une ligne par code)
+# ==============================
+def digit_matrix(codes, width):
+    """Codes ASCII de longueur `width` -> matrice d'entiers ('X' -> 10)"""
+    import numpy as np
+
+    matrix = np.frombuffer("".join(codes).encode("ascii"), dtype=np.uint8).reshape(-1, width).astype(np.int64) - 48
+    matrix[matrix == ord("X") - 48] = 10
+    return matrix
+
+def ean_weights(width):
+    import numpy as np
+
+    return np.resize([1, 3], width)
+
+def isbn10_valid(codes):
+    import numpy as np
+
+    return digit_matrix(codes, 10) @ np.arange(10, 0, -1) % 11 == 0
+
+def isbn13_valid(codes):
+    return digit_matrix(codes, 13) @ ean_weights(13) % 10 == 0
+
+def ean_check_digits(codes):
+    """Clé EAN-13 de codes de 12 chiffres"""
+    return (10 - digit_matrix(codes, 12) @ ean_weights(12) % 10) % 10
+
+# ==============================
+# NORMALISATION
+# ==============================
+def recover_floats(text):
+    """
+    « 9782070360024.0 », « 9.782070360024E+12 » -> chiffres entiers.
+    Notation scientifique dont la mantisse n'a pas tous les chiffres -> manquant.
+    """
+    import pandas as pd
+
+    candidates = text.str.contains(r"[.E]").fillna(False)
+    if not candidates.any():
+        return text
+    parts = text[candidates].str.extract(FLOAT_PATTERN)
+    parts = parts[parts[0].notna() & (parts[1].notna() | parts[2].notna())]
+    if parts.empty:
+        return text
+
+    number = pd.to_numeric(text[parts.index], errors="coerce")
+    whole = number.notna() & (number % 1 == 0) & (number < 1e13)
+    digits = number.where(whole, 0).astype("int64").astype(str)
+    significant = (parts[0] + parts[1].fillna("")).str.lstrip("0").str.len()
+    scientific = parts[2].notna()
+    truncated = scientific & (significant < digits.str.len())
+
+    # « 978.2070360024 » n'est pas un flottant abîmé : laissé aux séparateurs
+    text = text.mask((whole & ~truncated).reindex(text.index, fill_value=False), digits)
+    return text.mask((scientific & (~whole | truncated)).reindex(text.index, fill_value=False), None)
+
+def canonical_isbns(values):
+    """
+    Colonne de codes (textes, nombres, None) -> Series d'ISBN-13 canoniques
+    (object, None si illisible), même index qu'une Series reçue.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if not isinstance(values, pd.Series):
+        values = pd.Series(list(values), dtype=object)
+    text = values.astype(str).str.strip().str.upper().str.replace(LABEL_PATTERN, "", regex=True)
+    text = recover_floats(text)
+
+    code = text.str.replace(r"[^0-9X]", "", regex=True)
+    code = code.mask(code.str.fullmatch(r"\d{9}").fillna(False), "0" + code)   # zéro de tête perdu
+
+    result = pd.Series(None, index=values.index, dtype=object)
+
+    is13 = code.str.fullmatch(ISBN13_PATTERN).fillna(False).to_numpy(dtype=bool)
+    if is13.any():
+        codes = code[is13]
+        result[is13] = codes.where(isbn13_valid(codes.tolist()), None).astype(object)
+
+    is10 = code.str.fullmatch(ISBN10_PATTERN).fillna(False).to_numpy(dtype=bool)
+    if is10.any():
+        codes = code[is10]
+        core = "978" + codes.str[:9]
+        converted = core + ean_check_digits(core.tolist()).astype(str)
+        result[is10] = converted.where(isbn10_valid(codes.tolist()), None).astype(object)
+
+    return result.where(result.notna(), None)
+
+def canonical_isbn(value):
+    """Un seul code (saisie, scan) -> ISBN-13 canonique ou None"""
+    if isinstance(value, str) and re.fullmatch(ISBN13_PATTERN, value):
+        # Cas courant (code scanné, ISBN déjà en base) : sans pandas
+        return value if sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(value)) % 10 == 0 else None
+    return canonical_isbns([value]).iloc[0]
@@ -0,0 +1,311 @@
+import importlib
+import json
+import os
+import socket
+import threading
+import time
+import traceback
+
+# ==============================
+# CONFIG
+# ==============================
+# kind -> "module:fonction" ; importés à la première exécution seulement.
+# La fonction reçoit un Job et retourne un résultat sérialisable en JSON.
+# Elle doit être idempotente : reprendre un job = le relancer depuis le début.
+HANDLERS = {
+    "csv_import": "csv_import:run_job",
+    "excel_import": "import_excel:run_job",
+    "enrich": "enrich:run_job",
+}
+
+PROGRESS_EVERY = 1000       # enregistrements entre deux mises à jour de la progression
+PROGRESS_INTERVAL = 0.5     # ... ou secondes
+POLL_INTERVAL = 1.0         # jobs soumis par un autre process
+FILES_DIRNAME = "jobs"      # fichiers déposés pour les jobs, à côté de la base
+
+ACTIVE = ("queued", "running")
+FINISHED = ("done", "failed", "cancelled")
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+class JobCancelled(Exception):
+    """Levée par Job.progress() quand une annulation a été demandée"""
+
+# ==============================
+# JOB (vu par le handler)
+# ==============================
+# Avancement des jobs exécutés par ce process : visible tout de suite, même
+# quand le handler est au milieu d'une transaction d'écriture (table jobs
+# alors verrouillée pour lui-même).
+_live = {}            # job_id -> {"done", "total", "message"}
+_cancelled = set()    # annulations demandées pour ces jobs
+_live_lock = threading.Lock()
+
+class Job:
+    def __init__(self, pool, job_id, kind, params, on_progress=None):
+        self.pool = pool
+        self.id = job_id
+        self.kind = kind
+        self.params = params
+        self.on_progress = on_progress
+        self._last_done = 0
+        self._last_time = 0.0
+        with _live_lock:
+            _live[job_id] = {"done": 0, "total": None, "message": None}
+
+    def _update(self, done, total, message):
+        with _live_lock:
+            live = _live[self.id]
+            live["done"] = done
+            if total is not None:
+                live["total"] = total
+            if message is not None:
+                live["message"] = message
+            cancelled = self.id in _cancelled
+        if self.on_progress:
+            self.on_progress(done, total)
+        return cancelled
+
+    def _due(self, done, total):
+        now = time.monotonic()
+        if done == total or done - self._last_done >= PROGRESS_EVERY or now - self._last_time >= PROGRESS_INTERVAL:
+            self._last_done, self._last_time = done, now
+            return True
+        return False
+
+    def progress(self, done, total=None, message=None):
+        """
+        Avancement, enregistré dans la table jobs au plus tous les PROGRESS_EVERY
+        enregistrements ou PROGRESS_INTERVAL secondes. Lève JobCancelled si le job
+        est annulé. À appeler hors transaction d'écriture (sinon : tick()).
+        """
+        cancelled = self._update(done, total, message)
+        if not cancelled and self._due(done, total):
+            with self.pool.writer(versioned=False) as conn:
+                cancelled = conn.execute(
+                    """
+                    UPDATE jobs SET done = ?, total = COALESCE(?, total), message = COALESCE(?, message)
+                    WHERE id = ?
+                    RETURNING cancel_requested
+                    """,
+                    (done, total, message, self.id),
+                ).fetchone()[0]
+        if cancelled:
+            raise JobCancelled()
+
+    def tick(self, done, total=None, message=None):
+        """Comme progress(), mais sans écrire : utilisable pendant une transaction d'écriture"""
+        cancelled = self._update(done, total, message)
+        if not cancelled and self._due(done, total):
+            with self.pool.reader() as conn:
+                cancelled = conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (self.id,)).fetchone()[0]
+        if cancelled:
+            raise JobCancelled()
+
+    def close(self):
+        with _live_lock:
+            _live.pop(self.id, None)
+            _cancelled.discard(self.id)
+
+def files_dir(pool):
+    path = pool.path.parent / FILES_DIRNAME
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+# ==============================
+# TABLE JOBS
+# ==============================
+def submit(pool, kind, params):
+    """Met un job en file ; retourne son id"""
+    if kind not in HANDLERS:
+        raise ValueError(f"Type de job inconnu : {kind}")
+    with pool.writer(versioned=False) as conn:
+        job_id = conn.execute(
+            "INSERT INTO jobs (kind, params, created_at) VALUES (?, ?, ?)",
+            (kind, json.dumps(params), time.time()),
+        ).lastrowid
+    Runner.wake_all()
+    return job_id
+
+def _as_dict(cursor, row):
+    job = {col[0]: value for col, value in zip(cursor.description, row)}
+    for key in ("params", "result"):
+        if job.get(key):
+            job[key] = json.loads(job[key])
+    return job
+
+def _with_live(job):
+    with _live_lock:
+        live = _live.get(job["id"])
+        if live and job["status"] == "running":
+            job.update({k: v for k, v in live.items() if v is not None})
+    return job
+
+def get(pool, job_id):
+    with pool.reader() as conn:
+        cur = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        row = cur.fetchone()
+        return _with_live(_as_dict(cur, row)) if row else None
+
+def recent(pool, limit=10):
+    with pool.reader() as conn:
+        cur = conn.execute("SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,))
+        return [_with_live(_as_dict(cur, row)) for row in cur.fetchall()]
+
+def cancel(pool, job_id):
+    """Un job en file est annulé tout de suite, un job en cours au prochain progress() / tick()"""
+    with _live_lock:
+        if job_id in _live:
+            # Exécuté ici : peut détenir le verrou d'écriture, pas d'attente
+            _cancelled.add(job_id)
+            return
+    with pool.writer(versioned=False) as conn:
+        conn.execute(
+            "UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE id = ? AND status = 'queued'",
+            (time.time(), job_id),
+        )
+        conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = 'running'", (job_id,))
+
+def resume(pool, job_id):
+    """Remet en file un job annulé ou en échec"""
+    with pool.writer(versioned=False) as conn:
+        conn.execute(
+            """
+            UPDATE jobs
+            SET status = 'queued', cancel_requested = 0, error = NULL, message = 'Reprise',
+                started_at = NULL, finished_at = NULL
+            WHERE id = ? AND status IN ('cancelled', 'failed')
+            """,
+            (job_id,),
+        )
+    Runner.wake_all()
+
+def requeue_interrupted(pool):
+    """Jobs 'running' d'un process de cette machine qui n'existe plus -> de nouveau en file"""
+    host = socket.gethostname()
+    with pool.writer(versioned=False) as conn:
+        rows = conn.execute("SELECT id, worker FROM jobs WHERE status = 'running'").fetchall()
+        dead = [job_id for job_id, worker in rows if _is_dead(worker, host)]
+        conn.executemany(
+            "UPDATE jobs SET status = 'queued', message = 'Interrompu, relancé' WHERE id = ?",
+            [(job_id,) for job_id in dead],
+        )
+    return dead
+
+def _is_dead(worker, host):
+    worker_host, _, pid = (worker or "").rpartition(":")
+    if worker_host != host or not pid.isdigit():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        return False
+    return False
+
+def _claim(pool):
+    """Passe le plus ancien job 'queued' en 'running' ; (id, kind, params) ou None"""
+    with pool.writer(versioned=False) as conn:
+        row = conn.execute(
+            """
+            UPDATE jobs SET status = 'running', worker = ?, started_at = ?, cancel_requested = 0
+            WHERE id = (SELECT id FROM jobs WHERE status = 'queued' ORDER BY id LIMIT 1)
+            RETURNING id, kind, params
+            """,
+            (WORKER_ID, time.time()),
+        ).fetchone()
+    return (row[0], row[1], json.loads(row[2])) if row else None
+
+def execute(pool, claimed, on_progress=None):
+    """Exécute un job réclamé et enregistre son issue ; retourne le statut final"""
+    job_id, kind, params = claimed
+    module, _, name = HANDLERS[kind].partition(":")
+    job = Job(pool, job_id, kind, params, on_progress)
+    try:
+        result = getattr(importlib.import_module(module), name)(job)
+    except JobCancelled:
+        status, result, error = "cancelled", None, None
+    except Exception as e:
+        status, result, error = "failed", None, f"{e}\n{traceback.format_exc(limit=5)}"
+    else:
+        status, error = "done", None
+    # Progression finale enregistrée avant de retirer l'état en mémoire
+    with _live_lock:
+        live = dict(_live[job_id])
+    with pool.writer(versioned=False) as conn:
+        conn.execute(
+            """
+            UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?,
+                   done = ?, total = COALESCE(?, total), message = COALESCE(?, message)
+            WHERE id = ?
+            """,
+            (status, json.dumps(result) if result is not None else None, error, time.time(),
+             live["done"], live["total"], live["message"], job_id),
+        )
+    job.close()
+    return status
+
+def run(pool, kind, params, on_progress=None):
+    """
+    Crée un job et l'exécute dans le thread courant (scripts en ligne de commande) ;
+    retourne le job terminé. Inséré déjà 'running' : aucun Runner ne peut le réclamer.
+    """
+    if kind not in HANDLERS:
+        raise ValueError(f"Type de job inconnu : {kind}")
+    now = time.time()
+    with pool.writer(versioned=False) as conn:
+        job_id = conn.execute(
+            """
+            INSERT INTO jobs (kind, params, status, worker, created_at, started_at)
+            VALUES (?, ?, 'running', ?, ?, ?)
+            """,
+            (kind, json.dumps(params), WORKER_ID, now, now),
+        ).lastrowid
+    execute(pool, (job_id, kind, params), on_progress)
+    return get(pool, job_id)
+
+# ==============================
+# RUNNER (threads de fond)
+# ==============================
+class Runner:
+    """
+    `workers` threads démons qui exécutent les jobs en file, dans l'ordre.
+    Un seul runner par process suffit (voir app.get_runner).
+    """
+
+    _instances = []
+
+    def __init__(self, pool, workers=1):
+        self.pool = pool
+        self.workers = workers
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+        Runner._instances.append(self)
+
+    @classmethod
+    def wake_all(cls):
+        for runner in cls._instances:
+            runner._wake.set()
+
+    def start(self):
+        requeue_interrupted(self.pool)
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._loop, name=f"bliblio-job-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            claimed = _claim(self.pool)
+            if claimed is None:
+                self._wake.wait(POLL_INTERVAL)
+                self._wake.clear()
+                continue
+            execute(self.pool, claimed)
@@ -0,0 +1,51 @@
+-- Schéma d'origine. IF NOT EXISTS : s'applique aussi aux bases
+-- créées avant l'introduction des migrations (user_version = 0).
+
+CREATE TABLE IF NOT EXISTS books (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    owner TEXT NOT NULL,
+    format TEXT,
+    author TEXT NOT NULL,
+    title TEXT NOT NULL,
+    language TEXT,
+    isbn TEXT,
+    publisher TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Liste complète : pagination par clé (created_at, id)
+CREATE INDEX IF NOT EXISTS idx_books_created_at_id
+ON books (created_at, id);
+
+-- Compteur de modifications, incrémenté à chaque écriture via le pool.
+-- Valeur de départ aléatoire : une base recréée ne reprend pas les
+-- versions (et donc les caches) de la précédente.
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (key, value)
+VALUES ('data_version', abs(random() % 1000000000000));
+
+-- Réponses Google Books / OpenLibrary normalisées (data NULL = introuvable)
+CREATE TABLE IF NOT EXISTS isbn_cache (
+    isbn TEXT PRIMARY KEY,
+    data TEXT,
+    fetched_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+
+-- Manifeste d'import : empreinte par fichier source et par ligne importée
+CREATE TABLE IF NOT EXISTS import_files (
+    source TEXT PRIMARY KEY,
+    file_hash TEXT NOT NULL,
+    rows INTEGER,
+    imported_at TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS import_rows (
+    source TEXT NOT NULL,
+    row_hash INTEGER NOT NULL,
+    book_id INTEGER,
+    PRIMARY KEY (source, row_hash)
+) WITHOUT ROWID;
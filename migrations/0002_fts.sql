@@ -0,0 +1,31 @@
+-- FTS5 - index plein texte
+-- Table externe (content='books') : l'index ne stocke que les tokens,
+-- les triggers le gardent synchronisé avec `books`.
+-- remove_diacritics 2 : "miserables" trouve "Les Misérables".
+
+CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+    title, author, publisher,
+    content='books',
+    content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS books_fts_ai AFTER INSERT ON books BEGIN
+    INSERT INTO books_fts (rowid, title, author, publisher)
+    VALUES (new.id, new.title, new.author, new.publisher);
+END;
+
+CREATE TRIGGER IF NOT EXISTS books_fts_ad AFTER DELETE ON books BEGIN
+    INSERT INTO books_fts (books_fts, rowid, title, author, publisher)
+    VALUES ('delete', old.id, old.title, old.author, old.publisher);
+END;
+
+CREATE TRIGGER IF NOT EXISTS books_fts_au AFTER UPDATE OF title, author, publisher ON books BEGIN
+    INSERT INTO books_fts (books_fts, rowid, title, author, publisher)
+    VALUES ('delete', old.id, old.title, old.author, old.publisher);
+    INSERT INTO books_fts (rowid, title, author, publisher)
+    VALUES (new.id, new.title, new.author, new.publisher);
+END;
+
+-- Livres déjà présents
+INSERT INTO books_fts (books_fts) VALUES ('rebuild');
@@ -0,0 +1,13 @@
+"""Colonnes lu / gardé après lecture (écrites par import_excel)."""
+
+COLUMNS = {
+    "read": "INTEGER NOT NULL DEFAULT 0",
+    "kept_after_reading": "INTEGER NOT NULL DEFAULT 1",
+}
+
+def migrate(conn):
+    # Certaines bases créées avant les migrations les ont déjà
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(books)")}
+    for name, definition in COLUMNS.items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE books ADD COLUMN {name} {definition}")
@@ -0,0 +1,25 @@
+-- Clé normalisée (casse / espaces) propriétaire + auteur + titre.
+-- Expression identique à db.BOOK_KEY.
+ALTER TABLE books ADD COLUMN book_key TEXT
+GENERATED ALWAYS AS (lower(trim(owner)) || char(31) || lower(trim(author)) || char(31) || lower(trim(title))) VIRTUAL;
+
+-- Doublons existants : on garde le premier livre saisi
+UPDATE import_rows SET book_id = NULL
+WHERE book_id NOT IN (SELECT MIN(id) FROM books GROUP BY book_key);
+
+DELETE FROM books
+WHERE id NOT IN (SELECT MIN(id) FROM books GROUP BY book_key);
+
+-- Détection des doublons : recherche dans l'index unique
+CREATE UNIQUE INDEX IF NOT EXISTS idx_books_book_key
+ON books (book_key);
+
+-- Tri et filtre par propriétaire, couvrant pour la liste triée
+CREATE INDEX IF NOT EXISTS idx_books_owner_author_title
+ON books (owner, author, title);
+
+CREATE INDEX IF NOT EXISTS idx_books_format
+ON books (format);
+
+CREATE INDEX IF NOT EXISTS idx_books_isbn
+ON books (isbn);
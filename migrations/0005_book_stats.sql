@@ -0,0 +1,73 @@
+-- Statistiques matérialisées pour la barre latérale.
+-- Une ligne par (kind, a, b) ; n tenu à jour par triggers, lu sans agrégat.
+--   total                     ('', '')
+--   owner / format / language (valeur, '')
+--   reading                   (read, kept_after_reading)
+--   format_owner              (format, owner)
+--   month                     ('AAAA-MM' de created_at, '')
+-- Les compteurs à 0 sont conservés (pas de DELETE dans les triggers) :
+-- à filtrer à la lecture.
+
+CREATE TABLE book_stats (
+    kind TEXT NOT NULL,
+    a TEXT NOT NULL,
+    b TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    PRIMARY KEY (kind, a, b)
+) WITHOUT ROWID;
+
+INSERT INTO book_stats (kind, a, b, n)
+SELECT 'total', '', '', COUNT(*) FROM books GROUP BY 2, 3
+UNION ALL
+SELECT 'owner', books.owner, '', COUNT(*) FROM books GROUP BY 2, 3
+UNION ALL
+SELECT 'format', COALESCE(books.format, ''), '', COUNT(*) FROM books GROUP BY 2, 3
+UNION ALL
+SELECT 'language', COALESCE(books.language, ''), '', COUNT(*) FROM books GROUP BY 2, 3
+UNION ALL
+SELECT 'reading', books.read, books.kept_after_reading, COUNT(*) FROM books GROUP BY 2, 3
+UNION ALL
+SELECT 'format_owner', COALESCE(books.format, ''), books.owner, COUNT(*) FROM books GROUP BY 2, 3
+UNION ALL
+SELECT 'month', COALESCE(strftime('%Y-%m', books.created_at), ''), '', COUNT(*) FROM books GROUP BY 2, 3;
+
+CREATE TRIGGER book_stats_ai AFTER INSERT ON books BEGIN
+    INSERT INTO book_stats (kind, a, b, n) VALUES
+        ('total', '', '', 1),
+        ('owner', new.owner, '', 1),
+        ('format', COALESCE(new.format, ''), '', 1),
+        ('language', COALESCE(new.language, ''), '', 1),
+        ('reading', new.read, new.kept_after_reading, 1),
+        ('format_owner', COALESCE(new.format, ''), new.owner, 1),
+        ('month', COALESCE(strftime('%Y-%m', new.created_at), ''), '', 1)
+    ON CONFLICT (kind, a, b) DO UPDATE SET n = n + excluded.n;
+END;
+
+CREATE TRIGGER book_stats_ad AFTER DELETE ON books BEGIN
+    INSERT INTO book_stats (kind, a, b, n) VALUES
+        ('total', '', '', -1),
+        ('owner', old.owner, '', -1),
+        ('format', COALESCE(old.format, ''), '', -1),
+        ('language', COALESCE(old.language, ''), '', -1),
+        ('reading', old.read, old.kept_after_reading, -1),
+        ('format_owner', COALESCE(old.format, ''), old.owner, -1),
+        ('month', COALESCE(strftime('%Y-%m', old.created_at), ''), '', -1)
+    ON CONFLICT (kind, a, b) DO UPDATE SET n = n + excluded.n;
+END;
+
+CREATE TRIGGER book_stats_au AFTER UPDATE OF owner, format, language, read, kept_after_reading, created_at ON books BEGIN
+    INSERT INTO book_stats (kind, a, b, n) VALUES
+        ('owner', old.owner, '', -1),
+        ('format', COALESCE(old.format, ''), '', -1),
+        ('language', COALESCE(old.language, ''), '', -1),
+        ('reading', old.read, old.kept_after_reading, -1),
+        ('format_owner', COALESCE(old.format, ''), old.owner, -1),
+        ('month', COALESCE(strftime('%Y-%m', old.created_at), ''), '', -1),
+        ('owner', new.owner, '', 1),
+        ('format', COALESCE(new.format, ''), '', 1),
+        ('language', COALESCE(new.language, ''), '', 1),
+        ('reading', new.read, new.kept_after_reading, 1),
+        ('format_owner', COALESCE(new.format, ''), new.owner, 1),
+        ('month', COALESCE(strftime('%Y-%m', new.created_at), ''), '', 1)
+    ON CONFLICT (kind, a, b) DO UPDATE SET n = n + excluded.n;
+END;
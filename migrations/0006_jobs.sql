@@ -0,0 +1,21 @@
+-- Tâches de fond (imports, enrichissement) exécutées par jobs.Runner.
+-- status : queued -> running -> done | failed | cancelled
+-- Un job interrompu (process arrêté) repasse en queued au démarrage suivant.
+CREATE TABLE jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    done INTEGER NOT NULL DEFAULT 0,
+    total INTEGER,
+    message TEXT,
+    result TEXT,
+    error TEXT,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+
+CREATE INDEX idx_jobs_status ON jobs (status, id);
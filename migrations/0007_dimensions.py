@@ -0,0 +1,246 @@
+"""
+Propriétaires, formats et langues dans des tables de dimension ; books ne
+garde que leurs id (owner_id, format_id, language_id).
+
+Les valeurs existantes sont normalisées (« CAROLE » -> Carole, « fr » -> Fr...).
+La table books est reconstruite (SQLite ne change pas le type d'une colonne) :
+index, triggers FTS et compteurs book_stats sont recréés, les id conservés.
+Les livres devenus doublons (même propriétaire normalisé, même auteur / titre)
+sont fusionnés sur le premier saisi. Un propriétaire vide devient « Inconnu ».
+
+Migration figée : pas d'import du code de l'application, dont la
+normalisation peut évoluer après coup.
+"""
+UNKNOWN_OWNER = "Inconnu"
+
+def alias_key(value):
+    """Clé de rapprochement (copie de dimensions.alias_key à la date de la migration)"""
+    return " ".join(str(value).split()).casefold()
+
+# Valeurs d'origine et leurs synonymes (la casse et les espaces sont toujours ignorés)
+SEED = {
+    "owner": {"Axel": [], "Carole": [], "Nils": []},
+    "format": {
+        "Livre": ["livres", "roman", "book"],
+        "BD": ["bande dessinée", "bande dessinee", "bandes dessinées", "bandes dessinees"],
+        "Manga": ["mangas"],
+        "Comics": ["comic"],
+    },
+    "language": {
+        "Fr": ["fra", "fre", "français", "francais", "french"],
+        "Eng": ["en", "anglais", "english"],
+        "Esp": ["es", "spa", "espagnol", "spanish"],
+        "Deu": ["de", "ger", "allemand", "german"],
+        "Autre": [],
+    },
+}
+TABLES = {"owner": "owners", "format": "formats", "language": "languages"}
+
+SCHEMA = [
+    *(f"CREATE TABLE {table} (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE)" for table in TABLES.values()),
+    """
+    CREATE TABLE dimension_aliases (
+        dimension TEXT NOT NULL,
+        alias TEXT NOT NULL,
+        id INTEGER NOT NULL,
+        PRIMARY KEY (dimension, alias)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE books_new (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        owner_id INTEGER NOT NULL REFERENCES owners (id),
+        format_id INTEGER REFERENCES formats (id),
+        author TEXT NOT NULL,
+        title TEXT NOT NULL,
+        language_id INTEGER REFERENCES languages (id),
+        isbn TEXT,
+        publisher TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        read INTEGER NOT NULL DEFAULT 0,
+        kept_after_reading INTEGER NOT NULL DEFAULT 1,
+        book_key TEXT GENERATED ALWAYS AS (
+            owner_id || char(31) || lower(trim(author)) || char(31) || lower(trim(title))
+        ) VIRTUAL
+    )
+    """,
+]
+
+# Après le remplacement de books
+REBUILD = [
+    "CREATE INDEX idx_books_created_at_id ON books (created_at, id)",
+    "CREATE UNIQUE INDEX idx_books_book_key ON books (book_key)",
+    "CREATE INDEX idx_books_owner_author_title ON books (owner_id, author, title)",
+    "CREATE INDEX idx_books_format ON books (format_id)",
+    "CREATE INDEX idx_books_isbn ON books (isbn)",
+    # Lectures : noms à la place des id
+    """
+    CREATE VIEW books_named AS
+    SELECT b.id, b.owner_id, b.format_id, b.language_id,
+           o.name AS owner, f.name AS format, b.author, b.title, l.name AS language,
+           b.isbn, b.publisher, b.created_at, b.read, b.kept_after_reading
+    FROM books b
+    JOIN owners o ON o.id = b.owner_id
+    LEFT JOIN formats f ON f.id = b.format_id
+    LEFT JOIN languages l ON l.id = b.language_id
+    """,
+    # FTS (migrations/0002)
+    """
+    CREATE TRIGGER books_fts_ai AFTER INSERT ON books BEGIN
+        INSERT INTO books_fts (rowid, title, author, publisher)
+        VALUES (new.id, new.title, new.author, new.publisher);
+    END
+    """,
+    """
+    CREATE TRIGGER books_fts_ad AFTER DELETE ON books BEGIN
+        INSERT INTO books_fts (books_fts, rowid, title, author, publisher)
+        VALUES ('delete', old.id, old.title, old.author, old.publisher);
+    END
+    """,
+    """
+    CREATE TRIGGER books_fts_au AFTER UPDATE OF title, author, publisher ON books BEGIN
+        INSERT INTO books_fts (books_fts, rowid, title, author, publisher)
+        VALUES ('delete', old.id, old.title, old.author, old.publisher);
+        INSERT INTO books_fts (rowid, title, author, publisher)
+        VALUES (new.id, new.title, new.author, new.publisher);
+    END
+    """,
+    # book_stats (migrations/0005) : owner / format / language comptés par id
+    "DELETE FROM book_stats",
+    """
+    INSERT INTO book_stats (kind, a, b, n)
+    SELECT 'total', '', '', COUNT(*) FROM books GROUP BY 2, 3
+    UNION ALL
+    SELECT 'owner', books.owner_id, '', COUNT(*) FROM books GROUP BY 2, 3
+    UNION ALL
+    SELECT 'format', COALESCE(books.format_id, ''), '', COUNT(*) FROM books GROUP BY 2, 3
+    UNION ALL
+    SELECT 'language', COALESCE(books.language_id, ''), '', COUNT(*) FROM books GROUP BY 2, 3
+    UNION ALL
+    SELECT 'reading', books.read, books.kept_after_reading, COUNT(*) FROM books GROUP BY 2, 3
+    UNION ALL
+    SELECT 'format_owner', COALESCE(books.format_id, ''), books.owner_id, COUNT(*) FROM books GROUP BY 2, 3
+    UNION ALL
+    SELECT 'month', COALESCE(strftime('%Y-%m', books.created_at), ''), '', COUNT(*) FROM books GROUP BY 2, 3
+    """,
+    """
+    CREATE TRIGGER book_stats_ai AFTER INSERT ON books BEGIN
+        INSERT INTO book_stats (kind, a, b, n) VALUES
+            ('total', '', '', 1),
+            ('owner', new.owner_id, '', 1),
+            ('format', COALESCE(new.format_id, ''), '', 1),
+            ('language', COALESCE(new.language_id, ''), '', 1),
+            ('reading', new.read, new.kept_after_reading, 1),
+            ('format_owner', COALESCE(new.format_id, ''), new.owner_id, 1),
+            ('month', COALESCE(strftime('%Y-%m', new.created_at), ''), '', 1)
+        ON CONFLICT (kind, a, b) DO UPDATE SET n = n + excluded.n;
+    END
+    """,
+    """
+    CREATE TRIGGER book_stats_ad AFTER DELETE ON books BEGIN
+        INSERT INTO book_stats (kind, a, b, n) VALUES
+            ('total', '', '', -1),
+            ('owner', old.owner_id, '', -1),
+            ('format', COALESCE(old.format_id, ''), '', -1),
+            ('language', COALESCE(old.language_id, ''), '', -1),
+            ('reading', old.read, old.kept_after_reading, -1),
+            ('format_owner', COALESCE(old.format_id, ''), old.owner_id, -1),
+            ('month', COALESCE(strftime('%Y-%m', old.created_at), ''), '', -1)
+        ON CONFLICT (kind, a, b) DO UPDATE SET n = n + excluded.n;
+    END
+    """,
+    """
+    CREATE TRIGGER book_stats_au
+    AFTER UPDATE OF owner_id, format_id, language_id, read, kept_after_reading, created_at ON books BEGIN
+        INSERT INTO book_stats (kind, a, b, n) VALUES
+            ('owner', old.owner_id, '', -1),
+            ('format', COALESCE(old.format_id, ''), '', -1),
+            ('language', COALESCE(old.language_id, ''), '', -1),
+            ('reading', old.read, old.kept_after_reading, -1),
+            ('format_owner', COALESCE(old.format_id, ''), old.owner_id, -1),
+            ('month', COALESCE(strftime('%Y-%m', old.created_at), ''), '', -1),
+            ('owner', new.owner_id, '', 1),
+            ('format', COALESCE(new.format_id, ''), '', 1),
+            ('language', COALESCE(new.language_id, ''), '', 1),
+            ('reading', new.read, new.kept_after_reading, 1),
+            ('format_owner', COALESCE(new.format_id, ''), new.owner_id, 1),
+            ('month', COALESCE(strftime('%Y-%m', new.created_at), ''), '', 1)
+        ON CONFLICT (kind, a, b) DO UPDATE SET n = n + excluded.n;
+    END
+    """,
+]
+
+def seed(conn):
+    """{dimension: {clé d'alias: id}} des valeurs d'origine"""
+    known = {}
+    for kind, values in SEED.items():
+        known[kind] = {}
+        for name, synonyms in values.items():
+            value_id = conn.execute(f"INSERT INTO {TABLES[kind]} (name) VALUES (?)", (name,)).lastrowid
+            for alias in {alias_key(name), *map(alias_key, synonyms)}:
+                known[kind][alias] = value_id
+    return known
+
+def migrate(conn):
+    for statement in SCHEMA:
+        conn.execute(statement)
+    known = seed(conn)
+
+    # Valeurs déjà saisies -> id (les inconnues deviennent des entrées)
+    conn.execute("CREATE TEMP TABLE dimension_values (dimension TEXT, value TEXT, id INTEGER, PRIMARY KEY (dimension, value))")
+    for kind, table in TABLES.items():
+        for (value,) in conn.execute(f"SELECT DISTINCT {kind} FROM books WHERE trim(COALESCE({kind}, '')) != ''").fetchall():
+            key = alias_key(value)
+            if key not in known[kind]:
+                name = " ".join(str(value).split())
+                known[kind][key] = conn.execute(f"INSERT INTO {table} (name) VALUES (?)", (name,)).lastrowid
+            conn.execute("INSERT INTO dimension_values VALUES (?, ?, ?)", (kind, value, known[kind][key]))
+    # owner_id est obligatoire : les livres sans propriétaire vont à « Inconnu »
+    unknown_id = None
+    if conn.execute("SELECT 1 FROM books WHERE trim(COALESCE(owner, '')) = '' LIMIT 1").fetchone():
+        key = alias_key(UNKNOWN_OWNER)
+        if key not in known["owner"]:
+            known["owner"][key] = conn.execute("INSERT INTO owners (name) VALUES (?)", (UNKNOWN_OWNER,)).lastrowid
+        unknown_id = known["owner"][key]
+    conn.executemany(
+        "INSERT INTO dimension_aliases (dimension, alias, id) VALUES (?, ?, ?)",
+        [(kind, alias, value_id) for kind, aliases in known.items() for alias, value_id in aliases.items()],
+    )
+
+    conn.execute("""
+        INSERT INTO books_new (
+            id, owner_id, format_id, author, title, language_id,
+            isbn, publisher, created_at, read, kept_after_reading
+        )
+        SELECT b.id, COALESCE(o.id, ?), f.id, b.author, b.title, l.id,
+               b.isbn, b.publisher, b.created_at, b.read, b.kept_after_reading
+        FROM books b
+        LEFT JOIN dimension_values o ON o.dimension = 'owner' AND o.value = b.owner
+        LEFT JOIN dimension_values f ON f.dimension = 'format' AND f.value = b.format
+        LEFT JOIN dimension_values l ON l.dimension = 'language' AND l.value = b.language
+        ORDER BY b.id
+    """, (unknown_id,))
+    # Deux saisies d'un même propriétaire (« Jean  Pierre » / « jean pierre ») ont
+    # désormais le même id : doublons de book_key, on garde le premier livre saisi (cf. 0004)
+    conn.execute("""
+        UPDATE import_rows SET book_id = NULL
+        WHERE book_id NOT IN (SELECT MIN(id) FROM books_new GROUP BY book_key)
+    """)
+    merged = conn.execute("DELETE FROM books_new WHERE id NOT IN (SELECT MIN(id) FROM books_new GROUP BY book_key)").rowcount
+
+    # AUTOINCREMENT : pas de réutilisation des id de livres déjà supprimés
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'books'").fetchone()
+    conn.execute("DROP TABLE temp.dimension_values")
+    conn.execute("DROP TABLE books")
+    conn.execute("ALTER TABLE books_new RENAME TO books")
+    conn.execute("DELETE FROM sqlite_sequence WHERE name = 'books'")
+    conn.execute(
+        "INSERT INTO sqlite_sequence (name, seq) SELECT 'books', MAX(?, COALESCE(MAX(id), 0)) FROM books",
+        (row[0] if row else 0,),
+    )
+
+    for statement in REBUILD:
+        conn.execute(statement)
+    if merged:
+        # Livres supprimés hors triggers : index plein texte reconstruit
+        conn.execute("INSERT INTO books_fts (books_fts) VALUES ('rebuild')")
@@ -0,0 +1,66 @@
+"""
+ISBN canoniques (isbns.py : ISBN-13 sans séparateurs) et index unique partiel
+(isbn, owner_id) : « ai-je déjà ce livre ? » devient une recherche dans l'index.
+
+Un même ISBN peut appartenir à plusieurs propriétaires, pas deux fois au même.
+Les ISBN existants sont réécrits ; un code illisible est effacé (l'enrichissement
+le retrouvera par titre / auteur), un ISBN déjà porté par un livre plus ancien
+du même propriétaire aussi (doublon : voir dedupe.py).
+
+Migration figée : la lecture des codes est copiée ici (isbns.py à la date de la
+migration, en Python pur) plutôt qu'importée, isbns.py pouvant évoluer après coup.
+"""
+import re
+
+FLOAT_PATTERN = r"^(\d+)(?:\.(\d*))?(?:E\+?(\d+))?$"
+ISBN10_PATTERN = r"\d{9}[\dX]"
+ISBN13_PATTERN = r"97[89]\d{10}"
+LABEL_PATTERN = r"^ISBN(?:-1[03])?:?\s*"
+
+def recover_float(text):
+    """« 9782070360024.0 », « 9.782070360024E+12 » -> chiffres ; notation scientifique tronquée -> None"""
+    parts = re.match(FLOAT_PATTERN, text)
+    if not parts or (parts[2] is None and parts[3] is None):
+        return text
+    number = float(text)
+    whole = number % 1 == 0 and number < 1e13
+    digits = str(int(number)) if whole else ""
+    scientific = parts[3] is not None
+    if scientific and (not whole or len((parts[1] + (parts[2] or "")).lstrip("0")) < len(digits)):
+        return None
+    return digits if whole else text
+
+def ean_check_digit(code):
+    return (10 - sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(code)) % 10) % 10
+
+def canonical_isbn(value):
+    """Code saisi -> ISBN-13 sans séparateurs, ou None si illisible"""
+    text = recover_float(re.sub(LABEL_PATTERN, "", str(value).strip().upper()))
+    if text is None:
+        return None
+    code = re.sub(r"[^0-9X]", "", text)
+    if re.fullmatch(r"\d{9}", code):
+        code = "0" + code   # zéro de tête perdu
+    if re.fullmatch(ISBN13_PATTERN, code):
+        return code if ean_check_digit(code[:12]) == int(code[12]) else None
+    if re.fullmatch(ISBN10_PATTERN, code):
+        digits = [10 if d == "X" else int(d) for d in code]
+        if sum(d * w for d, w in zip(digits, range(10, 0, -1))) % 11 == 0:
+            return "978" + code[:9] + str(ean_check_digit("978" + code[:9]))
+    return None
+
+def migrate(conn):
+    rows = conn.execute("SELECT id, owner_id, isbn FROM books WHERE isbn IS NOT NULL ORDER BY id").fetchall()
+    seen = set()
+    updates = []
+    for book_id, owner_id, raw in rows:
+        isbn = canonical_isbn(raw)
+        if isbn is not None and (isbn, owner_id) in seen:
+            isbn = None
+        seen.add((isbn, owner_id))
+        if isbn != raw:
+            updates.append((isbn, book_id))
+    conn.executemany("UPDATE books SET isbn = ? WHERE id = ?", updates)
+
+    conn.execute("DROP INDEX idx_books_isbn")
+    conn.execute("CREATE UNIQUE INDEX idx_books_isbn ON books (isbn, owner_id) WHERE isbn IS NOT NULL")
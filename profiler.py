@@ -0,0 +1,272 @@
+"""
+Profilage des chemins critiques : requêtes SQLite et appels HTTP sortants.
+
+Activé par BLIBLIO_PROFILE=1 (sinon aucune connexion n'est instrumentée,
+coût nul). Pour chaque instruction : nombre d'exécutions, temps total et
+max (exécution + lecture des lignes), lignes retournées. Une instruction
+plus lente que SLOW_MS voit son EXPLAIN QUERY PLAN capturé une fois ;
+les parcours complets de table y sont signalés.
+
+Les mesures sont cumulées pour le process et, si une trace est ouverte
+dans le thread courant (begin / end : un rerun Streamlit, une requête API),
+pour cette trace.
+"""
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+# ==============================
+# CONFIG
+# ==============================
+ENABLED = os.environ.get("BLIBLIO_PROFILE", "") not in ("", "0")
+SLOW_MS = float(os.environ.get("BLIBLIO_SLOW_MS", 50))
+RECENT_TRACES = 20
+LABEL_LENGTH = 300
+
+_lock = threading.Lock()
+_totals = {}                            # (kind, label) -> stat
+_plans = {}                             # libellé sql -> {"plan": [...], "scan": bool}
+_recent = deque(maxlen=RECENT_TRACES)   # traces terminées, plus récentes à la fin
+_local = threading.local()
+
+# ==============================
+# ENREGISTREMENT
+# ==============================
+def new_stat(kind, label):
+    return {"kind": kind, "label": label, "count": 0, "total": 0.0, "max": 0.0, "rows": 0}
+
+def _add(stats, key, elapsed, rows, call_elapsed, new_call):
+    stat = stats.get(key)
+    if stat is None:
+        stat = stats[key] = new_stat(*key)
+    stat["count"] += new_call
+    stat["total"] += elapsed
+    stat["rows"] += rows
+    stat["max"] = max(stat["max"], call_elapsed)
+
+def record(kind, label, elapsed, rows=0, call_elapsed=None, new_call=True):
+    """
+    Ajoute une mesure. `call_elapsed` = durée cumulée de l'appel en cours
+    (exécution + lectures déjà faites), pour le max ; par défaut `elapsed`.
+    """
+    key = (kind, label)
+    call_elapsed = elapsed if call_elapsed is None else call_elapsed
+    trace = getattr(_local, "trace", None)
+    with _lock:
+        _add(_totals, key, elapsed, rows, call_elapsed, new_call)
+        if trace is not None:
+            _add(trace.stats, key, elapsed, rows, call_elapsed, new_call)
+
+@contextmanager
+def span(kind, label):
+    """Chronomètre un bloc de code (ex. une recherche ISBN complète, cache compris)"""
+    if not ENABLED:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(kind, label, time.perf_counter() - t0)
+
+# ==============================
+# TRACES (un rerun, une requête)
+# ==============================
+class Trace:
+    def __init__(self, name):
+        self.name = name
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        self.duration = None
+        self.stats = {}
+
+    def as_dict(self):
+        with _lock:
+            stats = [dict(s) for s in self.stats.values()]
+        return {
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration": self.duration if self.duration is not None else time.perf_counter() - self.started,
+            "stats": sorted((with_plan(s) for s in stats), key=lambda s: -s["total"]),
+        }
+
+def begin(name):
+    """Ouvre une trace pour le thread courant (None si le profilage est désactivé)"""
+    if not ENABLED:
+        return None
+    trace = _local.trace = Trace(name)
+    return trace
+
+def end(trace):
+    if trace is None:
+        return
+    trace.duration = time.perf_counter() - trace.started
+    if getattr(_local, "trace", None) is trace:
+        _local.trace = None
+    with _lock:
+        _recent.append(trace)
+
+# ==============================
+# PLANS D'EXÉCUTION
+# ==============================
+def is_full_scan(detail):
+    """« SCAN books » : table parcourue en entier (pas d'index, pas de table virtuelle FTS)"""
+    return (
+        detail.startswith("SCAN ")
+        and " USING " not in detail
+        and "VIRTUAL TABLE" not in detail
+        and "CONSTANT ROW" not in detail
+    )
+
+def capture_plan(conn, label, sql, parameters):
+    with _lock:
+        if label in _plans:
+            return
+        _plans[label] = None   # une seule capture, même en concurrence
+    try:
+        # Connection.execute de base : la requête EXPLAIN n'est pas elle-même mesurée
+        rows = sqlite3.Connection.execute(conn, f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()
+        plan = [detail for _, _, _, detail in rows]
+    except sqlite3.Error as e:
+        plan = [f"indisponible : {e}"]
+    with _lock:
+        _plans[label] = {"plan": plan, "scan": any(is_full_scan(d) for d in plan)}
+
+def with_plan(stat):
+    plan = _plans.get(stat["label"]) if stat["kind"] == "sql" else None
+    if plan:
+        stat.update(plan)
+    return stat
+
+# ==============================
+# SQLITE
+# ==============================
+def statement_label(sql):
+    return re.sub(r"\s+", " ", sql).strip()[:LABEL_LENGTH]
+
+class Cursor(sqlite3.Cursor):
+    """Curseur mesuré : exécution et lectures comptées pour la même instruction"""
+
+    _label = None
+    _sql = None
+    _params = ()
+    _elapsed = 0.0
+
+    def _account(self, elapsed, rows, new_call=False):
+        self._elapsed += elapsed
+        record("sql", self._label, elapsed, rows, self._elapsed, new_call)
+        if self._elapsed * 1000 >= SLOW_MS and self._label not in _plans:
+            capture_plan(self.connection, self._label, self._sql, self._params)
+
+    def execute(self, sql, parameters=()):
+        self._label, self._sql, self._params, self._elapsed = statement_label(sql), sql, parameters, 0.0
+        t0 = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            affected = self.rowcount if self.description is None and self.rowcount > 0 else 0
+            self._account(time.perf_counter() - t0, affected, new_call=True)
+
+    def executemany(self, sql, seq_of_parameters):
+        self._label, self._sql, self._params, self._elapsed = statement_label(sql), sql, (), 0.0
+        t0 = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            # Pas de plan : les paramètres d'une seule ligne ne sont plus disponibles
+            self._elapsed += time.perf_counter() - t0
+            record("sql", self._label, self._elapsed, max(self.rowcount, 0))
+
+    def executescript(self, sql_script):
+        t0 = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            record("sql", statement_label(sql_script), time.perf_counter() - t0)
+
+    def fetchone(self):
+        t0 = time.perf_counter()
+        row = super().fetchone()
+        self._account(time.perf_counter() - t0, row is not None)
+        return row
+
+    def fetchmany(self, size=None):
+        t0 = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._account(time.perf_counter() - t0, len(rows))
+        return rows
+
+    def fetchall(self):
+        t0 = time.perf_counter()
+        rows = super().fetchall()
+        self._account(time.perf_counter() - t0, len(rows))
+        return rows
+
+    def __next__(self):
+        t0 = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._account(time.perf_counter() - t0, 0)
+            raise
+        self._account(time.perf_counter() - t0, 1)
+        return row
+
+class Connection(sqlite3.Connection):
+    """Toutes les requêtes passent par un Cursor mesuré"""
+
+    def cursor(self, factory=Cursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+def connection_factory():
+    """Classe à passer à sqlite3.connect(factory=...)"""
+    return Connection if ENABLED else sqlite3.Connection
+
+# ==============================
+# HTTP (requests)
+# ==============================
+def _on_response(response, *args, **kwargs):
+    url = urlsplit(response.request.url)
+    label = f"{response.request.method} {url.scheme}://{url.netloc}{url.path} -> {response.status_code}"
+    record("http", label, response.elapsed.total_seconds())
+
+def instrument_session(session):
+    """Mesure chaque réponse d'une requests.Session (temps jusqu'aux en-têtes)"""
+    if ENABLED:
+        session.hooks["response"].append(_on_response)
+    return session
+
+# ==============================
+# LECTURE
+# ==============================
+def snapshot():
+    """État complet, sérialisable en JSON"""
+    with _lock:
+        totals = [dict(s) for s in _totals.values()]
+        recent = list(_recent)
+    return {
+        "enabled": ENABLED,
+        "slow_ms": SLOW_MS,
+        "totals": sorted((with_plan(s) for s in totals), key=lambda s: -s["total"]),
+        "recent": [trace.as_dict() for trace in reversed(recent)],
+    }
+
+def reset():
+    with _lock:
+        _totals.clear()
+        _plans.clear()
+        _recent.clear()
@@ -0,0 +1,84 @@
+import sys
+import threading
+from collections import OrderedDict
+
+from db import data_version
+
+# ==============================
+# CONFIG
+# ==============================
+MAX_ENTRIES = 256
+MAX_BYTES = 64 * 1024 * 1024     # estimation, voir sizeof()
+
+# ==============================
+# CACHE DES RÉSULTATS DE REQUÊTES
+# ==============================
+# Clé = (fonction, paramètres, data_version). Toute écriture via pool.writer()
+# incrémente data_version (un reset repart d'une valeur aléatoire) : les
+# entrées des versions précédentes ne sont plus jamais demandées et sortent
+# par éviction LRU.
+
+_entries = OrderedDict()   # clé -> (taille estimée, résultat)
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "evictions": 0, "bytes": 0}
+
+def sizeof(obj):
+    """
+    Taille approximative en mémoire des résultats (tuples / listes / dicts de
+    scalaires ; DataFrame : sys.getsizeof compte déjà ses colonnes)
+    """
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(sizeof(k) + sizeof(v) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(sizeof(item) for item in obj)
+    return size
+
+def _get(key):
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            _stats["misses"] += 1
+            return False, None
+        _entries.move_to_end(key)
+        _stats["hits"] += 1
+        return True, entry[1]
+
+def _put(key, result):
+    size = sizeof(result)
+    with _lock:
+        if key in _entries:
+            _stats["bytes"] -= _entries.pop(key)[0]
+        _entries[key] = (size, result)
+        _stats["bytes"] += size
+        while _entries and (len(_entries) > MAX_ENTRIES or _stats["bytes"] > MAX_BYTES):
+            old_size, _ = _entries.popitem(last=False)[1]
+            _stats["bytes"] -= old_size
+            _stats["evictions"] += 1
+
+def cached(pool, fn, *args, **kwargs):
+    """
+    fn(conn, *args, **kwargs) servi depuis le cache si les données n'ont pas
+    changé depuis le dernier appel identique. Le résultat est partagé :
+    ne pas le modifier.
+    """
+    with pool.reader() as conn:
+        # Même instantané pour la version et la requête
+        conn.execute("BEGIN")
+        key = (fn.__module__, fn.__qualname__, args, tuple(sorted(kwargs.items())), data_version(conn))
+        hit, result = _get(key)
+        if not hit:
+            result = fn(conn, *args, **kwargs)
+            _put(key, result)
+    return result
+
+def cache_stats():
+    with _lock:
+        stats = dict(_stats)
+        stats["entries"] = len(_entries)
+    return stats
+
+def clear():
+    with _lock:
+        _entries.clear()
+        _stats["bytes"] = 0
@@ -0,0 +1,124 @@
+"""
+Session de scan (onglet Scanner EAN) : une série de codes collés ou scannés
+d'affilée. Chaque code est d'abord vérifié dans l'index local (isbn, owner_id),
+sans réseau ; seuls les codes inconnus de la bibliothèque sont recherchés, en
+parallèle ; les livres confirmés sont ajoutés en une seule transaction.
+"""
+import re
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import dimensions
+from isbn_lookup import lookup_isbn
+from isbns import canonical_isbns
+
+# ==============================
+# CONFIG
+# ==============================
+LOOKUP_WORKERS = 4          # recherches réseau simultanées (cache ISBN d'abord)
+SQL_BATCH = 500             # ISBN par requête IN (...)
+SEPARATORS = r"[\r\n,;\t]+"  # un code par ligne (douchette = code + Entrée)
+
+# Statuts d'une ligne de session
+OWNED = "déjà possédé"
+KNOWN = "connu (autre propriétaire)"
+FOUND = "trouvé"
+NOT_FOUND = "introuvable"
+FAILED = "erreur réseau"
+INVALID = "code illisible"
+REPEATED = "répété"
+PENDING = "à chercher"
+
+ADDABLE = {KNOWN, FOUND}    # prêts à être ajoutés
+
+BOOK_FIELDS = ["title", "authors", "publisher", "language"]
+
+# ==============================
+# VÉRIFICATION LOCALE
+# ==============================
+def parse_codes(text):
+    return [code.strip() for code in re.split(SEPARATORS, text or "") if code.strip()]
+
+def local_books(conn, isbns):
+    """{isbn: [(owner_id, fiche)]} des livres déjà en base (index isbn)"""
+    found = {}
+    for start in range(0, len(isbns), SQL_BATCH):
+        batch = isbns[start:start + SQL_BATCH]
+        rows = conn.execute(
+            f"""
+            SELECT isbn, owner_id, title, author, publisher, language FROM books_named
+            WHERE isbn IN ({", ".join("?" * len(batch))})
+            """,
+            batch,
+        )
+        for isbn, owner_id, title, author, publisher, language in rows:
+            book = {"title": title, "authors": author, "publisher": publisher or "", "language": language or ""}
+            found.setdefault(isbn, []).append((owner_id, book))
+    return found
+
+def check_codes(conn, codes, owner):
+    """
+    Lignes de la session (dict : code, isbn, status + fiche), sans réseau :
+    ISBN canoniques sur toute la série, puis une requête sur l'index.
+    Un livre qu'un autre propriétaire possède déjà reprend sa fiche locale.
+    """
+    isbns = canonical_isbns(codes).tolist()
+    owner_id = dimensions.find_id(conn, "owner", owner)
+    local = local_books(conn, sorted({isbn for isbn in isbns if isbn}))
+
+    rows, seen = [], set()
+    for code, isbn in zip(codes, isbns):
+        row = {"code": code, "isbn": isbn, "status": PENDING, **dict.fromkeys(BOOK_FIELDS, "")}
+        copies = local.get(isbn, [])
+        if isbn is None:
+            row["status"] = INVALID
+        elif isbn in seen:
+            row["status"] = REPEATED
+        elif any(copy_owner == owner_id for copy_owner, _ in copies):
+            row.update(next(book for copy_owner, book in copies if copy_owner == owner_id), status=OWNED)
+        elif copies:
+            row.update(copies[0][1], status=KNOWN)
+        seen.add(isbn)
+        rows.append(row)
+    return rows
+
+# ==============================
+# RECHERCHE DES CODES INCONNUS
+# ==============================
+def lookup_pending(pool, rows, workers=LOOKUP_WORKERS):
+    """Complète sur place les lignes PENDING (cache ISBN, puis Google Books / OpenLibrary)"""
+    pending = [row for row in rows if row["status"] == PENDING]
+
+    def lookup(row):
+        try:
+            return row, lookup_isbn(pool, row["isbn"]), None
+        except Exception as e:
+            return row, None, e
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for row, book, error in executor.map(lookup, pending):
+            if error is not None:
+                row["status"] = FAILED
+            elif book:
+                row.update({field: book.get(field) or "" for field in BOOK_FIELDS}, status=FOUND)
+            else:
+                row["status"] = NOT_FOUND
+    return rows
+
+# ==============================
+# AJOUT
+# ==============================
+def add_books(pool, rows, owner, fmt):
+    """Ajoute les lignes confirmées en une transaction ; retourne (ajoutés, déjà présents)"""
+    added = skipped = 0
+    with pool.writer() as conn:
+        for row in rows:
+            try:
+                dimensions.insert_book(
+                    conn, owner, fmt, row["authors"], row["title"], row["language"] or None,
+                    row["isbn"], row["publisher"] or None,
+                )
+                added += 1
+            except sqlite3.IntegrityError:
+                skipped += 1
+    return added, skipped
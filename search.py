@@ -0,0 +1,131 @@
+import re
+
+from dimensions import find_id
+
+# ==============================
+# FTS5 - INDEX PLEIN TEXTE
+# ==============================
+# Table books_fts et triggers : migrations/0002_fts.sql
+
+SEARCH_COLUMNS = "b.owner, b.format, b.author, b.title, b.language, b.publisher"
+
+def fts_query(text):
+    """
+    Transforme la saisie utilisateur en requête FTS5 sûre :
+    chaque mot est quoté (pas d'injection de syntaxe FTS) et cherché en préfixe.
+    """
+    terms = re.findall(r"\w+", text or "")
+    return " ".join(f'"{t}"*' for t in terms)
+
+# ==============================
+# RECHERCHE
+# ==============================
+def build_search_query(text="", owner_id=None, format_id=None, columns=SEARCH_COLUMNS, limit=None):
+    """
+    Requête titre/auteur/éditeur + filtres propriétaire/format (id), retourne (query, params).
+    `limit` : nombre maximal de lignes, appliqué par SQLite (None = tout).
+
+    Avec du texte : résultats classés par pertinence (bm25).
+    Sans texte : simple filtre, trié par propriétaire, auteur, titre.
+    Propriétaires dans l'ordre de leurs id : l'index (owner_id, author, title) donne le tri.
+    """
+    match = fts_query(text)
+    params = []
+
+    if match:
+        query = f"""
+            SELECT {columns}
+            FROM books_fts
+            JOIN books_named b ON b.id = books_fts.rowid
+            WHERE books_fts MATCH ?
+        """
+        params.append(match)
+    else:
+        query = f"SELECT {columns} FROM books_named b WHERE 1=1"
+
+    if owner_id is not None:
+        query += " AND b.owner_id = ?"
+        params.append(owner_id)
+
+    if format_id is not None:
+        query += " AND b.format_id = ?"
+        params.append(format_id)
+
+    if match:
+        query += " ORDER BY bm25(books_fts), b.owner_id, b.author, b.title"
+    else:
+        query += " ORDER BY b.owner_id, b.author, b.title"
+
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+
+    return query, params
+
+def filter_ids(conn, owner=None, fmt=None):
+    """Filtres saisis (noms, casse et synonymes tolérés) -> id ; inconnu -> 0, aucun résultat"""
+    return (
+        find_id(conn, "owner", owner) if owner else None,
+        find_id(conn, "format", fmt) if fmt else None,
+    )
+
+def search_books(conn, text="", owner=None, fmt=None, limit=None):
+    query, params = build_search_query(text, *filter_ids(conn, owner, fmt), limit=limit)
+    return conn.execute(query, params).fetchall()
+
+def count_matches(conn, text="", owner=None, fmt=None):
+    """Nombre total de résultats de search_books, sans ramener les lignes"""
+    query, params = build_search_query(text, *filter_ids(conn, owner, fmt), columns="1")
+    return conn.execute(f"SELECT count(*) FROM ({query})", params).fetchone()[0]
+
+def search_frame(conn, text="", owner=None, fmt=None):
+    """Comme search_books, en DataFrame compact (voir frames.py)"""
+    from frames import read_frame
+
+    return read_frame(conn.execute(*build_search_query(text, *filter_ids(conn, owner, fmt))))
+
+# ==============================
+# LISTE PAGINÉE (keyset)
+# ==============================
+LIST_COLUMNS = "owner, format, author, title, language, publisher, created_at"
+
+def count_books(conn):
+    """Compteur tenu par triggers (book_stats, comme stats.total) : pas de parcours de books"""
+    row = conn.execute("SELECT n FROM book_stats WHERE kind = 'total' AND a = '' AND b = ''").fetchone()
+    return row[0] if row else 0
+
+def list_query(page_size, after=None):
+    """Requête d'une page (+ une ligne pour savoir s'il y a une suite), retourne (query, params)"""
+    query = f"SELECT {LIST_COLUMNS}, id FROM books_named"
+    params = []
+    if after is not None:
+        query += " WHERE (created_at, id) < (?, ?)"
+        params += list(after)
+    query += " ORDER BY created_at DESC, id DESC LIMIT ?"
+    params.append(page_size + 1)
+    return query, params
+
+def list_page(conn, page_size, after=None):
+    """
+    Une page de la liste, du plus récent au plus ancien.
+
+    Pagination par clé (created_at, id) via l'index idx_books_created_at_id :
+    le coût dépend de la taille de page, pas de la position ni du nombre de livres.
+    `after` est le curseur renvoyé pour la page précédente (None = première page).
+    Retourne (rows, next_cursor) ; next_cursor vaut None sur la dernière page.
+    """
+    rows = conn.execute(*list_query(page_size, after)).fetchall()
+    has_next = len(rows) > page_size
+    rows = rows[:page_size]
+    next_cursor = (rows[-1][-2], rows[-1][-1]) if has_next else None
+    return [r[:-1] for r in rows], next_cursor
+
+def list_page_frame(conn, page_size, after=None):
+    """Comme list_page, en DataFrame compact (voir frames.py)"""
+    from frames import read_frame
+
+    df = read_frame(conn.execute(*list_query(page_size, after)))
+    has_next = len(df) > page_size
+    df = df.iloc[:page_size]
+    next_cursor = (df["created_at"].iloc[-1], int(df["id"].iloc[-1])) if has_next else None
+    return df.drop(columns="id"), next_cursor
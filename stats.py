@@ -0,0 +1,70 @@
+from collections import defaultdict
+
+from dimensions import names
+
+# ==============================
+# STATISTIQUES MATÉRIALISÉES
+# ==============================
+# Table book_stats tenue à jour par triggers : migrations/0005_book_stats.sql,
+# propriétaire / format / langue comptés par id depuis migrations/0007.
+# pandas n'est importé que pour les tableaux (la CLI `stats` s'en passe).
+
+# kind -> dimensions de (a, b) à traduire en noms
+DIMENSION_KINDS = {
+    "owner": ("owner", None),
+    "format": ("format", None),
+    "language": ("language", None),
+    "format_owner": ("format", "owner"),
+}
+
+READING_LABELS = {
+    ("0", "0"): "À lire",
+    ("0", "1"): "À lire",
+    ("1", "1"): "Lus et gardés",
+    ("1", "0"): "Lus, pas gardés",
+}
+
+def read_stats(conn):
+    """{kind: {(a, b): n}} ; une seule lecture de la table, compteurs nuls exclus, id -> noms"""
+    labels = {kind: {str(i): name for i, name in names(conn, kind).items()} for kind in ("owner", "format", "language")}
+    stats = defaultdict(dict)
+    for kind, a, b, n in conn.execute("SELECT kind, a, b, n FROM book_stats WHERE n > 0"):
+        dim_a, dim_b = DIMENSION_KINDS.get(kind, (None, None))
+        if dim_a:
+            a = labels[dim_a].get(a, a)
+        if dim_b:
+            b = labels[dim_b].get(b, b)
+        stats[kind][(a, b)] = n
+    return dict(stats)
+
+def counts(stats, kind):
+    """[(valeur, n)] triés par n décroissant ; valeur vide -> '—'"""
+    rows = [(a or "—", n) for (a, _), n in stats.get(kind, {}).items()]
+    return sorted(rows, key=lambda r: (-r[1], r[0]))
+
+def total(stats):
+    return stats.get("total", {}).get(("", ""), 0)
+
+def reading(stats):
+    out = defaultdict(int)
+    for key, n in stats.get("reading", {}).items():
+        out[READING_LABELS.get(key, "?")] += n
+    return sorted(out.items(), key=lambda r: -r[1])
+
+def format_owner_matrix(stats):
+    """DataFrame format x propriétaire (0 si aucune combinaison)"""
+    import pandas as pd
+
+    cells = stats.get("format_owner", {})
+    if not cells:
+        return pd.DataFrame()
+    matrix = pd.Series(cells).unstack(fill_value=0)
+    matrix.index = [f or "—" for f in matrix.index]
+    return matrix
+
+def monthly_additions(stats):
+    """Série AAAA-MM -> nombre de livres ajoutés"""
+    import pandas as pd
+
+    months = {a: n for (a, _), n in stats.get("month", {}).items() if a}
+    return pd.Series(months, dtype="int64").sort_index()
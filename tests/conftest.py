@@ -0,0 +1,18 @@
+"""Fixtures partagées : base SQLite migrée dans un dossier temporaire."""
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import db  # noqa: E402
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = db.ConnectionPool(tmp_path / "books.sqlite")
+    db.init_db(pool)
+    yield pool
+    pool.close()
@@ -0,0 +1,30 @@
+"""python -m bliblio sur une base temporaire."""
+import pytest
+
+import dimensions
+from bliblio import cli, core
+
+@pytest.fixture
+def catalogue(pool, monkeypatch):
+    monkeypatch.setattr(core.db, "get_pool", lambda: pool)
+    monkeypatch.setattr(core, "_ready", False)
+    with pool.writer() as conn:
+        for author, title, isbn in [
+            ("Albert Camus", "L'Étranger", None),
+            ("Camus, Albert", "Etranger", "9782070360024"),
+            ("Hergé", "Tintin au Tibet", None),
+        ]:
+            dimensions.insert_book(conn, "Nils", "Livre", author, title, "Fr", isbn)
+    return pool
+
+def test_dedupe_lists_then_merges(catalogue, capsys):
+    cli.main(["dedupe"])
+    out = capsys.readouterr().out
+    assert "1 groupes, 1 doublons" in out and "#1 Nils | Albert Camus | L'Étranger" in out
+
+    cli.main(["dedupe", "--apply"])
+    assert "✅ 1 livres fusionnés" in capsys.readouterr().out
+    with catalogue.reader() as conn:
+        assert conn.execute("SELECT id, isbn FROM books WHERE title = 'L''Étranger'").fetchall() == [(1, "9782070360024")]
+    cli.main(["dedupe"])
+    assert "0 groupes" in capsys.readouterr().out
@@ -0,0 +1,124 @@
+"""Import CSV incrémental (import_manifest.sync_chunks, csv_import.sync_csv)."""
+import pandas as pd
+
+import csv_import
+import dimensions
+from csv_import import BOOK_COLUMNS, sync_csv
+from import_manifest import file_hash, row_hashes, sync_chunks
+
+SOURCE = "livres.csv"
+
+def frame(rows):
+    return pd.DataFrame(
+        [dict(zip(["owner", "format", "author", "title", "language", "isbn", "publisher"], row)) for row in rows],
+        columns=BOOK_COLUMNS,
+    )
+
+def sync(pool, books, chunk=2, wipe=False):
+    chunks = (books.iloc[start:start + chunk] for start in range(0, len(books), chunk))
+    with pool.writer() as conn:
+        return sync_chunks(conn, SOURCE, chunks, BOOK_COLUMNS, wipe=wipe)
+
+def titles(pool):
+    with pool.reader() as conn:
+        return [row[0] for row in conn.execute("SELECT title FROM books ORDER BY id")]
+
+def tracked(pool):
+    """{row_hash: titre du livre référencé (None si doublon)}"""
+    with pool.reader() as conn:
+        return dict(conn.execute("""
+            SELECT r.row_hash, b.title FROM import_rows r LEFT JOIN books b ON b.id = r.book_id
+            WHERE r.source = ?
+        """, (SOURCE,)))
+
+BOOKS = [
+    ("Nils", "BD", "Hergé", "Tintin au Tibet", "Fr", None, "Casterman"),
+    ("Nils", "Livre", "Camus", "L'Étranger", "Fr", "9782070360024", "Folio"),
+    ("Nils", "BD", "hergé ", "TINTIN AU TIBET", "Fr", None, None),           # même clé que la 1re ligne
+    ("Nils", "Livre", "Camus", "L'Étranger (poche)", "Fr", "9782070360024", None),   # même ISBN, même propriétaire
+    ("Carole", "Livre", "Camus", "L'Étranger", "Fr", "9782070360024", None),  # même ISBN, autre propriétaire
+    ("Nils", "BD", "Hergé", "Tintin au Tibet", "Fr", None, "Casterman"),      # ligne répétée telle quelle
+    ("Carole", "BD", "Goscinny", "Astérix le Gaulois", "Fr", None, None),
+]
+
+def test_sync_chunks_adds_and_skips_duplicates(pool):
+    with pool.writer() as conn:
+        # Trous dans les id : les id attribués par l'import ne partent pas de 1
+        for i in range(3):
+            dimensions.insert_book(conn, "Axel", "Livre", "Auteur", f"Supprimé {i}")
+        conn.execute("DELETE FROM books")
+
+    books = frame(BOOKS)
+    report = sync(pool, books)
+    assert report["added"] == 4
+    assert report["duplicates"] == 3
+    assert titles(pool) == ["Tintin au Tibet", "L'Étranger", "L'Étranger", "Astérix le Gaulois"]
+
+    # import_rows.book_id : id consécutifs (last_insert_rowid() - ajoutés + 1) dans l'ordre du fichier
+    hashes = row_hashes(books).tolist()
+    assert tracked(pool) == {
+        hashes[0]: "Tintin au Tibet",
+        hashes[1]: "L'Étranger",
+        hashes[2]: None,
+        hashes[3]: None,
+        hashes[4]: "L'Étranger",
+        hashes[6]: "Astérix le Gaulois",
+    }
+
+def test_sync_chunks_changes_and_removals(pool):
+    sync(pool, frame(BOOKS))
+    with pool.reader() as conn:
+        camus_id = conn.execute("SELECT id FROM books_named WHERE title = 'L''Étranger' AND owner = 'Nils'").fetchone()[0]
+
+    rows = [row for row in BOOKS if row[3] != "Astérix le Gaulois"]                  # retirée
+    rows[1] = ("Nils", "Livre", "Camus", "L'Étranger", "Fr", "9782070360024", "Gallimard")   # modifiée
+    rows.append(("Axel", "Manga", "Toriyama", "Dragon Ball", "Fr", None, None))       # ajoutée
+    books = frame(rows)
+    report = sync(pool, books)
+    assert (report["added"], report["changed"], report["removed"]) == (1, 1, 1)
+
+    with pool.reader() as conn:
+        assert conn.execute("SELECT id, publisher FROM books WHERE publisher = 'Gallimard'").fetchall() == [(camus_id, "Gallimard")]
+    assert sorted(titles(pool)) == ["Dragon Ball", "L'Étranger", "L'Étranger", "Tintin au Tibet"]
+    assert tracked(pool)[row_hashes(books).tolist()[1]] == "L'Étranger"
+
+    # Même contenu : rien ne bouge
+    report = sync(pool, books, chunk=3)
+    assert (report["added"], report["changed"], report["removed"]) == (0, 0, 0)
+    assert report["unchanged"] == 6   # lignes distinctes du fichier
+
+def test_sync_chunks_wipe(pool):
+    with pool.writer() as conn:
+        dimensions.insert_book(conn, "Axel", "Livre", "Hugo", "Les Misérables")
+    report = sync(pool, frame(BOOKS[:2]), wipe=True)
+    assert report["added"] == 2
+    assert titles(pool) == ["Tintin au Tibet", "L'Étranger"]
+
+def test_sync_csv_in_chunks_and_unchanged_file(pool, tmp_path, monkeypatch):
+    monkeypatch.setattr(csv_import, "CHUNK_ROWS", 2)
+    path = tmp_path / SOURCE
+    path.write_text(
+        "Proprio;Format;Auteur;Titre;Langue;ISBN;Editeur\n"
+        "Nils;BD;Hergé;Tintin au Tibet;Fr;;Casterman\n"
+        "Nils;Livre;Camus;L'Étranger;Fr;ISBN-10: 2-07-036002-4;Folio\n"
+        "Nils;Livre;Camus;;Fr;;\n"
+        "Carole;BD;Goscinny;Astérix le Gaulois;Fr;pas un isbn;\n"
+        "Carole;;Hugo;Les Misérables;Fr;;\n",
+        encoding="utf-8",
+    )
+    progress = []
+    report, errors, error_count = sync_csv(
+        pool, path, SOURCE, digest=file_hash(path), on_progress=lambda done, total: progress.append(done), total=5,
+    )
+    assert report["added"] == 4
+    assert report["unreadable_isbn"] == 1
+    assert (errors, error_count) == (["Ligne 4: Titre vide"], 1)
+    assert progress == [2, 4, 5]
+    with pool.reader() as conn:
+        assert conn.execute("SELECT isbn FROM books WHERE title = 'L''Étranger'").fetchone()[0] == "9782070360024"
+    with pool.writer(versioned=False) as conn:
+        assert [row[1] for row in conn.execute("PRAGMA database_list")] == ["main"]   # base annexe détachée
+
+    report, errors, error_count = sync_csv(pool, path, SOURCE, digest=file_hash(path))
+    assert report["file_unchanged"]
+    assert titles(pool) == ["Tintin au Tibet", "L'Étranger", "Astérix le Gaulois", "Les Misérables"]
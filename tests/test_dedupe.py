@@ -0,0 +1,68 @@
+"""Détection et fusion des doublons (dedupe.py)."""
+import pandas as pd
+import pytest
+
+import dedupe
+import dimensions
+
+@pytest.mark.parametrize("text, expected", [
+    ("L'Étranger !", "etranger"),
+    ("Les Misérables", "miserables"),
+    ("The Lord of the Rings", "lord of rings"),
+    ("  ÉLÉPHANT_rose  ", "elephant rose"),
+    (None, ""),
+])
+def test_normalize(text, expected):
+    assert dedupe.normalize(text) == expected
+
+def test_normalize_author():
+    assert dedupe.normalize_author("Camus, Albert") == dedupe.normalize_author("Albert Camus") == "albert camus"
+    assert dedupe.normalize_author("Hergé") == "herge"
+
+def books(rows):
+    return pd.DataFrame(rows, columns=["id", "owner", "author", "title"])
+
+def test_find_duplicates():
+    found = dedupe.find_duplicates(books([
+        (1, "Nils", "Albert Camus", "L'Étranger"),
+        (2, "nils", "Camus, Albert", "Etranger"),
+        (3, "Carole", "Albert Camus", "L'Étranger"),    # autre propriétaire
+        (4, "Nils", "Albert Camus", "La Peste"),
+        (5, "Nils", "Alb. Camus", "L'étranger"),        # autre début d'auteur : bloc par signature de titre
+        (6, "Nils", "Hergé", "Tintin au Tibet"),
+        (7, "Nils", "Herge", "Tintin au Tibet."),
+    ]))
+    assert found == [[1, 2, 5], [6, 7]]
+
+def test_find_duplicates_large_block(monkeypatch):
+    # Bloc trop gros : seuls les WINDOW voisins par titre sont comparés
+    monkeypatch.setattr(dedupe, "MAX_BLOCK", 3)
+    monkeypatch.setattr(dedupe, "WINDOW", 1)
+    titles = ["spirou", "asterix", "tintin au tibet", "gaston", "tintin au tibet"]
+    assert len(list(dedupe.block_pairs(list(range(5)), titles))) == 4
+    assert len(list(dedupe.block_pairs(list(range(3)), titles))) == 3   # petit bloc : toutes les paires
+
+    rows = [(i, "Nils", "Hergé", title) for i, title in enumerate(["Spirou", "Astérix", "Tintin au Tibet", "Gaston", "Tintin au Tibet !"], 1)]
+    assert dedupe.find_duplicates(books(rows)) == [[3, 5]]
+
+def test_merge_groups(pool):
+    with pool.writer() as conn:
+        keep = dimensions.insert_book(conn, "Nils", "Livre", "Albert Camus", "L'Étranger")
+        drop = dimensions.insert_book(conn, "Nils", "Livre", "Camus, Albert", "Etranger", "Fr", "9782070360024", "Folio")
+        other = dimensions.insert_book(conn, "Nils", "Livre", "Hergé", "Tintin au Tibet")
+        conn.execute("INSERT INTO import_rows (source, row_hash, book_id) VALUES ('livres.csv', 1, ?)", (drop,))
+
+    with pool.reader() as conn:
+        groups = dedupe.find_duplicates(dedupe.load_books(conn))
+    assert groups == [[keep, drop]]
+
+    with pool.writer() as conn:
+        assert dedupe.merge_groups(conn, groups) == 1
+    with pool.reader() as conn:
+        rows = conn.execute("SELECT id, title, isbn, publisher, language FROM books_named ORDER BY id").fetchall()
+        assert rows == [
+            (keep, "L'Étranger", "9782070360024", "Folio", "Fr"),   # plus ancien gardé, complété
+            (other, "Tintin au Tibet", None, None, None),
+        ]
+        assert conn.execute("SELECT book_id FROM import_rows").fetchall() == [(None,)]
+        assert conn.execute("SELECT n FROM book_stats WHERE kind = 'total'").fetchone()[0] == 2
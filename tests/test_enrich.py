@@ -0,0 +1,46 @@
+"""Enrichissement (enrich.py) sans réseau : cache ISBN local et écriture des mises à jour."""
+import pytest
+
+import dimensions
+import enrich
+import isbn_lookup
+
+@pytest.fixture
+def books(pool):
+    isbn_lookup.clear_memory_cache()
+    with pool.writer() as conn:
+        ids = [
+            dimensions.insert_book(conn, "Nils", "Livre", "Camus", "L'Étranger", isbn="9782070360024"),
+            dimensions.insert_book(conn, "Nils", "Livre", "Camus", "La Peste", isbn="9782070360420"),
+        ]
+    isbn_lookup.store_many(pool, {
+        "9782070360024": {"title": "L'Étranger", "authors": "Camus", "publisher": "Folio", "language": "FR", "isbn": "9782070360024"},
+        "9782070360420": {"title": "La Peste", "authors": "Camus", "publisher": "Folio", "language": "FR", "isbn": "9782070360420"},
+    })
+    yield ids
+    isbn_lookup.clear_memory_cache()
+
+def publishers(pool):
+    with pool.reader() as conn:
+        return [row[0] for row in conn.execute("SELECT publisher FROM books ORDER BY id")]
+
+def test_cancel_keeps_results(pool, books):
+    def on_progress(done, total):
+        raise InterruptedError("annulé")
+
+    # Annulé dès le premier livre trouvé dans le cache : celui-ci est tout de même écrit
+    with pytest.raises(InterruptedError):
+        enrich.enrich(pool, on_progress=on_progress)
+    assert publishers(pool) == ["Folio", None]
+
+    stats = enrich.enrich(pool)
+    assert (stats["rows"], stats["updated"]) == (1, 1)
+    assert publishers(pool) == ["Folio", "Folio"]
+
+def test_write_updates_counts_changed_rows(pool, books):
+    keep, gone = books
+    with pool.writer() as conn:
+        conn.execute("DELETE FROM books WHERE id = ?", (gone,))
+    updates = [("9782070360024", "Folio", "Fr", keep), ("9782070360420", "Folio", "Fr", gone)]
+    assert enrich.write_updates(pool, updates) == 1
+    assert enrich.write_updates(pool, updates) == 0   # déjà complété
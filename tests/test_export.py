@@ -0,0 +1,35 @@
+"""Cache disque des exports (export.export_file)."""
+import csv
+from concurrent.futures import ThreadPoolExecutor
+
+import dimensions
+import export
+
+def add_books(pool, n, start=0):
+    with pool.writer() as conn:
+        for i in range(start, start + n):
+            dimensions.insert_book(conn, "Nils", "BD", f"Auteur {i}", f"Titre {i}", "Fr", None, None)
+
+def test_concurrent_exports(pool):
+    add_books(pool, 50)
+    export_dir = pool.path.parent / export.EXPORT_DIRNAME
+    export_dir.mkdir()
+    pending = export_dir / ".0-autre.csv.1234.tmp"   # écriture en cours ailleurs
+    pending.write_text("")
+
+    with ThreadPoolExecutor(8) as executor:
+        paths = list(executor.map(lambda _: export.export_file(pool, "csv"), range(8)))
+
+    assert len(set(paths)) == 1
+    with open(paths[0], newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == export.HEADER and len(rows) == 51
+    assert pending.exists()
+    assert sorted(p.name for p in export_dir.iterdir()) == sorted([paths[0].name, pending.name])
+
+def test_new_version_replaces_old_exports(pool):
+    add_books(pool, 3)
+    first = export.export_file(pool, "csv")
+    add_books(pool, 1, start=3)
+    second = export.export_file(pool, "csv")
+    assert second != first and second.exists() and not first.exists()
@@ -0,0 +1,115 @@
+"""Cache ISBN (isbn_lookup) contre les faux fournisseurs de benchmarks/stub_providers.py."""
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+import isbn_lookup
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+import stub_providers  # noqa: E402
+
+GOOGLE = "9782070612758"        # Le Petit Prince, connu de Google Books
+OPENLIBRARY = "9780141439518"   # Pride and Prejudice, OpenLibrary seulement
+UNKNOWN = "9780000000002"       # inconnu des deux
+
+class Clock:
+    def __init__(self):
+        self.now = time.time()
+
+    def time(self):
+        return self.now
+
+def start_providers(monkeypatch, **options):
+    server, base = stub_providers.start(**options)
+    monkeypatch.setattr(isbn_lookup, "GOOGLE_BOOKS_URL", f"{base}/books/v1/volumes")
+    monkeypatch.setattr(isbn_lookup, "OPENLIBRARY_URL", f"{base}/api/books")
+    return server
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(isbn_lookup, "time", clock)
+    monkeypatch.setattr(isbn_lookup, "_stats", dict.fromkeys(isbn_lookup._stats, 0))
+    isbn_lookup.clear_memory_cache()
+    yield clock
+    isbn_lookup.clear_memory_cache()
+
+@pytest.fixture
+def providers(monkeypatch, clock):
+    server = start_providers(monkeypatch)
+    yield server
+    server.shutdown()
+
+def served(server):
+    return server.RequestHandlerClass.requests_served
+
+def test_found_then_cached(pool, providers):
+    book = isbn_lookup.lookup_isbn(pool, "978-2-07-061275-8")
+    assert book["title"] == "Le Petit Prince" and book["isbn"] == GOOGLE
+    assert served(providers) == 1
+
+    assert isbn_lookup.lookup_isbn(pool, GOOGLE) == book
+    assert isbn_lookup.lookup_isbn(pool, OPENLIBRARY)["authors"] == "Jane Austen"
+    assert served(providers) == 3                  # Google puis OpenLibrary
+    stats = isbn_lookup.cache_stats()
+    assert (stats["lru_hits"], stats["misses"], stats["fetches"]) == (1, 2, 2)
+
+    # Mémoire vidée (nouveau process) : la table isbn_cache répond
+    isbn_lookup.clear_memory_cache()
+    assert isbn_lookup.lookup_isbn(pool, GOOGLE) == book
+    assert isbn_lookup.cache_stats()["db_hits"] == 1
+    assert served(providers) == 3
+
+def test_negative_cache_and_ttl(pool, providers, clock):
+    assert isbn_lookup.lookup_isbn(pool, UNKNOWN) is None
+    assert isbn_lookup.lookup_isbn(pool, GOOGLE) is not None
+    assert served(providers) == 3
+
+    isbn_lookup.clear_memory_cache()
+    assert isbn_lookup.lookup_isbn(pool, UNKNOWN) is None
+    assert isbn_lookup.lookup_isbn(pool, UNKNOWN) is None
+    stats = isbn_lookup.cache_stats()
+    assert (stats["negative_hits"], stats["db_hits"], stats["lru_hits"]) == (2, 1, 1)
+    assert served(providers) == 3
+
+    # Introuvable expiré au bout d'un jour, livre trouvé gardé 30 jours
+    clock.now += isbn_lookup.NEGATIVE_TTL + 1
+    assert isbn_lookup.lookup_isbn(pool, UNKNOWN) is None
+    assert isbn_lookup.lookup_isbn(pool, GOOGLE) is not None
+    assert served(providers) == 5
+
+    clock.now += isbn_lookup.POSITIVE_TTL
+    assert isbn_lookup.lookup_isbn(pool, GOOGLE) is not None
+    assert served(providers) == 6
+    assert isbn_lookup.cache_stats()["fetches"] == 4
+
+def test_lru_eviction(pool, providers, monkeypatch):
+    monkeypatch.setattr(isbn_lookup, "LRU_SIZE", 2)
+    for isbn in (GOOGLE, OPENLIBRARY, UNKNOWN):
+        isbn_lookup.lookup_isbn(pool, isbn)
+    assert isbn_lookup.cache_stats()["lru_size"] == 2
+
+    isbn_lookup.lookup_isbn(pool, UNKNOWN)         # le plus récent : en mémoire
+    isbn_lookup.lookup_isbn(pool, GOOGLE)          # le plus ancien, évincé : relu en base
+    stats = isbn_lookup.cache_stats()
+    assert (stats["lru_hits"], stats["db_hits"], stats["lru_size"]) == (1, 1, 2)
+    assert served(providers) == 5                  # aucune nouvelle requête
+
+def test_provider_errors_are_not_cached(pool, clock, monkeypatch):
+    server = start_providers(monkeypatch, fail_every=1)
+    try:
+        assert isbn_lookup.lookup_isbn(pool, GOOGLE) is None
+        assert isbn_lookup.lookup_isbn(pool, GOOGLE) is None
+        assert served(server) == 4
+    finally:
+        server.shutdown()
+    with pool.reader() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM isbn_cache").fetchone()[0] == 0
+
+def test_unreadable_code_skips_network(pool, providers):
+    assert isbn_lookup.lookup_isbn(pool, "pas un isbn") is None
+    assert isbn_lookup.lookup_isbn(pool, "9782070612759") is None   # clé fausse
+    assert served(providers) == 0
+    assert isbn_lookup.cache_stats()["misses"] == 0
@@ -0,0 +1,30 @@
+"""Formes canoniques des ISBN (isbns.py)."""
+import pytest
+
+from isbns import canonical_isbn, canonical_isbns
+
+@pytest.mark.parametrize("value, expected", [
+    ("9782070408504", "9782070408504"),
+    ("978-2-07-040850-4", "9782070408504"),
+    ("ISBN-13: 978-2-07-040850-4", "9782070408504"),
+    ("isbn 978 2 07 040850 4", "9782070408504"),
+    ("ISBN-10: 2-07-036002-4", "9782070360024"),
+    ("ISBN:2070360024", "9782070360024"),
+    ("207036002X", None),                    # clé ISBN-10 fausse
+    ("9782070360024.0", "9782070360024"),
+    ("9.782070360024E+12", "9782070360024"),
+    ("9.78207e+12", None),                   # notation tronquée
+    ("070360024", None),
+    ("9782070408505", None),                 # clé EAN fausse
+    ("ISBN", None),
+    ("", None),
+    (None, None),
+])
+def test_canonical_isbn(value, expected):
+    assert canonical_isbn(value) == expected
+
+def test_canonical_isbns_keeps_index():
+    import pandas as pd
+
+    values = pd.Series(["ISBN-13: 978-2-07-040850-4", None, "2070360024"], index=[10, 20, 30])
+    assert canonical_isbns(values).to_dict() == {10: "9782070408504", 20: None, 30: "9782070360024"}
@@ -0,0 +1,77 @@
+"""Jobs exécutés dans le process (ligne de commande) pendant qu'un Runner tourne."""
+import threading
+import time
+
+import jobs
+
+calls = []
+
+def probe(job):
+    calls.append((job.id, threading.current_thread().name))
+    time.sleep(0.05)
+    return {"ok": True}
+
+def test_run_is_not_claimed_by_runner(pool, monkeypatch):
+    monkeypatch.setitem(jobs.HANDLERS, "probe", "test_jobs:probe")
+    calls.clear()
+    runner = jobs.Runner(pool).start()
+    try:
+        job = jobs.run(pool, "probe", {})
+        time.sleep(0.1)
+    finally:
+        runner.stop()
+    assert job["status"] == "done" and job["result"] == {"ok": True}
+    assert job["worker"] == jobs.WORKER_ID
+    assert calls == [(job["id"], threading.current_thread().name)]
+
+def test_submit_is_claimed_by_runner(pool, monkeypatch):
+    monkeypatch.setitem(jobs.HANDLERS, "probe", "test_jobs:probe")
+    calls.clear()
+    runner = jobs.Runner(pool).start()
+    try:
+        job_id = jobs.submit(pool, "probe", {})
+        deadline = time.monotonic() + 5
+        while jobs.get(pool, job_id)["status"] != "done" and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        runner.stop()
+    assert jobs.get(pool, job_id)["status"] == "done"
+    assert [name for _, name in calls] == ["bliblio-job-0"]
+
+def test_submit_while_csv_import_runs(pool, tmp_path, monkeypatch):
+    import csv_import
+    import dimensions
+
+    path = tmp_path / "livres.csv"
+    path.write_text("Proprio,Auteur,Titre\n" + "".join(f"Nils,Auteur {i},Titre {i}\n" for i in range(1000)))
+
+    # L'import s'arrête au premier bloc lu tant que le test n'a pas écrit de son côté
+    importing, written = threading.Event(), threading.Event()
+    normalize = csv_import.normalize
+
+    def slow_normalize(df, force_format):
+        importing.set()
+        written.wait(5)
+        return normalize(df, force_format)
+
+    monkeypatch.setattr(csv_import, "normalize", slow_normalize)
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(jobs.run(pool, "csv_import", {
+        "path": str(path), "source": path.name,
+    })))
+    thread.start()
+    assert importing.wait(5)
+
+    t0 = time.monotonic()
+    job_id = jobs.submit(pool, "enrich", {})
+    with pool.writer() as conn:
+        dimensions.insert_book(conn, "Carole", "Livre", "Albert Camus", "La Peste")
+    waited = time.monotonic() - t0
+    written.set()
+    thread.join(10)
+
+    assert waited < 1
+    assert jobs.get(pool, job_id)["status"] == "queued"
+    assert result["status"] == "done" and result["result"]["report"]["added"] == 1000
+    with pool.reader() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM books").fetchone()[0] == 1001
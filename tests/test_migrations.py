@@ -0,0 +1,93 @@
+"""Migrations appliquées à une base créée avec un schéma plus ancien."""
+import sqlite3
+
+import db
+
+def old_db(tmp_path, version):
+    conn = sqlite3.connect(tmp_path / "old.sqlite")
+    assert db.migrate(conn, version) == version
+    return conn
+
+def test_latest_version(tmp_path):
+    conn = sqlite3.connect(tmp_path / "new.sqlite")
+    assert db.migrate(conn) == db.latest_version()
+    assert db.migrate(conn) == db.latest_version()
+
+def test_dimensions_merge_owner_variants(tmp_path):
+    conn = old_db(tmp_path, 6)
+    conn.executemany("INSERT INTO books (owner, format, author, title, language, isbn) VALUES (?, ?, ?, ?, ?, ?)", [
+        ("Jean  Pierre", "BD", "Hergé", "Tintin au Tibet", "fr", None),
+        ("jean pierre", "BD", "Hergé", "Tintin au Tibet", "fr", None),
+        ("JEAN   PIERRE ", "bd", "hergé", "tintin au tibet", "FR", None),
+        ("jean pierre", "Livre", "Camus", "L'Étranger", "fr", None),
+        ("CAROLE", "Livre", "Hergé", "Tintin au Tibet", "fr", None),
+    ])
+    ids = [row[0] for row in conn.execute("SELECT id FROM books ORDER BY id")]
+    conn.executemany(
+        "INSERT INTO import_rows (source, row_hash, book_id) VALUES ('livres.csv', ?, ?)",
+        [(i, book_id) for i, book_id in enumerate(ids)],
+    )
+    conn.commit()
+
+    assert db.migrate(conn) == db.latest_version()
+
+    kept = conn.execute("SELECT id, lower(owner), title FROM books_named ORDER BY id").fetchall()
+    assert kept == [
+        (ids[0], "jean pierre", "Tintin au Tibet"),
+        (ids[3], "jean pierre", "L'Étranger"),
+        (ids[4], "carole", "Tintin au Tibet"),
+    ]
+    assert conn.execute("SELECT COUNT(DISTINCT owner_id) FROM books").fetchone()[0] == 2
+    refs = dict(conn.execute("SELECT row_hash, book_id FROM import_rows"))
+    assert refs == {0: ids[0], 1: None, 2: None, 3: ids[3], 4: ids[4]}
+
+    # Compteurs et index plein texte suivent la fusion
+    total = conn.execute("SELECT n FROM book_stats WHERE kind = 'total'").fetchone()[0]
+    assert total == conn.execute("SELECT COUNT(*) FROM books").fetchone()[0] == 3
+    matches = conn.execute("SELECT rowid FROM books_fts WHERE books_fts MATCH 'tibet' ORDER BY rowid").fetchall()
+    assert matches == [(ids[0],), (ids[4],)]
+    conn.execute("INSERT INTO books_fts (books_fts) VALUES ('integrity-check')")
+
+def test_dimensions_blank_owner(tmp_path):
+    conn = old_db(tmp_path, 6)
+    conn.executemany("INSERT INTO books (owner, author, title) VALUES (?, ?, ?)", [
+        ("", "Hergé", "Tintin au Tibet"),
+        ("   ", "Camus", "L'Étranger"),
+        ("Nils", "Camus", "La Peste"),
+    ])
+    conn.commit()
+
+    assert db.migrate(conn) == db.latest_version()
+    owners = conn.execute("SELECT owner, title FROM books_named ORDER BY id").fetchall()
+    assert owners == [("Inconnu", "Tintin au Tibet"), ("Inconnu", "L'Étranger"), ("Nils", "La Peste")]
+    assert conn.execute("SELECT n FROM book_stats WHERE kind = 'owner' AND a = (SELECT id FROM owners WHERE name = 'Inconnu')").fetchone()[0] == 2
+
+def test_dimensions_without_blank_owner(tmp_path):
+    conn = old_db(tmp_path, 6)
+    conn.execute("INSERT INTO books (owner, author, title) VALUES ('Nils', 'Camus', 'La Peste')")
+    conn.commit()
+
+    assert db.migrate(conn) == db.latest_version()
+    assert conn.execute("SELECT name FROM owners WHERE name = 'Inconnu'").fetchall() == []
+
+def test_canonical_isbn_migration(tmp_path):
+    conn = old_db(tmp_path, 7)
+    conn.executemany(
+        "INSERT INTO books (owner_id, author, title, isbn) VALUES (1, ?, ?, ?)",
+        [
+            ("Camus", "L'Étranger", "ISBN-13: 978-2-07-036002-4"),
+            ("Camus", "La Peste", "2-07-036042-3"),
+            ("Camus", "L'Étranger (poche)", "9782070360024"),   # même ISBN, même propriétaire
+            ("Camus", "Noces", "pas un isbn"),
+        ],
+    )
+    conn.commit()
+
+    assert db.migrate(conn) == db.latest_version()
+    isbns = conn.execute("SELECT title, isbn FROM books ORDER BY id").fetchall()
+    assert isbns == [
+        ("L'Étranger", "9782070360024"),
+        ("La Peste", "9782070360420"),
+        ("L'Étranger (poche)", None),
+        ("Noces", None),
+    ]
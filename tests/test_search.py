@@ -0,0 +1,77 @@
+"""Recherche, liste paginée et compteur (search.py)."""
+import dimensions
+from search import count_books, count_matches, list_page, list_page_frame, search_books
+
+def add_books(pool, books):
+    with pool.writer() as conn:
+        for owner, fmt, author, title in books:
+            dimensions.insert_book(conn, owner, fmt, author, title, "Fr")
+
+def test_count_books(pool):
+    with pool.reader() as conn:
+        assert count_books(conn) == 0
+    add_books(pool, [("Nils", "BD", "Hergé", f"Tintin {i}") for i in range(5)])
+    with pool.writer() as conn:
+        conn.execute("DELETE FROM books WHERE title = 'Tintin 0'")
+    with pool.reader() as conn:
+        assert count_books(conn) == 4 == conn.execute("SELECT COUNT(*) FROM books").fetchone()[0]
+
+BOOKS = [
+    ("Nils", "BD", "Hergé", "Tintin au Tibet"),
+    ("Nils", "BD", "Hergé", "Tintin en Amérique"),
+    ("Nils", "Livre", "Albert Camus", "L'Étranger"),
+    ("Carole", "BD", "Goscinny", "Astérix le Gaulois"),
+    ("Carole", "Livre", "Hergé", "Les Aventures de Tintin"),
+]
+
+def titles(rows):
+    return sorted(row[3] for row in rows)
+
+def test_search_books(pool):
+    add_books(pool, BOOKS)
+    with pool.reader() as conn:
+        assert titles(search_books(conn, "tint")) == ["Les Aventures de Tintin", "Tintin au Tibet", "Tintin en Amérique"]
+        assert titles(search_books(conn, "tintin", owner=" NILS ")) == ["Tintin au Tibet", "Tintin en Amérique"]
+        assert titles(search_books(conn, "hergé", fmt="bande dessinée")) == ["Tintin au Tibet", "Tintin en Amérique"]
+        assert titles(search_books(conn, owner="carole", fmt="Livre")) == ["Les Aventures de Tintin"]
+        assert search_books(conn, "tintin", owner="Inconnu") == []
+        assert search_books(conn, '"tintin" -(*:') == search_books(conn, "tintin")   # syntaxe FTS neutralisée
+        assert len(search_books(conn)) == len(BOOKS)
+
+def test_search_limit_and_count(pool):
+    add_books(pool, BOOKS)
+    with pool.reader() as conn:
+        everything = search_books(conn, "tint")
+        assert search_books(conn, "tint", limit=2) == everything[:2]
+        assert count_matches(conn, "tint") == len(everything) == 3
+        assert count_matches(conn, "tintin", owner="nils") == 2
+        assert count_matches(conn, owner="Inconnu") == 0
+        assert count_matches(conn) == len(BOOKS)
+
+def all_pages(conn, page_size, read_page=list_page):
+    pages, after = [], None
+    while True:
+        rows, after = read_page(conn, page_size, after)
+        pages.append(rows)
+        if after is None:
+            return pages
+
+def test_list_page_boundaries(pool):
+    add_books(pool, [("Nils", "Livre", f"Auteur {i}", f"Titre {i}") for i in range(7)])
+    with pool.reader() as conn:
+        # Même created_at pour tous (même seconde) : l'id départage, plus récent d'abord
+        pages = all_pages(conn, 3)
+        assert [len(rows) for rows in pages] == [3, 3, 1]
+        assert [row[3] for rows in pages for row in rows] == [f"Titre {i}" for i in reversed(range(7))]
+
+        # Nombre de livres multiple de la taille de page : pas de page vide à la fin
+        assert [len(rows) for rows in all_pages(conn, 7)] == [7]
+        assert [len(rows) for rows in all_pages(conn, 10)] == [7]
+
+        frames = all_pages(conn, 3, list_page_frame)
+        assert [len(df) for df in frames] == [3, 3, 1]
+        assert [title for df in frames for title in df["title"]] == [row[3] for rows in pages for row in rows]
+
+def test_list_page_empty(pool):
+    with pool.reader() as conn:
+        assert list_page(conn, 10) == ([], None)
@@ -0,0 +1,74 @@
+"""Compteurs book_stats tenus par triggers (stats.py) vs recalcul par GROUP BY."""
+import dimensions
+import stats
+
+EXPECTED = """
+    SELECT 'total', '', '', COUNT(*) FROM books_named GROUP BY 2, 3
+    UNION ALL
+    SELECT 'owner', owner, '', COUNT(*) FROM books_named GROUP BY 2, 3
+    UNION ALL
+    SELECT 'format', COALESCE(format, ''), '', COUNT(*) FROM books_named GROUP BY 2, 3
+    UNION ALL
+    SELECT 'language', COALESCE(language, ''), '', COUNT(*) FROM books_named GROUP BY 2, 3
+    UNION ALL
+    SELECT 'reading', CAST(read AS TEXT), CAST(kept_after_reading AS TEXT), COUNT(*) FROM books_named GROUP BY 2, 3
+    UNION ALL
+    SELECT 'format_owner', COALESCE(format, ''), owner, COUNT(*) FROM books_named GROUP BY 2, 3
+    UNION ALL
+    SELECT 'month', COALESCE(strftime('%Y-%m', created_at), ''), '', COUNT(*) FROM books_named GROUP BY 2, 3
+"""
+
+def recomputed(conn):
+    expected = {}
+    for kind, a, b, n in conn.execute(EXPECTED):
+        expected.setdefault(kind, {})[(a, b)] = n
+    return expected
+
+def assert_consistent(pool):
+    with pool.reader() as conn:
+        assert stats.read_stats(conn) == recomputed(conn)
+
+def test_stats_follow_book_changes(pool):
+    with pool.writer() as conn:
+        ids = [
+            dimensions.insert_book(conn, "Nils", "BD", "Hergé", "Tintin au Tibet", "Fr"),
+            dimensions.insert_book(conn, "Nils", "BD", "Hergé", "Tintin en Amérique", "Fr"),
+            dimensions.insert_book(conn, "Carole", "Livre", "Albert Camus", "L'Étranger", "Fr"),
+            dimensions.insert_book(conn, "Carole", None, "Goscinny", "Astérix le Gaulois"),
+        ]
+    assert_consistent(pool)
+    with pool.reader() as conn:
+        counters = stats.read_stats(conn)
+    assert stats.total(counters) == 4
+    assert dict(stats.counts(counters, "owner")) == {"Nils": 2, "Carole": 2}
+    assert dict(stats.counts(counters, "format")) == {"BD": 2, "Livre": 1, "—": 1}
+
+    with pool.writer() as conn:
+        carole = dimensions.id_for(conn, "owner", "Carole")
+        livre = dimensions.id_for(conn, "format", "Livre")
+        conn.execute("UPDATE books SET owner_id = ?, format_id = ? WHERE id = ?", (carole, livre, ids[0]))
+    assert_consistent(pool)
+
+    with pool.writer() as conn:
+        conn.execute("UPDATE books SET read = 1 WHERE id IN (?, ?)", (ids[1], ids[2]))
+        conn.execute("UPDATE books SET kept_after_reading = 0 WHERE id = ?", (ids[2],))
+    assert_consistent(pool)
+    with pool.reader() as conn:
+        assert dict(stats.reading(stats.read_stats(conn))) == {"À lire": 2, "Lus et gardés": 1, "Lus, pas gardés": 1}
+
+    with pool.writer() as conn:
+        conn.execute("UPDATE books SET read = 0 WHERE id = ?", (ids[1],))
+        conn.execute("UPDATE books SET created_at = '2020-03-14 10:00:00' WHERE id = ?", (ids[3],))
+    assert_consistent(pool)
+    with pool.reader() as conn:
+        months = stats.read_stats(conn)["month"]
+    assert months[("2020-03", "")] == 1
+    assert sum(months.values()) == 4
+
+    with pool.writer() as conn:
+        conn.execute("DELETE FROM books WHERE id IN (?, ?)", (ids[0], ids[3]))
+    assert_consistent(pool)
+    with pool.reader() as conn:
+        counters = stats.read_stats(conn)
+    assert stats.total(counters) == 2
+    assert ("2020-03", "") not in counters["month"]   # compteur retombé à 0 : exclu